@@ -5,7 +5,7 @@ Loads settings from environment variables with sensible defaults.
 """
 
 import os
-from typing import List
+from typing import List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -27,12 +27,92 @@ class Settings(BaseSettings):
     # API Configuration
     api_timeout: float = Field(default=30.0, env="API_TIMEOUT")
     
+    # Upstream HTTP Connection Pool
+    http_max_connections: int = Field(default=100, env="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=20, env="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry: float = Field(default=30.0, env="HTTP_KEEPALIVE_EXPIRY")
+    http2_enabled: bool = Field(default=False, env="HTTP2_ENABLED")
+    http_warmup_connections: int = Field(default=2, env="HTTP_WARMUP_CONNECTIONS")
+    
+    # Content Cache Configuration
+    content_cache_max_bytes: int = Field(default=64 * 1024 * 1024, env="CONTENT_CACHE_MAX_BYTES")
+    content_cache_ttl: float = Field(default=21600.0, env="CONTENT_CACHE_TTL")
+    # Past the TTL, entries are served while refreshed in the background for this long
+    content_cache_stale_ttl: float = Field(default=604800.0, env="CONTENT_CACHE_STALE_TTL")
+    
+    # Search Result Cache Configuration
+    search_cache_max_bytes: int = Field(default=8 * 1024 * 1024, env="SEARCH_CACHE_MAX_BYTES")
+    search_cache_ttl: float = Field(default=300.0, env="SEARCH_CACHE_TTL")
+    search_cache_stale_ttl: float = Field(default=3600.0, env="SEARCH_CACHE_STALE_TTL")
+    
+    # Persistent Content Store (SQLite file shared by all workers; disabled when empty)
+    content_store_path: Optional[str] = Field(default=None, env="CONTENT_STORE_PATH")
+    
+    # Coalesce identical concurrent upstream requests into one call
+    coalesce_requests: bool = Field(default=True, env="COALESCE_REQUESTS")
+    
+    # Concurrent article fetches when retrieving a whole law
+    bulk_fetch_concurrency: int = Field(default=8, env="BULK_FETCH_CONCURRENCY")
+    
+    # Search result pages fetched ahead when streaming a whole result set
+    search_page_concurrency: int = Field(default=3, env="SEARCH_PAGE_CONCURRENCY")
+    
+    # Decoded PDF payloads kept on disk for page-by-page extraction (empty: system temp dir)
+    pdf_spool_dir: Optional[str] = Field(default=None, env="PDF_SPOOL_DIR")
+    pdf_spool_max_files: int = Field(default=16, env="PDF_SPOOL_MAX_FILES")
+    
+    # Local full-text (BM25) index of retrieved articles, for search source "local"/"auto"
+    local_index_enabled: bool = Field(default=True, env="LOCAL_INDEX_ENABLED")
+    local_index_max_documents: int = Field(default=100000, env="LOCAL_INDEX_MAX_DOCUMENTS")
+    
+    # Memory-mapped article vectors for similarity search (needs numpy; empty dir: system temp dir)
+    vector_index_enabled: bool = Field(default=True, env="VECTOR_INDEX_ENABLED")
+    vector_index_dir: Optional[str] = Field(default=None, env="VECTOR_INDEX_DIR")
+    vector_dimensions: int = Field(default=512, env="VECTOR_DIMENSIONS")
+    vector_index_max_articles: int = Field(default=100000, env="VECTOR_INDEX_MAX_ARTICLES")
+    
+    # Serialized JSON response cache (hot endpoints; ttl 0 disables)
+    response_cache_max_bytes: int = Field(default=32 * 1024 * 1024, env="RESPONSE_CACHE_MAX_BYTES")
+    response_cache_ttl: int = Field(default=60, env="RESPONSE_CACHE_TTL")
+    
+    # Speculative prefetch of top search hits (opt-in)
+    prefetch_enabled: bool = Field(default=False, env="PREFETCH_ENABLED")
+    prefetch_top_n: int = Field(default=1, env="PREFETCH_TOP_N")
+    prefetch_concurrency: int = Field(default=2, env="PREFETCH_CONCURRENCY")
+    prefetch_max_bytes_per_minute: int = Field(default=32 * 1024 * 1024, env="PREFETCH_MAX_BYTES_PER_MINUTE")
+    
+    # Document Conversion Pool ("thread", "process" or "inline"; 0 workers = CPU count)
+    conversion_executor: str = Field(default="thread", env="CONVERSION_EXECUTOR")
+    conversion_workers: int = Field(default=0, env="CONVERSION_WORKERS")
+    conversion_queue_size: int = Field(default=32, env="CONVERSION_QUEUE_SIZE")
+    conversion_timeout: float = Field(default=60.0, env="CONVERSION_TIMEOUT")
+    # Diagnostic: record each conversion's peak memory (tracemalloc; slow, serializes conversions)
+    conversion_trace_memory: bool = Field(default=False, env="CONVERSION_TRACE_MEMORY")
+    
     # CORS Configuration
     allowed_origins: str = Field(default="https://flowise.software.vision,https://mcp-mevzuat.dosya.ai", env="ALLOWED_ORIGINS")
     
     # Rate Limiting
     rate_limit_per_minute: int = Field(default=60, env="RATE_LIMIT_PER_MINUTE")
     
+    # Upstream rate limit (requests per minute per worker; 0 disables)
+    upstream_rate_limit_per_minute: int = Field(default=600, env="UPSTREAM_RATE_LIMIT_PER_MINUTE")
+    upstream_rate_limit_burst: int = Field(default=20, env="UPSTREAM_RATE_LIMIT_BURST")
+    
+    # Adaptive upstream concurrency (AIMD) bounds and latency target in seconds
+    upstream_concurrency_initial: int = Field(default=8, env="UPSTREAM_CONCURRENCY_INITIAL")
+    upstream_concurrency_min: int = Field(default=1, env="UPSTREAM_CONCURRENCY_MIN")
+    upstream_concurrency_max: int = Field(default=32, env="UPSTREAM_CONCURRENCY_MAX")
+    upstream_latency_target: float = Field(default=2.0, env="UPSTREAM_LATENCY_TARGET")
+    
+    # Upstream retries (jittered exponential backoff) and circuit breaker
+    upstream_max_retries: int = Field(default=2, env="UPSTREAM_MAX_RETRIES")
+    upstream_retry_base_delay: float = Field(default=0.5, env="UPSTREAM_RETRY_BASE_DELAY")
+    upstream_retry_max_delay: float = Field(default=5.0, env="UPSTREAM_RETRY_MAX_DELAY")
+    circuit_failure_threshold: int = Field(default=5, env="CIRCUIT_FAILURE_THRESHOLD")
+    circuit_recovery_timeout: float = Field(default=30.0, env="CIRCUIT_RECOVERY_TIMEOUT")
+    last_good_cache_max_bytes: int = Field(default=32 * 1024 * 1024, env="LAST_GOOD_CACHE_MAX_BYTES")
+    
     # Environment
     environment: str = Field(default="development", env="ENVIRONMENT")
     
@@ -0,0 +1,200 @@
+"""
+In-process caching primitives used by the MevzuatApiClient.
+Provides a bounded LRU cache with per-entry TTL, an optional stale window and
+a byte budget, and single-flight coalescing of identical concurrent calls.
+"""
+
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Freshness of a cache lookup (see LRUTTLCache.lookup)
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+MISS = "miss"
+
+
+def default_sizeof(value: Any) -> int:
+    """Approximate in-memory size of a cached value in bytes."""
+    return sys.getsizeof(value)
+
+
+class LRUTTLCache:
+    """
+    Least-recently-used cache bounded by total byte size, with a TTL per entry.
+    Not thread-safe; intended to be used from a single event loop.
+
+    With stale_ttl > 0 an entry outlives its TTL: for stale_ttl more seconds
+    lookup() still returns it as STALE (serve it, revalidate in the background),
+    and after that as EXPIRED (refetch first, fall back to it on failure) until
+    the LRU evicts it. get() only ever returns fresh entries.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, sizeof: Callable[[Any], int] = default_sizeof, stale_ttl: float = 0.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._current_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[2] > time.monotonic()
+
+    @property
+    def current_bytes(self) -> int:
+        return self._current_bytes
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, size, fresh_until = entry
+        if fresh_until <= time.monotonic():
+            if not self.stale_ttl:
+                self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def freshness(self, age: float) -> str:
+        """Freshness of a value that was fetched age seconds ago."""
+        if age < self.ttl:
+            return FRESH
+        if age < self.ttl + self.stale_ttl:
+            return STALE
+        return EXPIRED
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[Any], str]:
+        """Returns (value, freshness); expired entries are kept as a fallback for failed refetches."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, MISS
+        value, _, fresh_until = entry
+        self._entries.move_to_end(key)
+        freshness = self.freshness(self.ttl - (fresh_until - time.monotonic()))
+        if freshness == FRESH:
+            self.hits += 1
+        elif freshness == STALE:
+            self.stale_hits += 1
+        else:
+            self.expirations += 1
+            self.misses += 1
+        return value, freshness
+
+    def set(self, key: Hashable, value: Any, size: Optional[int] = None, ttl: Optional[float] = None) -> bool:
+        """
+        Stores a value. Returns False if the value alone exceeds the byte budget.
+        A ttl shorter than the cache's (even negative) stores an already aged value.
+        """
+        if self.max_bytes <= 0:
+            return False
+        size = self._sizeof(value) if size is None else size
+        if size > self.max_bytes:
+            return False
+        if key in self._entries:
+            self._remove(key)
+        fresh_until = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (value, size, fresh_until)
+        self._current_bytes += size
+        while self._current_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+        return True
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Returns the value whatever its age, without touching recency or counters."""
+        entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._remove(key)
+        return entry[0]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._current_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._current_bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._current_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key so only one of them runs.
+    Every waiter receives the leader's result (or exception). The shared work runs
+    in its own task, so a cancelled waiter does not cancel it for the others.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            self.calls += 1
+            return await fn()
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(task)
+        self.calls += 1
+        task = asyncio.ensure_future(fn())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every waiter has gone away
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._in_flight),
+        }
@@ -4,20 +4,131 @@ API Client for interacting with the Adalet Bakanlığı Mevzuat API (bedesten.ad
 This client handles the business logic of making HTTP requests and parsing responses.
 """
 
+import asyncio
 import httpx
+import json
 import logging
-import base64
-import io
-from bs4 import BeautifulSoup
-from markitdown import MarkItDown
-from typing import Dict, List, Optional, Any
+import re
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 from mevzuat_models import (
-    MevzuatSearchRequest, MevzuatSearchResult, MevzuatDocument, MevzuatTur,
-    MevzuatArticleNode, MevzuatArticleContent
+    MevzuatSearchRequest, MevzuatSearchResult, MevzuatDocument, MevzuatTur, MevzuatArticleHit, MevzuatSimilarArticles,
+    MevzuatArticleNode, MevzuatArticleContent, MevzuatBulkArticle, MevzuatContentChunk, MevzuatContentWindow, MevzuatResolvedArticle,
+    SearchDocumentsData, SearchDocumentsResponse, ArticleTreeResponse, ArticleTreeAdapter
+)
+from mevzuat_cache import FRESH, MISS, STALE, LRUTTLCache, SingleFlight
+from mevzuat_store import SQLiteContentStore, content_hash
+from mevzuat_prefetch import Prefetcher
+from mevzuat_index import IndexedArticle, LocalIndex, analyze, tokenize, turkish_lower
+from mevzuat_query import compile_query, execute, query_terms
+from mevzuat_tree import CompactArticleTree
+from mevzuat_vectors import VectorSearch, numpy_available
+from mevzuat_upstream import (
+    AIMDLimiter, CircuitBreaker, CircuitOpenError, PoolMetrics, TokenBucket,
+    build_http_client, retry_delay
+)
+from mevzuat_convert import (
+    Base64Payload, ConversionPool, PdfSpool, SpooledPdf, convert_html_payload, extract_pdf_pages,
+    is_pdf_payload, split_content_payload, spool_pdf_payload
 )
 logger = logging.getLogger(__name__)
 
+def convert_boolean_operators(phrase_text: str) -> str:
+    """Converts AND/NOT/OR operators in a search phrase to the Solr syntax upstream accepts."""
+    if not phrase_text:
+        return phrase_text
+
+    text = phrase_text
+
+    # Convert AND to space (implicit AND works)
+    text = re.sub(r'\s+AND\s+', ' ', text)
+
+    # Convert NOT to - (this works!)
+    text = re.sub(r'\s+NOT\s+', ' -', text)
+
+    # Convert OR chains to regex
+    def replace_or_chain(text):
+        while 'OR' in text:
+            # Match quoted terms separated by OR
+            match = re.search(r'"([^"]+)"\s+OR\s+"([^"]+)"(?:\s+OR\s+"([^"]+)")*', text)
+            if match:
+                # Extract all quoted terms in the OR chain
+                full_match = match.group(0)
+                terms = re.findall(r'"([^"]+)"', full_match)
+                # Convert to regex alternation
+                regex_pattern = f"/({'|'.join(terms)})/"
+                text = text.replace(full_match, regex_pattern, 1)
+            else:
+                # Handle simple word OR word
+                simple_or = re.search(r'(\w+)\s+OR\s+(\w+)', text)
+                if simple_or:
+                    word1, word2 = simple_or.groups()
+                    regex_pattern = f"/({word1}|{word2})/"
+                    text = text.replace(simple_or.group(0), regex_pattern, 1)
+                else:
+                    break
+        return text
+
+    text = replace_or_chain(text)
+
+    return text
+
+_QUERY_OPERATORS = {"AND", "OR", "NOT"}
+_REGEX_SEGMENT_RE = re.compile(r"(/[^/]*/)")
+
+def normalize_search_phrase(phrase: Optional[str]) -> str:
+    """
+    Canonical form of a search phrase for cache keys: operators converted to Solr
+    syntax, whitespace collapsed and terms lowercased (Turkish-aware), keeping the
+    AND/OR/NOT keywords and /regex/ segments as written.
+    """
+    if not phrase:
+        return ""
+    text = convert_boolean_operators(" ".join(phrase.split()))
+    parts = []
+    for segment in _REGEX_SEGMENT_RE.split(text):
+        if _REGEX_SEGMENT_RE.fullmatch(segment):
+            parts.append(segment)
+        else:
+            parts.append(" ".join(word if word in _QUERY_OPERATORS else turkish_lower(word) for word in segment.split(" ")))
+    return "".join(parts)
+
+def search_cache_key(request: MevzuatSearchRequest) -> tuple:
+    """Cache key that treats equivalent search requests as the same query."""
+    return (
+        normalize_search_phrase(request.mevzuat_adi),
+        normalize_search_phrase(request.phrase),
+        (request.mevzuat_no or "").strip(),
+        (request.resmi_gazete_sayisi or "").strip(),
+        tuple(sorted(set(request.mevzuat_tur_list))),
+        request.page_number, request.page_size,
+        request.sort_field, request.sort_direction,
+    )
+
+class MevzuatSearchError(Exception):
+    """Raised by MevzuatApiClient.iter_search when a result page cannot be fetched."""
+
 class MevzuatApiClient:
+    # Largest page size accepted by /searchDocuments
+    MAX_SEARCH_PAGE_SIZE = 10
+    # Content window sizes (characters / articles) used when the caller gives no limit, and the caps
+    DEFAULT_WINDOW_CHARS = 20000
+    MAX_WINDOW_CHARS = 500000
+    DEFAULT_WINDOW_ARTICLES = 10
+    MAX_WINDOW_ARTICLES = 100
+    # Size of the pieces a converted document is streamed in
+    STREAM_CHUNK_CHARS = 65536
+    DEFAULT_WINDOW_PAGES = 10
+    MAX_WINDOW_PAGES = 50
+    # PDF pages extracted per conversion job when pages are requested or streamed
+    # (each job reopens the document; whole-document conversion runs as one job)
+    PDF_PAGES_PER_JOB = 16
+    # Texts longer than this are tokenized for the local index off the event loop
+    LOCAL_INDEX_INLINE_CHARS = 65536
+    # Matching articles listed per document, and the length of their snippets, in local search results
+    LOCAL_HITS_PER_DOCUMENT = 3
+    LOCAL_SNIPPET_CHARS = 240
     BASE_URL = "https://bedesten.adalet.gov.tr/mevzuat"
     HEADERS = {
         'Accept': '*/*',
@@ -27,34 +138,629 @@ class MevzuatApiClient:
         'Referer': 'https://mevzuat.adalet.gov.tr/',
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     }
-    def __init__(self, timeout: float = 30.0):
-        self._http_client = httpx.AsyncClient(headers=self.HEADERS, timeout=timeout, follow_redirects=True)
-        self._md_converter = MarkItDown()
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        rate_limit_per_minute: float = 600.0,
+        rate_limit_burst: int = 20,
+        concurrency_initial: int = 8,
+        concurrency_min: int = 1,
+        concurrency_max: int = 32,
+        latency_target: float = 2.0,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 5.0,
+        circuit_failure_threshold: int = 5,
+        circuit_recovery_timeout: float = 30.0,
+        last_good_max_bytes: int = 32 * 1024 * 1024,
+        content_cache_max_bytes: int = 64 * 1024 * 1024,
+        content_cache_ttl: float = 6 * 60 * 60,
+        content_cache_stale_ttl: float = 7 * 24 * 60 * 60,
+        search_cache_max_bytes: int = 8 * 1024 * 1024,
+        search_cache_ttl: float = 300.0,
+        search_cache_stale_ttl: float = 60 * 60,
+        content_store_path: Optional[str] = None,
+        coalesce_requests: bool = True,
+        bulk_fetch_concurrency: int = 8,
+        search_page_concurrency: int = 3,
+        conversion_executor: str = "thread",
+        conversion_workers: Optional[int] = None,
+        conversion_queue_size: int = 32,
+        conversion_timeout: float = 60.0,
+        conversion_trace_memory: bool = False,
+        prefetch_enabled: bool = False,
+        prefetch_top_n: int = 1,
+        prefetch_concurrency: int = 2,
+        prefetch_max_bytes_per_minute: int = 32 * 1024 * 1024,
+        pdf_spool_dir: Optional[str] = None,
+        pdf_spool_max_files: int = 16,
+        local_index_enabled: bool = True,
+        local_index_max_documents: int = 100000,
+        vector_index_enabled: bool = True,
+        vector_dimensions: int = 512,
+        vector_index_dir: Optional[str] = None,
+        vector_index_max_articles: int = 100000,
+    ):
+        self._http_client = build_http_client(
+            headers=self.HEADERS, timeout=timeout, max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry, http2=http2,
+        )
+        self._pool_metrics = PoolMetrics(max_connections=max_connections)
+        # Shared by every endpoint: request rate and adaptive concurrency toward upstream
+        self._rate_limiter = TokenBucket(rate_per_minute=rate_limit_per_minute, burst=rate_limit_burst)
+        self._concurrency_limiter = AIMDLimiter(
+            initial=concurrency_initial, minimum=concurrency_min,
+            maximum=concurrency_max, latency_target=latency_target,
+        )
+        # Retries for these idempotent reads, and fail-fast while upstream is down
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._circuit_breaker = CircuitBreaker(
+            failure_threshold=circuit_failure_threshold, recovery_timeout=circuit_recovery_timeout,
+        )
+        # Last successful raw response per (endpoint, payload), served while the circuit is open
+        self._last_good = LRUTTLCache(max_bytes=last_good_max_bytes, ttl=24 * 60 * 60)
+        self.retries = 0
+        self.served_last_good = 0
+        # HTML/PDF -> markdown conversion runs off the event loop
+        self._conversion_pool = ConversionPool(
+            mode=conversion_executor, max_workers=conversion_workers,
+            queue_size=conversion_queue_size, timeout=conversion_timeout,
+            trace_memory=conversion_trace_memory,
+        )
+        # Decoded PDF payloads on disk, for page-by-page extraction
+        self._pdf_spool = PdfSpool(max_files=pdf_spool_max_files, directory=pdf_spool_dir)
+        # Opt-in background warm-up of the top search hits
+        self.prefetch_top_n = prefetch_top_n
+        self._prefetcher = Prefetcher(
+            warm=self._prefetch_document, concurrency=prefetch_concurrency,
+            max_bytes_per_minute=prefetch_max_bytes_per_minute,
+            is_busy=self._under_load,
+        ) if prefetch_enabled else None
+        # Converted markdown keyed by ("madde", madde_id) or ("mevzuat", mevzuat_id),
+        # PDF page texts keyed by ("pdf_page", mevzuat_id, page) and compact article
+        # trees keyed by ("tree", mevzuat_id). Both caches are
+        # stale-while-revalidate: past the TTL an entry is served and refreshed in the
+        # background, past TTL + stale TTL it is refetched before answering.
+        self._content_cache = LRUTTLCache(
+            max_bytes=content_cache_max_bytes, ttl=content_cache_ttl, stale_ttl=content_cache_stale_ttl,
+        )
+        # Successful search results keyed by search_cache_key(request)
+        self._search_cache = LRUTTLCache(
+            max_bytes=search_cache_max_bytes, ttl=search_cache_ttl, stale_ttl=search_cache_stale_ttl,
+        )
+        # Memoized (mevzuat_no, tür) -> document and (mevzuat_id, madde_no) -> madde_id
+        # lookups for resolve_article
+        self._resolve_cache = LRUTTLCache(max_bytes=1024 * 1024, ttl=content_cache_ttl)
+        # Background refreshes of stale cache entries, at most one per key
+        self._revalidations: Dict[Any, asyncio.Task] = {}
+        self.revalidation_failures = 0
+        # Optional persistent store shared across processes and restarts
+        self._store = SQLiteContentStore(content_store_path) if content_store_path else None
+        # Identical concurrent upstream calls share one request and one conversion
+        self._single_flight = SingleFlight(enabled=coalesce_requests)
+        self.bulk_fetch_concurrency = bulk_fetch_concurrency
+        self.search_page_concurrency = search_page_concurrency
+        # Full-text index of the articles converted so far, for search_documents(source="local")
+        self._local_index = LocalIndex(max_documents=local_index_max_documents) if local_index_enabled else None
+        # Hashed TF-IDF vectors of the same articles, memory-mapped, for similar_articles
+        self._vector_search = None
+        if vector_index_enabled:
+            if numpy_available():
+                self._vector_search = VectorSearch(
+                    dimensions=vector_dimensions, max_articles=vector_index_max_articles, directory=vector_index_dir,
+                )
+            else:
+                logger.warning("numpy is not installed; article similarity search is disabled")
 
     async def close(self):
-        await self._http_client.aclose()
+        if self._prefetcher:
+            self._prefetcher.cancel_all()
+        for task in list(self._revalidations.values()):
+            task.cancel()
+        try:
+            await self._http_client.aclose()
+        except Exception:
+            # e.g. connections left over from another event loop; the files below must still go
+            logger.warning("Error closing the upstream HTTP client", exc_info=True)
+        self._conversion_pool.shutdown()
+        self._pdf_spool.close()
+        if self._vector_search is not None:
+            self._vector_search.close()
+        if self._store:
+            self._store.close()
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Returns cache counters for monitoring endpoints. The content store is
+        counted in a worker thread, since COUNT(*) scans grow with the store.
+        """
+        stats = {
+            "http_pool": self._pool_metrics.stats(),
+            "rate_limiter": self._rate_limiter.stats(),
+            "concurrency_limiter": self._concurrency_limiter.stats(),
+            "upstream": self.upstream_health(),
+            "content_cache": self._content_cache.stats(),
+            "search_cache": self._search_cache.stats(),
+            "resolve_cache": self._resolve_cache.stats(),
+            "revalidation": {
+                "in_flight": len(self._revalidations),
+                "failures": self.revalidation_failures,
+            },
+            "single_flight": self._single_flight.stats(),
+            "conversion_pool": self._conversion_pool.stats(),
+            "pdf_spool": self._pdf_spool.stats(),
+        }
+        if self._local_index is not None:
+            stats["local_index"] = dict(self._local_index.stats(), query_cache=compile_query.cache_info()._asdict())
+        if self._vector_search is not None:
+            stats["vector_index"] = self._vector_search.stats()
+        if self._prefetcher:
+            stats["prefetch"] = self._prefetcher.stats()
+        if self._store:
+            try:
+                stats["content_store"] = await asyncio.to_thread(self._store.stats)
+            except Exception as e:
+                stats["content_store"] = {"error": str(e)}
+        return stats
+
+    def upstream_health(self) -> Dict[str, Any]:
+        """Circuit breaker state and retry counters, for health endpoints."""
+        return {
+            "circuit": self._circuit_breaker.stats(),
+            "retries": self.retries,
+            "served_last_good": self.served_last_good,
+            "last_good_cache": self._last_good.stats(),
+        }
+
+    def _under_load(self) -> bool:
+        """True when conversions or upstream calls are already queueing."""
+        return self._conversion_pool.saturated() or self._concurrency_limiter.waiting > 0
+
+    async def warmup(self, connections: int = 2, timeout: float = 5.0) -> int:
+        """
+        Opens keep-alive connections to upstream ahead of the first real request so it
+        does not pay the TCP/TLS handshake. Returns the number of successful probes.
+        """
+        async def probe() -> bool:
+            try:
+                await self._http_client.head(self.BASE_URL, timeout=timeout, extensions={"trace": self._pool_metrics.tracer()})
+                return True
+            except Exception as e:
+                logger.warning(f"Upstream warmup probe failed: {e}")
+                return False
+
+        results = await asyncio.gather(*(probe() for _ in range(connections)))
+        return sum(results)
+
+    async def _post(self, endpoint: str, payload: Dict[str, Any]) -> httpx.Response:
+        """
+        Sends a POST to a bedesten endpoint with bounded, jittered retries on transport
+        errors, 429 and 5xx. While the circuit breaker is open the call fails fast with
+        CircuitOpenError, or returns the last successful response for the same request;
+        the same fallback applies once retries are exhausted.
+        """
+        request_key = (endpoint, json.dumps(payload, sort_keys=True))
+        attempt = 0
+        while True:
+            if not self._circuit_breaker.allow():
+                last_good = self._last_good_response(endpoint, request_key)
+                if last_good is not None:
+                    return last_good
+                raise CircuitOpenError(f"Upstream temporarily unavailable (circuit open), {endpoint} not attempted")
+            try:
+                response = await self._send(endpoint, payload)
+                retryable = response.status_code == 429 or response.status_code >= 500
+                failure: Optional[Exception] = None
+            except httpx.TransportError as e:
+                response, retryable, failure = None, True, e
+            except BaseException:
+                # Cancelled, or failed before reaching upstream: says nothing about its health
+                self._circuit_breaker.release()
+                raise
+            if not retryable:
+                self._circuit_breaker.record_success()
+                if response.status_code == 200:
+                    self._last_good.set(request_key, response.content, size=len(response.content))
+                return response
+            self._circuit_breaker.record_failure()
+            if attempt >= self.max_retries:
+                last_good = self._last_good_response(endpoint, request_key)
+                if last_good is not None:
+                    return last_good
+                if failure is not None:
+                    raise failure
+                return response
+            delay = retry_delay(attempt, self.retry_base_delay, self.retry_max_delay)
+            reason = failure if failure is not None else f"HTTP {response.status_code}"
+            logger.warning(f"Upstream {endpoint} failed ({reason}); retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _last_good_response(self, endpoint: str, request_key: Tuple[str, str]) -> Optional[httpx.Response]:
+        content = self._last_good.get(request_key)
+        if content is None:
+            return None
+        self.served_last_good += 1
+        logger.warning(f"Upstream unavailable; serving last successful response for {endpoint}")
+        return httpx.Response(
+            200, content=content, headers={"Content-Type": "application/json"},
+            request=httpx.Request("POST", f"{self.BASE_URL}/{endpoint}"),
+            extensions={"last_good": True},
+        )
+
+    async def _send(self, endpoint: str, payload: Dict[str, Any]) -> httpx.Response:
+        """
+        Sends one POST through the rate and concurrency limiters, recording connection
+        pool metrics. Throttling (429), 5xx responses, transport errors and slow
+        responses shrink the concurrency window.
+        """
+        await self._rate_limiter.acquire()
+        await self._concurrency_limiter.acquire()
+        self._pool_metrics.request_started()
+        started = time.perf_counter()
+        error = True
+        try:
+            response = await self._http_client.post(
+                f"{self.BASE_URL}/{endpoint}", json=payload,
+                extensions={"trace": self._pool_metrics.tracer()}
+            )
+            error = response.status_code == 429 or response.status_code >= 500
+            return response
+        finally:
+            self._pool_metrics.request_finished()
+            self._concurrency_limiter.release(time.perf_counter() - started, error)
+
+    def _revalidate(self, key: Tuple, refresh: Callable[[], Awaitable[bool]]) -> None:
+        """Refreshes a stale cache entry in the background; refresh returns False on failure."""
+        if key in self._revalidations:
+            return
+
+        async def run() -> None:
+            try:
+                if not await refresh():
+                    self.revalidation_failures += 1
+            except Exception:
+                self.revalidation_failures += 1
+                logger.exception(f"Background revalidation failed for {key}")
+            finally:
+                self._revalidations.pop(key, None)
 
-    def _html_from_base64(self, b64_string: str) -> str:
+        self._revalidations[key] = asyncio.ensure_future(run())
+
+    async def _get_cached_markdown(self, kind: str, doc_id: str) -> Tuple[Optional[str], str]:
+        """
+        Looks up converted markdown in the memory cache, then in the persistent store.
+        Returns (markdown, freshness); stored rows age from when they were written.
+        """
+        cache_key = (kind, doc_id)
+        markdown, freshness = self._content_cache.lookup(cache_key)
+        if markdown is not None or not self._store:
+            return markdown, freshness
         try:
-            decoded_bytes = base64.b64decode(b64_string)
-            return decoded_bytes.decode('utf-8')
-        except Exception: return ""
+            stored = await asyncio.to_thread(self._store.get_document, kind, doc_id)
+        except Exception:
+            logger.exception(f"Content store read failed for {kind} {doc_id}")
+            return None, MISS
+        if stored is None:
+            return None, MISS
+        age = max(0.0, time.time() - stored.updated_at)
+        self._content_cache.set(cache_key, stored.markdown, ttl=self._content_cache.ttl - age)
+        return stored.markdown, self._content_cache.freshness(age)
 
-    def _markdown_from_html(self, html_content: str) -> str:
-        if not html_content: return ""
+    async def _get_stored_conversion(self, hash_value: str) -> Optional[str]:
+        """Returns markdown previously converted from an identical upstream payload."""
+        if not self._store:
+            return None
         try:
-            html_bytes = html_content.encode('utf-8')
-            html_io = io.BytesIO(html_bytes)
-            conv_res = self._md_converter.convert(html_io)
-            if conv_res and conv_res.text_content:
-                return conv_res.text_content.strip()
-            return ""
+            return await asyncio.to_thread(self._store.get_markdown_by_hash, hash_value)
         except Exception:
-            soup = BeautifulSoup(html_content, 'lxml')
-            return soup.get_text(separator='\n', strip=True)
+            logger.exception("Content store hash lookup failed")
+            return None
+
+    async def _remember_markdown(self, kind: str, doc_id: str, b64_content: Base64Payload, markdown: str, hash_value: str, stale: bool = False) -> None:
+        if stale:
+            # A replayed last-good response must not reset the entry's freshness
+            return
+        self._content_cache.set((kind, doc_id), markdown)
+        if not self._store:
+            return
+        try:
+            await asyncio.to_thread(self._store.put_document, kind, doc_id, b64_content, markdown, hash_value)
+        except Exception:
+            logger.exception(f"Content store write failed for {kind} {doc_id}")
+
+    async def search_documents(
+        self, request: MevzuatSearchRequest, source: str = "remote", local_phrase: Optional[str] = None,
+        coalesce: bool = True,
+    ) -> MevzuatSearchResult:
+        """
+        Performs a detailed search for legislation documents. source "local" answers
+        from the local full-text index and "auto" prefers it (see _search_with_source).
+        local_phrase, if given, is what the local index evaluates instead of
+        request.phrase (e.g. the phrase before its rewrite to upstream syntax).
+        With coalesce=False an upstream fetch is not shared with identical
+        concurrent searches, so cancelling the caller also cancels the request.
+        """
+        if source != "remote":
+            return await self._search_with_source(
+                request, source, lambda: self.search_documents(request, coalesce=coalesce), local_phrase=local_phrase,
+            )
+        result = await self._search_page(request, coalesce)
+        if self._prefetcher and result.documents:
+            self._prefetcher.schedule(doc.mevzuat_id for doc in result.documents[:self.prefetch_top_n])
+        return result
+
+    async def _search_page(self, request: MevzuatSearchRequest, coalesce: bool = True) -> MevzuatSearchResult:
+        cache_key = search_cache_key(request)
+        cached_result, freshness = self._search_cache.lookup(cache_key)
+        if freshness in (FRESH, STALE):
+            if freshness == STALE:
+                self._revalidate(("search", cache_key), lambda: self._refresh_search(cache_key, request))
+            result = cached_result.model_copy(deep=True, update={"query_used": request.model_dump(), "stale": freshness == STALE})
+        else:
+            refresh = lambda: self._refresh_search(cache_key, request, return_result=True)
+            result = await (self._single_flight.do(("search", cache_key), refresh) if coalesce else refresh())
+            if result.error_message and cached_result is not None:
+                logger.warning(f"Search refetch failed ({result.error_message}); serving expired cached result")
+                result = cached_result.model_copy(deep=True, update={"query_used": request.model_dump(), "stale": True})
+            else:
+                result = result.model_copy(deep=True, update={"query_used": request.model_dump()})
+        return result
+
+    async def _iter_search_pages(
+        self, request: MevzuatSearchRequest, max_results: Optional[int] = None, concurrency: Optional[int] = None,
+        coalesce: bool = True,
+    ) -> AsyncIterator[MevzuatSearchResult]:
+        """
+        Yields the result pages of a search in order, fetching up to `concurrency` pages
+        ahead of the consumer. The first page is fetched alone to learn total_results.
+        """
+        concurrency = concurrency or self.search_page_concurrency
+        page_size = self.MAX_SEARCH_PAGE_SIZE
 
-    async def search_documents(self, request: MevzuatSearchRequest) -> MevzuatSearchResult:
-        """Performs a detailed search for legislation documents."""
+        def page_request(page_number: int) -> MevzuatSearchRequest:
+            return request.model_copy(update={"page_number": page_number, "page_size": page_size})
+
+        first_page = await self._search_page(page_request(1), coalesce)
+        if first_page.error_message:
+            raise MevzuatSearchError(first_page.error_message)
+        yield first_page
+        wanted = first_page.total_results if max_results is None else min(first_page.total_results, max_results)
+        last_page = (wanted + page_size - 1) // page_size
+        if last_page <= 1 or not first_page.documents:
+            return
+
+        pending: deque = deque()
+        remaining = iter(range(2, last_page + 1))
+
+        def fill_window():
+            while len(pending) < concurrency:
+                page_number = next(remaining, None)
+                if page_number is None:
+                    return
+                pending.append(asyncio.ensure_future(self._search_page(page_request(page_number), coalesce)))
+
+        try:
+            fill_window()
+            while pending:
+                page = await pending.popleft()
+                if page.error_message:
+                    raise MevzuatSearchError(f"Page {page.current_page}: {page.error_message}")
+                fill_window()
+                yield page
+                if not page.documents:
+                    # The result set shrank since the first page was fetched
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_search(
+        self, request: MevzuatSearchRequest, max_results: Optional[int] = None, concurrency: Optional[int] = None
+    ) -> AsyncIterator[MevzuatDocument]:
+        """
+        Streams every document matching a search in result order, up to total_results
+        (or max_results). Pages of MAX_SEARCH_PAGE_SIZE are fetched from the start of the
+        result set, so request.page_number and request.page_size are ignored.
+        Raises MevzuatSearchError if a page cannot be fetched.
+        """
+        count = 0
+        limit = None
+        async for page in self._iter_search_pages(request, max_results, concurrency):
+            if limit is None:
+                limit = page.total_results if max_results is None else min(page.total_results, max_results)
+            for document in page.documents:
+                if count >= limit:
+                    return
+                count += 1
+                yield document
+
+    async def search_all(
+        self, request: MevzuatSearchRequest, max_results: int, source: str = "remote", local_phrase: Optional[str] = None,
+        coalesce: bool = True,
+    ) -> MevzuatSearchResult:
+        """
+        Collects up to max_results documents of a search into one result, whose
+        page_size is max_results. Errors are reported in error_message.
+        source, local_phrase and coalesce are as for search_documents.
+        """
+        if source != "remote":
+            return await self._search_with_source(
+                request, source, lambda: self.search_all(request, max_results, coalesce=coalesce), max_results, local_phrase,
+            )
+        documents: List[MevzuatDocument] = []
+        total_results = 0
+        stale = False
+        error_message = None
+        try:
+            async for page in self._iter_search_pages(request, max_results, coalesce=coalesce):
+                total_results = total_results or page.total_results
+                stale = stale or page.stale
+                documents.extend(page.documents[:min(max_results, total_results) - len(documents)])
+        except MevzuatSearchError as e:
+            error_message = str(e)
+        return MevzuatSearchResult(
+            documents=documents, total_results=total_results, current_page=1, page_size=max_results,
+            total_pages=(total_results + max_results - 1) // max_results,
+            query_used=request.model_dump(), error_message=error_message, stale=stale
+        )
+
+    async def _search_with_source(
+        self, request: MevzuatSearchRequest, source: str,
+        remote: Callable[[], Awaitable[MevzuatSearchResult]], max_results: Optional[int] = None,
+        local_phrase: Optional[str] = None,
+    ) -> MevzuatSearchResult:
+        """
+        "local" answers from the local index only. "auto" answers locally when the
+        index alone fills the requested page, otherwise from upstream, serving the
+        local results instead if upstream fails. Both evaluate local_phrase (when
+        given) against the local index; the remote call keeps request.phrase.
+        """
+        local_request = request if local_phrase is None else request.model_copy(update={"phrase": local_phrase})
+        local = self.search_local(local_request, max_results)
+        if source == "local":
+            return local
+        wanted = max_results or request.page_number * request.page_size
+        if not local.error_message and local.total_results >= wanted:
+            return local
+        result = await remote()
+        if result.error_message and local.documents:
+            logger.warning(f"Upstream search failed ({result.error_message}); serving local index results")
+            return local
+        return result
+
+    def search_local(self, request: MevzuatSearchRequest, max_results: Optional[int] = None) -> MevzuatSearchResult:
+        """
+        Answers a search from the local full-text index of the articles converted so
+        far. request.phrase is evaluated with its search operators (see mevzuat_query),
+        matching articles are ranked with BM25 and grouped per document, which scores
+        as its best article; article_hits lists the best articles of the returned
+        documents. Only documents seen in an upstream search result can be
+        returned, and the request's other filters apply to their metadata. With
+        max_results the first max_results documents are returned as one page.
+        """
+        page_size = max_results or request.page_size
+        page_number = 1 if max_results else request.page_number
+
+        def result(documents: List[MevzuatDocument], total: int, hits: List[MevzuatArticleHit], error: Optional[str] = None) -> MevzuatSearchResult:
+            return MevzuatSearchResult(
+                documents=documents, total_results=total, current_page=page_number, page_size=page_size,
+                total_pages=(total + page_size - 1) // page_size, query_used=request.model_dump(),
+                error_message=error, source="local", article_hits=hits,
+            )
+
+        if self._local_index is None:
+            return result([], 0, [], "Local index is disabled.")
+        query = compile_query(" ".join((request.phrase or "").split()))
+        if query is None:
+            return result([], 0, [], "Local search needs a 'phrase' with at least one searchable term.")
+        scores = execute(query, self._local_index)
+        ranked = self._local_index.rank_documents(scores, self._local_filter(request), self.LOCAL_HITS_PER_DOCUMENT)
+        terms = query_terms(query)
+        start = (page_number - 1) * page_size
+        page = ranked[start:start + page_size]
+        hits = [
+            MevzuatArticleHit(
+                mevzuat_id=mevzuat_id, madde_id=hit.article.key[1], title=hit.article.title,
+                score=round(hit.score, 4), snippet=self._snippet(hit.article.key, terms),
+            )
+            for mevzuat_id, _, document_hits in page for hit in document_hits
+        ]
+        documents = [self._local_index.document_info(mevzuat_id) for mevzuat_id, _, _ in page]
+        return result(documents, len(ranked), hits)
+
+    async def similar_articles(self, query: str, k: int = 10, mevzuat_id: Optional[str] = None) -> MevzuatSimilarArticles:
+        """
+        Finds the k articles converted so far whose text is most similar to query
+        (a question, a passage or a whole article), ranked by cosine similarity of
+        their hashed TF-IDF vectors. Word stems and character trigrams are
+        compared, so inflected forms match; synonyms do not. With mevzuat_id only
+        that legislation's articles are searched.
+        """
+        vectors = self._vector_search
+        if vectors is None:
+            return MevzuatSimilarArticles(query=query, mevzuat_id=mevzuat_id, error_message="Vector index is disabled (set VECTOR_INDEX_ENABLED and install numpy).")
+        terms = tokenize(query)
+        if not terms:
+            return MevzuatSimilarArticles(query=query, mevzuat_id=mevzuat_id, indexed_articles=len(vectors), error_message="Similarity search needs a query with at least one word.")
+        hits = []
+        for key, hit_mevzuat_id, title, score in await vectors.search(query, k, mevzuat_id):
+            info = self._local_index.document_info(hit_mevzuat_id) if self._local_index is not None else None
+            hits.append(MevzuatArticleHit(
+                mevzuat_id=hit_mevzuat_id, madde_id=key[1], title=title, score=round(score, 4),
+                snippet=self._snippet(key, terms), mevzuat_adi=info.mevzuat_adi if info is not None else None,
+            ))
+        return MevzuatSimilarArticles(query=query, mevzuat_id=mevzuat_id, hits=hits, indexed_articles=len(vectors))
+
+    def _local_filter(self, request: MevzuatSearchRequest) -> Callable[[IndexedArticle], bool]:
+        """Accepts articles of documents with known metadata matching the request filters (memoized per document)."""
+        index = self._local_index
+        name_words = set(tokenize(request.mevzuat_adi or ""))
+        mevzuat_no = (request.mevzuat_no or "").strip()
+        gazette = (request.resmi_gazete_sayisi or "").strip()
+        types = set(request.mevzuat_tur_list)
+        decisions: Dict[str, bool] = {}
+
+        def accept(article: IndexedArticle) -> bool:
+            decision = decisions.get(article.mevzuat_id)
+            if decision is None:
+                info = index.document_info(article.mevzuat_id)
+                decision = decisions[article.mevzuat_id] = info is not None and (
+                    info.mevzuat_tur.name in types
+                    and (not mevzuat_no or str(info.mevzuat_no) == mevzuat_no)
+                    and (not gazette or (info.resmi_gazete_sayisi or "").strip() == gazette)
+                    and name_words <= set(tokenize(info.mevzuat_adi))
+                )
+            return decision
+
+        return accept
+
+    def _snippet(self, key: Tuple[str, str], terms: List[str]) -> str:
+        """Whitespace-collapsed excerpt of cached markdown around the first query term found."""
+        text = self._content_cache.peek(key)
+        if not isinstance(text, str):
+            return ""
+        folded = turkish_lower(text)
+        found = [position for position in (folded.find(term) for term in terms) if position >= 0]
+        start = max(0, min(found, default=0) - self.LOCAL_SNIPPET_CHARS // 4)
+        end = start + self.LOCAL_SNIPPET_CHARS
+        return ("…" if start else "") + " ".join(text[start:end].split()) + ("…" if end < len(text) else "")
+
+    async def _refresh_search(self, cache_key: Tuple, request: MevzuatSearchRequest, return_result: bool = False) -> Any:
+        """Fetches a search from upstream and caches it if successful."""
+        result = await self._fetch_search_documents(request)
+        if self._local_index is not None and not result.error_message:
+            # Metadata of every document seen, for building local search results
+            for document in result.documents:
+                self._local_index.set_document_info(document)
+        if not result.error_message and not result.stale:
+            # Rough footprint: fixed overhead plus ~1 KB per document
+            self._search_cache.set(cache_key, result.model_copy(deep=True), size=512 + 1024 * len(result.documents))
+        return result if return_result else not (result.error_message or result.stale)
+
+    async def _prefetch_document(self, mevzuat_id: str) -> int:
+        """
+        Warms the article tree and full content of a document; returns bytes loaded.
+        The fetches are not coalesced: a coalesced fetch runs shielded in its own task,
+        so cancelling the prefetch would leave the upstream call running. A user request
+        for the same document meanwhile makes its own call. A conversion already running
+        on a pool worker cannot be interrupted and finishes without being awaited.
+        """
+        if ("mevzuat", mevzuat_id) in self._content_cache:
+            return 0
+        await self.get_compact_article_tree(mevzuat_id, coalesce=False)
+        content = await self.get_full_document_content(mevzuat_id, coalesce=False)
+        return len(content.markdown_content)
+
+    async def _fetch_search_documents(self, request: MevzuatSearchRequest) -> MevzuatSearchResult:
         payload = {
             "data": {
                 "pageSize": request.page_size,
@@ -77,19 +783,20 @@ class MevzuatApiClient:
             payload["data"]["resmiGazeteSayi"] = request.resmi_gazete_sayisi
             
         try:
-            response = await self._http_client.post(f"{self.BASE_URL}/searchDocuments", json=payload)
+            response = await self._post("searchDocuments", payload)
+            stale = response.extensions.get("last_good", False)
             response.raise_for_status()
-            data = response.json()
-            if data.get("metadata", {}).get("FMTY") != "SUCCESS":
-                error_msg = data.get("metadata", {}).get("FMTE", "Unknown API error")
+            data = SearchDocumentsResponse.model_validate_json(response.content)
+            if data.metadata.get("FMTY") != "SUCCESS":
+                error_msg = data.metadata.get("FMTE", "Unknown API error")
                 return MevzuatSearchResult(documents=[], total_results=0, current_page=request.page_number, page_size=request.page_size, total_pages=0, query_used=request.model_dump(), error_message=error_msg)
-            result_data = data.get("data", {})
-            total_results = result_data.get("total", 0)
+            result_data = data.data or SearchDocumentsData()
+            total_results = result_data.total
             return MevzuatSearchResult(
-                documents=[MevzuatDocument.model_validate(doc) for doc in result_data.get("mevzuatList", [])],
+                documents=result_data.mevzuat_list or [],
                 total_results=total_results, current_page=request.page_number, page_size=request.page_size,
                 total_pages=(total_results + request.page_size - 1) // request.page_size if request.page_size > 0 else 0,
-                query_used=request.model_dump()
+                query_used=request.model_dump(), stale=stale
             )
         except httpx.HTTPStatusError as e:
             return MevzuatSearchResult(documents=[], total_results=0, current_page=request.page_number, page_size=request.page_size, total_pages=0, query_used=request.model_dump(), error_message=f"API request failed: {e.response.status_code}")
@@ -97,42 +804,165 @@ class MevzuatApiClient:
             return MevzuatSearchResult(documents=[], total_results=0, current_page=request.page_number, page_size=request.page_size, total_pages=0, query_used=request.model_dump(), error_message=f"An unexpected error occurred: {e}")
 
     async def get_article_tree(self, mevzuat_id: str) -> List[MevzuatArticleNode]:
+        tree = await self.get_compact_article_tree(mevzuat_id)
+        return tree.to_nodes()
+
+    async def get_compact_article_tree(self, mevzuat_id: str, coalesce: bool = True) -> CompactArticleTree:
+        """
+        Article tree in its cached, array-backed form; cheaper than get_article_tree
+        when only lookups or the list of maddeler are needed. Empty if unavailable,
+        with error_message set if the fetch failed. With coalesce=False the fetch
+        bypasses request coalescing, so cancelling the caller cancels the upstream call.
+        """
+        cached_tree, freshness = await self._get_cached_tree(mevzuat_id)
+        if freshness == FRESH:
+            return cached_tree
+        refresh = lambda: self._fetch_article_tree(mevzuat_id)
+        fetch = lambda: self._single_flight.do(("tree", mevzuat_id), refresh) if coalesce else refresh()
+        if freshness == STALE:
+            self._revalidate(("tree", mevzuat_id), lambda: self._succeeded(fetch(), lambda tree: len(tree) > 0))
+            return cached_tree
+        tree = await fetch()
+        if not len(tree) and cached_tree is not None and len(cached_tree):
+            logger.warning(f"Article tree refetch failed for mevzuatId {mevzuat_id}; serving expired tree")
+            return cached_tree
+        return tree
+
+    async def _get_cached_tree(self, mevzuat_id: str) -> Tuple[Optional[CompactArticleTree], str]:
+        """Looks up an article tree in the memory cache, then in the persistent store."""
+        tree, freshness = self._content_cache.lookup(("tree", mevzuat_id))
+        if tree is not None or not self._store:
+            return tree, freshness
+        try:
+            stored = await asyncio.to_thread(self._store.get_tree, mevzuat_id)
+        except Exception:
+            logger.exception(f"Content store tree read failed for mevzuatId {mevzuat_id}")
+            return None, MISS
+        if stored is None:
+            return None, MISS
+        tree = CompactArticleTree.from_nodes(mevzuat_id, ArticleTreeAdapter.validate_json(stored.tree_json))
+        age = max(0.0, time.time() - stored.updated_at)
+        self._content_cache.set(("tree", mevzuat_id), tree, size=tree.nbytes(), ttl=self._content_cache.ttl - age)
+        return tree, self._content_cache.freshness(age)
+
+    @staticmethod
+    async def _succeeded(result: Awaitable[Any], check: Callable[[Any], bool]) -> bool:
+        return check(await result)
+
+    async def _fetch_article_tree(self, mevzuat_id: str) -> CompactArticleTree:
         payload = { "data": {"mevzuatId": mevzuat_id}, "applicationName": "UyapMevzuat" }
         try:
-            response = await self._http_client.post(f"{self.BASE_URL}/mevzuatMaddeTree", json=payload)
+            response = await self._post("mevzuatMaddeTree", payload)
+            stale = response.extensions.get("last_good", False)
             response.raise_for_status()
-            data = response.json()
-            if data.get("metadata", {}).get("FMTY") != "SUCCESS": return []
-            root_node = data.get("data", {})
-            return [MevzuatArticleNode.model_validate(child) for child in root_node.get("children", [])]
+            data = ArticleTreeResponse.model_validate_json(response.content)
+            if data.metadata.get("FMTY") != "SUCCESS":
+                return CompactArticleTree(mevzuat_id, data.metadata.get("FMTE", "Failed to retrieve article tree."))
+            nodes = (data.data and data.data.children) or []
+            tree = CompactArticleTree.from_nodes(mevzuat_id, nodes)
+            if stale:
+                return tree
+            self._content_cache.set(("tree", mevzuat_id), tree, size=tree.nbytes())
+            if self._store:
+                try:
+                    tree_json = ArticleTreeAdapter.dump_json(nodes, by_alias=True).decode("utf-8")
+                    await asyncio.to_thread(self._store.put_tree, mevzuat_id, tree_json)
+                except Exception:
+                    logger.exception(f"Content store tree write failed for mevzuatId {mevzuat_id}")
+            return tree
         except Exception as e:
             logger.exception(f"Error fetching article tree for mevzuatId {mevzuat_id}")
-            return []
+            return CompactArticleTree(mevzuat_id, f"An unexpected error occurred: {e}")
 
     async def get_article_content(self, madde_id: str, mevzuat_id: str) -> MevzuatArticleContent:
+        fetch = lambda: self._single_flight.do(("madde", madde_id), lambda: self._fetch_article_content(madde_id, mevzuat_id))
+        result = await self._serve_markdown("madde", madde_id, mevzuat_id, fetch)
+        if self._indexes_content() and result.markdown_content and not result.error_message:
+            tree = self._content_cache.peek(("tree", mevzuat_id))
+            node = tree.index_of(madde_id) if tree is not None else None
+            await self._index_content(("madde", madde_id), mevzuat_id, None if node is None else tree.title(node), result.markdown_content)
+        return result.model_copy(update={"mevzuat_id": mevzuat_id})
+
+    async def _serve_markdown(
+        self, kind: str, doc_id: str, mevzuat_id: str, fetch: Callable[[], Awaitable[MevzuatArticleContent]]
+    ) -> MevzuatArticleContent:
+        """Stale-while-revalidate front of the article and full-document content paths."""
+        cached_markdown, freshness = await self._get_cached_markdown(kind, doc_id)
+        if freshness == FRESH:
+            return MevzuatArticleContent(madde_id=doc_id, mevzuat_id=mevzuat_id, markdown_content=cached_markdown)
+        if freshness == STALE:
+            self._revalidate((kind, doc_id), lambda: self._succeeded(fetch(), lambda content: not (content.error_message or content.stale)))
+            return MevzuatArticleContent(madde_id=doc_id, mevzuat_id=mevzuat_id, markdown_content=cached_markdown, stale=True)
+        result = await fetch()
+        if result.error_message and cached_markdown is not None:
+            logger.warning(f"Refetch of {kind} {doc_id} failed ({result.error_message}); serving expired content")
+            return MevzuatArticleContent(madde_id=doc_id, mevzuat_id=mevzuat_id, markdown_content=cached_markdown, stale=True)
+        return result
+
+    async def _fetch_article_content(self, madde_id: str, mevzuat_id: str) -> MevzuatArticleContent:
         payload = {"data": {"id": madde_id, "documentType": "MADDE"}, "applicationName": "UyapMevzuat"}
         try:
-            response = await self._http_client.post(f"{self.BASE_URL}/getDocumentContent", json=payload)
+            response = await self._post("getDocumentContent", payload)
+            stale = response.extensions.get("last_good", False)
             response.raise_for_status()
-            data = response.json()
+            # The base64 content stays a view into the response bytes
+            data, b64_content = split_content_payload(response.content)
             if data.get("metadata", {}).get("FMTY") != "SUCCESS":
                 return MevzuatArticleContent(madde_id=madde_id, mevzuat_id=mevzuat_id, markdown_content="", error_message=data.get("metadata", {}).get("FMTE", "Failed to retrieve content."))
-            content_data = data.get("data", {})
-            b64_content = content_data.get("content", "")
-            html_content = self._html_from_base64(b64_content)
-            markdown_content = self._markdown_from_html(html_content)
-            return MevzuatArticleContent(madde_id=madde_id, mevzuat_id=mevzuat_id, markdown_content=markdown_content)
+            hash_value = content_hash(b64_content)
+            markdown_content = await self._get_stored_conversion(hash_value)
+            if markdown_content is None:
+                markdown_content = await self._conversion_pool.run(convert_html_payload, b64_content)
+            await self._remember_markdown("madde", madde_id, b64_content, markdown_content, hash_value, stale)
+            return MevzuatArticleContent(madde_id=madde_id, mevzuat_id=mevzuat_id, markdown_content=markdown_content, stale=stale)
         except Exception as e:
             logger.exception(f"Error fetching content for maddeId {madde_id}")
             return MevzuatArticleContent(madde_id=madde_id, mevzuat_id=mevzuat_id, markdown_content="", error_message=f"An unexpected error occurred: {e}")
     
-    async def get_full_document_content(self, mevzuat_id: str) -> MevzuatArticleContent:
-        """Retrieves the full content of a legislation document as a single unit."""
+    async def get_full_document_content(self, mevzuat_id: str, coalesce: bool = True) -> MevzuatArticleContent:
+        """
+        Retrieves the full content of a legislation document as a single unit.
+        coalesce=False bypasses request coalescing, as for get_compact_article_tree.
+        """
+        refresh = lambda: self._fetch_full_document_content(mevzuat_id)
+        fetch = lambda: self._single_flight.do(("mevzuat", mevzuat_id), refresh) if coalesce else refresh()
+        result = await self._serve_markdown("mevzuat", mevzuat_id, mevzuat_id, fetch)
+        if self._indexes_content() and result.markdown_content and not result.error_message:
+            tree = self._content_cache.peek(("tree", mevzuat_id))
+            if tree is None or not len(tree):
+                # Indexed as one unit until (unless) its articles are indexed
+                await self._index_content(("mevzuat", mevzuat_id), mevzuat_id, None, result.markdown_content)
+        return result.model_copy()
+
+    @property
+    def vector_index_enabled(self) -> bool:
+        return self._vector_search is not None
+
+    def _indexes_content(self) -> bool:
+        return self._local_index is not None or self._vector_search is not None
+
+    async def _index_content(self, key: Tuple[str, str], mevzuat_id: str, title: Optional[str], markdown: str) -> None:
+        """Adds converted markdown to the local and vector indexes under its content cache key."""
+        index = self._local_index
+        if index is not None and not index.contains(key, markdown):
+            if len(markdown) > self.LOCAL_INDEX_INLINE_CHARS:
+                analyzed = await asyncio.to_thread(analyze, markdown)
+            else:
+                analyzed = analyze(markdown)
+            index.add_analyzed(key, mevzuat_id, title, analyzed, hash(markdown))
+            if key[0] == "madde":
+                index.remove(("mevzuat", mevzuat_id))
+        vectors = self._vector_search
+        if vectors is not None and await vectors.add(key, mevzuat_id, title, markdown) and key[0] == "madde":
+            vectors.remove(("mevzuat", mevzuat_id))
+
+    async def _fetch_full_document_content(self, mevzuat_id: str) -> MevzuatArticleContent:
         payload = {"data": {"id": mevzuat_id, "documentType": "MEVZUAT"}, "applicationName": "UyapMevzuat"}
         try:
-            response = await self._http_client.post(f"{self.BASE_URL}/getDocumentContent", json=payload)
+            response = await self._post("getDocumentContent", payload)
+            stale = response.extensions.get("last_good", False)
             response.raise_for_status()
-            data = response.json()
+            data, b64_content = split_content_payload(response.content)
             if data.get("metadata", {}).get("FMTY") != "SUCCESS":
                 return MevzuatArticleContent(
                     madde_id=mevzuat_id, mevzuat_id=mevzuat_id,
@@ -140,30 +970,11 @@ class MevzuatApiClient:
                     error_message=data.get("metadata", {}).get("FMTE", "Failed to retrieve full document content.")
                 )
             
-            content_data = data.get("data", {})
-            b64_content = content_data.get("content", "")
-            
-            # Handle PDF content - try to extract if it's a PDF
-            if b64_content.startswith("JVBERi0"):  # PDF header in base64
-                try:
-                    import base64
-                    pdf_bytes = base64.b64decode(b64_content)
-                    # Use markitdown to convert PDF to markdown
-                    from markitdown import MarkItDown
-                    md = MarkItDown()
-                    result = md.convert_stream(pdf_bytes, file_extension=".pdf")
-                    markdown_content = result.text_content
-                except Exception as pdf_error:
-                    logger.warning(f"PDF extraction failed for {mevzuat_id}: {pdf_error}")
-                    markdown_content = f"PDF content available but could not be extracted. Content length: {len(b64_content)} characters."
-            else:
-                # Handle HTML content
-                html_content = self._html_from_base64(b64_content)
-                markdown_content = self._markdown_from_html(html_content)
+            markdown_content = await self._convert_full_document(mevzuat_id, b64_content, stale)
             
             return MevzuatArticleContent(
                 madde_id=mevzuat_id, mevzuat_id=mevzuat_id,
-                markdown_content=markdown_content
+                markdown_content=markdown_content, stale=stale
             )
         except Exception as e:
             logger.exception(f"Error fetching full document content for mevzuatId {mevzuat_id}")
@@ -171,4 +982,323 @@ class MevzuatApiClient:
                 madde_id=mevzuat_id, mevzuat_id=mevzuat_id,
                 markdown_content="", 
                 error_message=f"An unexpected error occurred: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    async def get_document_window(self, mevzuat_id: str, offset: int = 0, limit: Optional[int] = None) -> MevzuatContentWindow:
+        """
+        Returns characters [offset, offset + limit) of the full document's markdown.
+        The converted document is kept per mevzuat_id by the content cache (and store),
+        so paging through it downloads and converts the document only once.
+        """
+        limit = min(limit or self.DEFAULT_WINDOW_CHARS, self.MAX_WINDOW_CHARS)
+        window = MevzuatContentWindow(mevzuat_id=mevzuat_id, unit="char", offset=offset, limit=limit, total=0)
+        content = await self.get_full_document_content(mevzuat_id)
+        if content.error_message:
+            window.error_message = content.error_message
+            return window
+        markdown = content.markdown_content
+        window.total = len(markdown)
+        if offset and offset >= len(markdown):
+            window.error_message = f"Offset {offset} is past the end of the document ({len(markdown)} characters)."
+            window.not_found = True
+            return window
+        end = min(offset + limit, len(markdown))
+        window.markdown_content = markdown[offset:end]
+        window.next_offset = end if end < len(markdown) else None
+        window.stale = content.stale
+        return window
+
+    async def get_article_window(self, mevzuat_id: str, offset: int = 0, limit: Optional[int] = None) -> MevzuatContentWindow:
+        """
+        Returns articles [offset, offset + limit) of a legislation in table-of-contents
+        order, each fetched (or served from the content cache) individually.
+        markdown_content joins their texts; failed articles carry an error_message.
+        """
+        limit = min(limit or self.DEFAULT_WINDOW_ARTICLES, self.MAX_WINDOW_ARTICLES)
+        window = MevzuatContentWindow(mevzuat_id=mevzuat_id, unit="article", offset=offset, limit=limit, total=0)
+        tree = await self.get_compact_article_tree(mevzuat_id)
+        if tree.error_message:
+            window.error_message = tree.error_message
+            return window
+        total = len(tree.leaves())
+        window.total = total
+        if not total:
+            window.error_message = "Legislation has no article tree; page through it by character offset instead."
+            window.not_found = True
+            return window
+        if offset >= total:
+            window.error_message = f"Article offset {offset} is past the end of the legislation ({total} articles)."
+            window.not_found = True
+            return window
+        window.articles = [article async for article in self.iter_law_articles(mevzuat_id, start=offset, stop=offset + limit)]
+        window.markdown_content = "\n\n".join(article.markdown_content for article in window.articles if article.markdown_content)
+        window.next_offset = offset + limit if offset + limit < total else None
+        return window
+
+    async def iter_document_content(self, mevzuat_id: str, chunk_chars: Optional[int] = None) -> AsyncIterator[MevzuatContentChunk]:
+        """
+        Streams a legislation's text as it becomes available. A document whose converted
+        markdown is already cached is emitted from the cache in chunk_chars pieces. Otherwise,
+        if it has an article tree, articles are emitted one by one in table-of-contents
+        order as they are fetched (iter_law_articles), so the first one arrives without
+        waiting for the rest. Documents without a tree are fetched and converted whole,
+        then emitted in pieces; PDF documents are emitted page by page as pages are
+        extracted. A failed full fetch ends with one chunk carrying the error.
+        """
+        chunk_chars = chunk_chars or self.STREAM_CHUNK_CHARS
+        _, freshness = await self._get_cached_markdown("mevzuat", mevzuat_id)
+        if freshness not in (FRESH, STALE):
+            tree = await self.get_compact_article_tree(mevzuat_id)
+            if len(tree):
+                async for article in self.iter_law_articles(mevzuat_id):
+                    yield MevzuatContentChunk(
+                        mevzuat_id=mevzuat_id, index=article.index, unit="article", offset=article.index,
+                        madde_id=article.madde_id, title=article.title,
+                        markdown_content=article.markdown_content, error_message=article.error_message
+                    )
+                return
+            try:
+                spooled = await self._get_spooled_pdf(mevzuat_id)
+            except Exception as e:
+                # Reported by the full-document fetch below
+                logger.warning(f"Could not spool PDF for streaming {mevzuat_id}: {e}")
+                spooled = None
+            if spooled is not None:
+                for start in range(0, spooled.page_count, self.PDF_PAGES_PER_JOB):
+                    numbers = range(start, min(start + self.PDF_PAGES_PER_JOB, spooled.page_count))
+                    for number, text in zip(numbers, await self._pdf_pages(mevzuat_id, spooled, numbers)):
+                        yield MevzuatContentChunk(mevzuat_id=mevzuat_id, index=number, unit="page", offset=number, markdown_content=text)
+                return
+        content = await self.get_full_document_content(mevzuat_id)
+        if content.error_message:
+            yield MevzuatContentChunk(mevzuat_id=mevzuat_id, index=0, unit="char", offset=0, markdown_content="", error_message=content.error_message)
+            return
+        markdown = content.markdown_content
+        for index, offset in enumerate(range(0, len(markdown), chunk_chars)):
+            yield MevzuatContentChunk(mevzuat_id=mevzuat_id, index=index, unit="char", offset=offset, markdown_content=markdown[offset:offset + chunk_chars])
+
+    async def _convert_full_document(self, mevzuat_id: str, b64_content: Base64Payload, stale: bool = False) -> str:
+        hash_value = content_hash(b64_content)
+        markdown_content = await self._get_stored_conversion(hash_value)
+        
+        if markdown_content is not None:
+            # Identical payload was already converted (possibly by another worker)
+            await self._remember_markdown("mevzuat", mevzuat_id, b64_content, markdown_content, hash_value, stale)
+        # Handle PDF content - spool it to disk and extract it page by page
+        elif is_pdf_payload(b64_content):
+            try:
+                spooled = await self._spool_pdf(mevzuat_id, b64_content)
+                pages = await self._pdf_pages(mevzuat_id, spooled, range(spooled.page_count), cache=not stale, batch_size=spooled.page_count)
+                markdown_content = "\n\n".join(page for page in pages if page)
+                await self._remember_markdown("mevzuat", mevzuat_id, b64_content, markdown_content, hash_value, stale)
+            except Exception as pdf_error:
+                logger.warning(f"PDF extraction failed for {mevzuat_id}: {pdf_error}")
+                markdown_content = f"PDF content available but could not be extracted. Content length: {len(b64_content)} characters."
+        else:
+            # Handle HTML content
+            markdown_content = await self._conversion_pool.run(convert_html_payload, b64_content)
+            await self._remember_markdown("mevzuat", mevzuat_id, b64_content, markdown_content, hash_value, stale)
+        return markdown_content
+
+    async def _spool_pdf(self, mevzuat_id: str, b64_content: Base64Payload) -> SpooledPdf:
+        path, page_ids = await self._conversion_pool.run(spool_pdf_payload, b64_content, self._pdf_spool.directory)
+        spooled = SpooledPdf(path, page_ids)
+        self._pdf_spool.put(mevzuat_id, spooled)
+        return spooled
+
+    async def _get_spooled_pdf(self, mevzuat_id: str) -> Optional[SpooledPdf]:
+        """
+        The spooled PDF of a legislation, downloading it if needed. Returns None for
+        HTML documents, whose converted markdown is cached as a side effect.
+        """
+        spooled = self._pdf_spool.get(mevzuat_id)
+        if spooled is None:
+            spooled = await self._single_flight.do(("pdf", mevzuat_id), lambda: self._fetch_spooled_pdf(mevzuat_id))
+        return spooled
+
+    async def _fetch_spooled_pdf(self, mevzuat_id: str) -> Optional[SpooledPdf]:
+        payload = {"data": {"id": mevzuat_id, "documentType": "MEVZUAT"}, "applicationName": "UyapMevzuat"}
+        response = await self._post("getDocumentContent", payload)
+        stale = response.extensions.get("last_good", False)
+        response.raise_for_status()
+        data, b64_content = split_content_payload(response.content)
+        if data.get("metadata", {}).get("FMTY") != "SUCCESS":
+            raise ValueError(data.get("metadata", {}).get("FMTE", "Failed to retrieve full document content."))
+        if not is_pdf_payload(b64_content):
+            await self._convert_full_document(mevzuat_id, b64_content, stale)
+            return None
+        return await self._spool_pdf(mevzuat_id, b64_content)
+
+    async def _pdf_pages(
+        self, mevzuat_id: str, spooled: SpooledPdf, numbers: Iterable[int], cache: bool = True, batch_size: Optional[int] = None
+    ) -> List[str]:
+        """Texts of the given pages; only pages not in the content cache are extracted."""
+        numbers = list(numbers)
+        batch_size = max(1, batch_size or self.PDF_PAGES_PER_JOB)
+        texts: Dict[int, str] = {}
+        missing = []
+        for number in numbers:
+            text = self._content_cache.get(("pdf_page", mevzuat_id, number))
+            if text is None:
+                missing.append(number)
+            else:
+                texts[number] = text
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            extracted = await self._conversion_pool.run(extract_pdf_pages, spooled.path, [spooled.page_ids[number] for number in batch])
+            for number, text in zip(batch, extracted):
+                texts[number] = text
+                if cache:
+                    self._content_cache.set(("pdf_page", mevzuat_id, number), text)
+        return [texts[number] for number in numbers]
+
+    async def get_pdf_pages(self, mevzuat_id: str, offset: int = 0, limit: Optional[int] = None) -> MevzuatContentWindow:
+        """
+        Returns the text of (0-based) pages [offset, offset + limit) of a PDF-only
+        legislation. The PDF is decoded once to a temporary file and pages are extracted
+        on demand, each page at most once while it stays in the content cache.
+        """
+        limit = min(limit or self.DEFAULT_WINDOW_PAGES, self.MAX_WINDOW_PAGES)
+        window = MevzuatContentWindow(mevzuat_id=mevzuat_id, unit="page", offset=offset, limit=limit, total=0)
+        try:
+            spooled = await self._get_spooled_pdf(mevzuat_id)
+            if spooled is None:
+                window.error_message = "Legislation content is not a PDF document; page through it by character offset instead."
+                window.not_found = True
+                return window
+            if offset and offset >= spooled.page_count:
+                window.total = spooled.page_count
+                window.error_message = f"Page offset {offset} is past the end of the document ({spooled.page_count} pages)."
+                window.not_found = True
+                return window
+            end = min(offset + limit, spooled.page_count)
+            window.pages = await self._pdf_pages(mevzuat_id, spooled, range(offset, end))
+        except Exception as e:
+            logger.exception(f"Error extracting PDF pages {offset}+{limit} of mevzuatId {mevzuat_id}")
+            window.error_message = f"An unexpected error occurred: {e}"
+            return window
+        window.total = spooled.page_count
+        window.markdown_content = "\n\n".join(page for page in window.pages if page)
+        window.next_offset = end if end < spooled.page_count else None
+        return window
+
+    async def resolve_article(self, mevzuat_no: str, madde_no: int, mevzuat_tur: Optional[str] = None) -> MevzuatResolvedArticle:
+        """
+        Returns the text of article madde_no of the legislation numbered mevzuat_no
+        (e.g. 5237, 141 for TCK md. 141) in one call: search by number, article tree,
+        then article content. Both lookups are memoized, so repeat calls go straight
+        to the (cached) content. Without mevzuat_tur, types are preferred in the
+        order of the default type list (KANUN first, MULGA last). not_found is set
+        when the lookups succeeded but the legislation or article does not exist;
+        upstream failures are passed through in error_message without it.
+        """
+        mevzuat_no = mevzuat_no.strip()
+        resolved = MevzuatResolvedArticle(mevzuat_no=mevzuat_no, madde_no=madde_no, mevzuat_tur=mevzuat_tur)
+        document, error_message = await self._resolve_document(mevzuat_no, mevzuat_tur)
+        if error_message:
+            resolved.error_message = error_message
+            return resolved
+        if document is None:
+            tur_text = f" {mevzuat_tur}" if mevzuat_tur else ""
+            resolved.error_message = f"No{tur_text} legislation found with number {mevzuat_no}."
+            resolved.not_found = True
+            return resolved
+        resolved.mevzuat_id, resolved.mevzuat_adi, resolved.mevzuat_tur = document
+
+        article_key = ("madde_no", resolved.mevzuat_id, madde_no)
+        article = self._resolve_cache.get(article_key)
+        if article is None:
+            tree = await self.get_compact_article_tree(resolved.mevzuat_id)
+            if tree.error_message:
+                resolved.error_message = tree.error_message
+                return resolved
+            index = tree.index_of_madde_no(madde_no)
+            if index is None:
+                resolved.error_message = (
+                    f"Article {madde_no} not found in {resolved.mevzuat_adi}."
+                    if len(tree) else f"{resolved.mevzuat_adi} has no article tree; retrieve the full document instead."
+                )
+                resolved.not_found = True
+                return resolved
+            article = (tree.madde_id(index), tree.title(index))
+            self._resolve_cache.set(article_key, article, size=256)
+        resolved.madde_id, resolved.title = article
+
+        content = await self.get_article_content(resolved.madde_id, resolved.mevzuat_id)
+        if content.error_message:
+            # The article may have moved; resolve it again next time
+            self._resolve_cache.pop(article_key)
+        resolved.markdown_content = content.markdown_content
+        resolved.error_message = content.error_message
+        resolved.stale = content.stale
+        return resolved
+
+    async def _resolve_document(
+        self, mevzuat_no: str, mevzuat_tur: Optional[str]
+    ) -> Tuple[Optional[Tuple[str, str, str]], Optional[str]]:
+        """
+        Finds (mevzuat_id, mevzuat_adi, tür) for a legislation number, memoized.
+        Returns (document, error_message); document is None if there is no match.
+        """
+        document_key = ("mevzuat_no", mevzuat_no, mevzuat_tur)
+        document = self._resolve_cache.get(document_key)
+        if document is not None:
+            return document, None
+        tur_list = [mevzuat_tur] if mevzuat_tur else MevzuatSearchRequest().mevzuat_tur_list
+        request = MevzuatSearchRequest(mevzuat_no=mevzuat_no, mevzuat_tur_list=tur_list, page_size=self.MAX_SEARCH_PAGE_SIZE)
+        result = await self._search_page(request)
+        if result.error_message:
+            return None, result.error_message
+        type_order = {name: position for position, name in enumerate(request.mevzuat_tur_list)}
+        candidates = [doc for doc in result.documents if str(doc.mevzuat_no) == mevzuat_no]
+        if not candidates:
+            return None, None
+        best = min(candidates, key=lambda doc: type_order.get(doc.mevzuat_tur.name, len(type_order)))
+        document = (best.mevzuat_id, best.mevzuat_adi, best.mevzuat_tur.name)
+        self._resolve_cache.set(document_key, document, size=512)
+        return document, None
+
+    async def iter_law_articles(
+        self, mevzuat_id: str, concurrency: Optional[int] = None, start: int = 0, stop: Optional[int] = None
+    ) -> AsyncIterator[MevzuatBulkArticle]:
+        """
+        Fetches every article of a legislation (or articles start..stop-1) with bounded
+        concurrency and yields them in article tree order as soon as each one (and all
+        before it) is ready. Per-article failures are reported in the yielded item's error_message.
+        """
+        concurrency = concurrency or self.bulk_fetch_concurrency
+        tree = await self.get_compact_article_tree(mevzuat_id)
+        articles = tree.leaves()[start:stop]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(index: int, node: int) -> MevzuatBulkArticle:
+            madde_id = tree.madde_id(node)
+            async with semaphore:
+                content = await self.get_article_content(madde_id, mevzuat_id)
+            return MevzuatBulkArticle(
+                index=index, madde_id=madde_id, mevzuat_id=mevzuat_id,
+                madde_no=tree.madde_no(node), title=tree.title(node),
+                markdown_content=content.markdown_content, error_message=content.error_message
+            )
+
+        # Keep a bounded window of fetches ahead of the consumer
+        window = concurrency * 2
+        pending: deque = deque()
+        remaining = iter(enumerate(articles, start))
+
+        def fill_window():
+            while len(pending) < window:
+                item = next(remaining, None)
+                if item is None:
+                    return
+                pending.append(asyncio.ensure_future(fetch(*item)))
+
+        try:
+            fill_window()
+            while pending:
+                result = await pending.popleft()
+                fill_window()
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
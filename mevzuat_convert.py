@@ -0,0 +1,654 @@
+"""
+HTML/PDF to markdown conversion for upstream document payloads.
+Conversion functions are module-level so they can run in a thread or process
+pool; ConversionPool dispatches them off the event loop.
+"""
+
+import asyncio
+import base64
+import binascii
+import concurrent.futures
+import io
+import json
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup
+from lxml import etree
+from markitdown import MarkItDown
+
+logger = logging.getLogger(__name__)
+
+PDF_BASE64_PREFIX = "JVBERi0"  # "%PDF-" encoded as base64
+
+# An upstream base64 payload: the str from a parsed response, or (preferably) a
+# memoryview of the raw response bytes from split_content_payload
+Base64Payload = Union[str, bytes, bytearray, memoryview]
+
+# Base64 characters decoded per step (a multiple of 4)
+_DECODE_CHARS = 4 * 64 * 1024
+_SPOOL_DECODE_CHARS = 4 * 256 * 1024
+_WHITESPACE_RE = re.compile(r"\s")
+_WHITESPACE_BYTES_RE = re.compile(rb"\s")
+_CONTENT_FIELD_RE = re.compile(rb'"content"\s*:\s*"')
+
+_local = threading.local()
+
+
+def _get_md_converter() -> MarkItDown:
+    """One MarkItDown instance per worker thread/process."""
+    converter = getattr(_local, "md_converter", None)
+    if converter is None:
+        converter = MarkItDown()
+        _local.md_converter = converter
+    return converter
+
+
+def html_from_base64(b64_string: Base64Payload) -> str:
+    try:
+        decoded_bytes = base64.b64decode(b64_string)
+        return decoded_bytes.decode('utf-8')
+    except Exception: return ""
+
+
+def split_content_payload(body: bytes) -> Tuple[Dict[str, Any], memoryview]:
+    """
+    Splits a getDocumentContent response into its JSON envelope (with data.content
+    emptied) and a memoryview of the base64 content inside the raw response bytes,
+    so the (large) content field is never materialised as a Python str.
+    Falls back to a regular parse if the field is escaped or not where expected.
+    """
+    match = _CONTENT_FIELD_RE.search(body)
+    if match:
+        start = match.end()
+        end = body.find(b'"', start)
+        if end != -1 and body.find(b"\\", start, end) == -1:
+            envelope = json.loads(body[:start] + body[end:])
+            data = envelope.get("data")
+            if isinstance(data, dict) and data.get("content") == "":
+                return envelope, memoryview(body)[start:end]
+    envelope = json.loads(body)
+    data = envelope.get("data")
+    if not isinstance(data, dict):
+        return envelope, memoryview(b"")
+    content = data.get("content") or ""
+    data["content"] = ""
+    return envelope, memoryview(content.encode("ascii", "ignore"))
+
+
+def is_pdf_payload(b64_content: Base64Payload) -> bool:
+    if isinstance(b64_content, str):
+        return b64_content.startswith(PDF_BASE64_PREFIX)
+    return bytes(b64_content[:len(PDF_BASE64_PREFIX)]) == PDF_BASE64_PREFIX.encode()
+
+
+def iter_base64_decoded(b64_content: Base64Payload, chunk_chars: int = _DECODE_CHARS) -> Iterator[bytes]:
+    """
+    Decodes a base64 payload in pieces of chunk_chars characters, so only one
+    decoded piece exists at a time. Payloads containing whitespace or padding
+    errors are decoded in one step.
+    """
+    if isinstance(b64_content, str):
+        if len(b64_content) % 4 or _WHITESPACE_RE.search(b64_content):
+            yield base64.b64decode(b64_content)
+            return
+    else:
+        b64_content = memoryview(b64_content)
+        if len(b64_content) % 4 or _WHITESPACE_BYTES_RE.search(b64_content):
+            yield base64.b64decode(b64_content)
+            return
+    for start in range(0, len(b64_content), chunk_chars):
+        yield binascii.a2b_base64(b64_content[start:start + chunk_chars])
+
+
+_BOLD = "\x01"
+_ITALIC = "\x02"
+_SKIPPED_TAGS = {"script", "style", "head", "title", "noscript"}
+_BLOCK_TAGS = {"p", "div", "h1", "h2", "h3", "h4", "h5", "h6", "li", "blockquote", "center", "section", "article", "dd", "dt"}
+_INLINE_WS_RE = re.compile(r"[ \t\r\f\v\xa0\u200b]+")
+_EMPTY_MARKER_RE = {
+    marker: re.compile(f"{marker}(\\s*){marker}") for marker in (_BOLD, _ITALIC)
+}
+_MARKER_SPAN_RE = {
+    marker: re.compile(f"{marker}(\\s*)([^{marker}]*?)(\\s*){marker}") for marker in (_BOLD, _ITALIC)
+}
+
+
+class _MarkdownTarget:
+    """
+    lxml parser target that turns the mevzuat HTML dialect into markdown while
+    the document is being parsed: paragraphs (madde headings, fıkra and bent
+    lines), headings, bold/italic runs, lists and tables.
+    """
+
+    def __init__(self):
+        self.blocks: List[str] = []
+        self.inline: List[str] = []
+        self.skip_depth = 0
+        self.block_prefix = ""
+        self.block_is_item = False
+        self.last_was_item = False
+        self.list_stack: List[List[Any]] = []  # [tag, item counter]
+        self.tables: List[Dict[str, Any]] = []  # rows, current row, current cell
+
+    # --- inline buffer -------------------------------------------------------
+    def _buffer(self) -> List[str]:
+        if self.tables and self.tables[-1]["cell"] is not None:
+            return self.tables[-1]["cell"]
+        return self.inline
+
+    @staticmethod
+    def _render_inline(parts: List[str]) -> str:
+        text = "".join(parts)
+        lines = []
+        for line in text.split("\n"):
+            line = _INLINE_WS_RE.sub(" ", line).strip()
+            for marker, pattern in _EMPTY_MARKER_RE.items():
+                line = pattern.sub(r"\1", line)
+            if line:
+                lines.append(line)
+        text = "\n".join(lines)
+        for marker, symbol in ((_BOLD, "**"), (_ITALIC, "*")):
+            text = _MARKER_SPAN_RE[marker].sub(
+                lambda m: f"{m.group(1)}{symbol}{m.group(2)}{symbol}{m.group(3)}" if m.group(2) else m.group(1) + m.group(3),
+                text,
+            )
+            text = text.replace(marker, "")
+        return text.strip()
+
+    def _flush(self) -> None:
+        text = self._render_inline(self.inline)
+        self.inline = []
+        if text:
+            is_item = self.block_is_item
+            block = self.block_prefix + text.replace("\n", "  \n")
+            if is_item and self.last_was_item:
+                self.blocks[-1] += "\n" + block
+            else:
+                self.blocks.append(block)
+            self.last_was_item = is_item
+        self.block_prefix = ""
+        self.block_is_item = False
+
+    # --- parser target interface ---------------------------------------------
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag in _SKIPPED_TAGS:
+            self.skip_depth += 1
+            return
+        if self.skip_depth:
+            return
+        if tag in ("b", "strong"):
+            self._buffer().append(_BOLD)
+        elif tag in ("i", "em"):
+            self._buffer().append(_ITALIC)
+        elif tag == "br":
+            self._buffer().append("\n")
+        elif tag == "table":
+            if self.tables and self.tables[-1]["cell"] is not None:
+                # Nested layout table: its cells flow into the outer cell
+                self.tables[-1]["nested"] += 1
+                return
+            self._flush()
+            self.tables.append({"rows": [], "row": None, "cell": None, "nested": 0})
+        elif self.tables and self.tables[-1]["nested"]:
+            if tag in ("td", "th", "tr"):
+                self._buffer().append(" ")
+        elif tag == "tr" and self.tables:
+            self.tables[-1]["row"] = []
+        elif tag in ("td", "th") and self.tables:
+            table = self.tables[-1]
+            if table["row"] is None:
+                table["row"] = []
+            table["cell"] = []
+        elif tag in ("ul", "ol"):
+            self._flush()
+            self.list_stack.append([tag, 0])
+        elif tag in _BLOCK_TAGS:
+            if self.tables and self.tables[-1]["cell"] is not None:
+                self._buffer().append("\n")
+                return
+            self._flush()
+            if tag[0] == "h" and tag[1:].isdigit():
+                self.block_prefix = "#" * int(tag[1:]) + " "
+            elif tag == "li" and self.list_stack:
+                entry = self.list_stack[-1]
+                entry[1] += 1
+                indent = "  " * (len(self.list_stack) - 1)
+                self.block_prefix = indent + (f"{entry[1]}. " if entry[0] == "ol" else "- ")
+                self.block_is_item = True
+            elif tag == "blockquote":
+                self.block_prefix = "> "
+
+    def end(self, tag: str) -> None:
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag in _SKIPPED_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if self.skip_depth:
+            return
+        if tag in ("b", "strong"):
+            self._buffer().append(_BOLD)
+        elif tag in ("i", "em"):
+            self._buffer().append(_ITALIC)
+        elif tag == "table" and self.tables:
+            if self.tables[-1]["nested"]:
+                self.tables[-1]["nested"] -= 1
+                return
+            self._end_table(self.tables.pop())
+        elif self.tables and self.tables[-1]["nested"]:
+            return
+        elif tag in ("td", "th") and self.tables:
+            table = self.tables[-1]
+            if table["cell"] is not None:
+                cell = self._render_inline(table["cell"]).replace("\n", " ").replace("|", "\\|")
+                table["row"].append(cell)
+                table["cell"] = None
+        elif tag == "tr" and self.tables:
+            table = self.tables[-1]
+            if table["row"]:
+                table["rows"].append(table["row"])
+            table["row"] = None
+        elif tag in ("ul", "ol"):
+            self._flush()
+            if self.list_stack:
+                self.list_stack.pop()
+        elif tag in _BLOCK_TAGS:
+            if self.tables and self.tables[-1]["cell"] is not None:
+                return
+            self._flush()
+
+    def _end_table(self, table: Dict[str, Any]) -> None:
+        if table["row"]:
+            table["rows"].append(table["row"])
+        rows = [row for row in table["rows"] if any(cell for cell in row)]
+        if not rows:
+            return
+        if len(rows) == 1 and len(rows[0]) == 1:
+            # Single-cell layout table: keep the text as a paragraph
+            self.blocks.append(rows[0][0])
+            self.last_was_item = False
+            return
+        width = max(len(row) for row in rows)
+        lines = []
+        for index, row in enumerate(rows):
+            lines.append("| " + " | ".join(row + [""] * (width - len(row))) + " |")
+            if index == 0:
+                lines.append("| " + " | ".join(["---"] * width) + " |")
+        self.blocks.append("\n".join(lines))
+        self.last_was_item = False
+
+    def data(self, text: str) -> None:
+        if not self.skip_depth:
+            self._buffer().append(text)
+
+    def comment(self, text: str) -> None:
+        pass
+
+    def close(self) -> str:
+        while self.tables:
+            self._end_table(self.tables.pop())
+        self._flush()
+        return "\n\n".join(self.blocks)
+
+
+def native_html_to_markdown(html_content: Union[str, bytes]) -> str:
+    """
+    Converts bedesten article/document HTML to markdown in a single lxml parse
+    pass, without building a document tree.
+    """
+    target = _MarkdownTarget()
+    parser = etree.HTMLParser(target=target, encoding="utf-8" if isinstance(html_content, (bytes, bytearray, memoryview)) else None)
+    parser.feed(bytes(html_content) if isinstance(html_content, memoryview) else html_content)
+    return parser.close()
+
+
+def native_html_chunks_to_markdown(chunks: Iterator[bytes]) -> str:
+    """native_html_to_markdown over UTF-8 HTML arriving in pieces (lxml push parser)."""
+    target = _MarkdownTarget()
+    parser = etree.HTMLParser(target=target, encoding="utf-8")
+    for chunk in chunks:
+        if chunk:
+            parser.feed(chunk)
+    return parser.close()
+
+
+def html_to_markdown(html_content: str) -> str:
+    if not html_content: return ""
+    try:
+        markdown = native_html_to_markdown(html_content)
+        if markdown:
+            return markdown
+    except Exception:
+        logger.debug("Native HTML conversion failed, falling back to MarkItDown", exc_info=True)
+    return _fallback_html_to_markdown(html_content)
+
+
+def _fallback_html_to_markdown(html_content: str) -> str:
+    try:
+        html_bytes = html_content.encode('utf-8')
+        html_io = io.BytesIO(html_bytes)
+        conv_res = _get_md_converter().convert(html_io)
+        if conv_res and conv_res.text_content:
+            return conv_res.text_content.strip()
+        return ""
+    except Exception:
+        soup = BeautifulSoup(html_content, 'lxml')
+        return soup.get_text(separator='\n', strip=True)
+
+
+def convert_html_payload(b64_content: Base64Payload) -> str:
+    """
+    Decodes a base64 HTML payload and converts it to markdown. The payload is
+    decoded piece by piece straight into the parser; the decoded HTML is only
+    materialised if the native converter fails and a fallback has to run.
+    """
+    if not b64_content:
+        return ""
+    try:
+        markdown = native_html_chunks_to_markdown(iter_base64_decoded(b64_content))
+        if markdown:
+            return markdown
+    except Exception:
+        logger.debug("Native HTML conversion failed, falling back to MarkItDown", exc_info=True)
+    html_content = html_from_base64(b64_content)
+    return _fallback_html_to_markdown(html_content) if html_content else ""
+
+
+def spool_pdf_payload(b64_content: Base64Payload, directory: Optional[str] = None) -> Tuple[str, List[int]]:
+    """
+    Decodes a base64 PDF payload into a temporary file piece by piece, so the
+    decoded document is never held in memory as a whole.
+    Returns (path, page object ids in page order); the caller owns (and deletes) the file.
+    """
+    handle = tempfile.NamedTemporaryFile(prefix="mevzuat-", suffix=".pdf", dir=directory, delete=False)
+    try:
+        with handle:
+            for piece in iter_base64_decoded(b64_content, _SPOOL_DECODE_CHARS):
+                handle.write(piece)
+        return handle.name, pdf_page_ids(handle.name)
+    except Exception:
+        os.unlink(handle.name)
+        raise
+
+
+def pdf_page_ids(path: str) -> List[int]:
+    """
+    Object ids of the pages in page order, from one walk of the page tree. Later
+    extractions load pages by id instead of walking the tree again.
+    """
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    with open(path, "rb") as fp:
+        return [page.pageid for page in PDFPage.create_pages(PDFDocument(PDFParser(fp)))]
+
+
+def _load_pdf_page(document: Any, page_id: int) -> Any:
+    """Builds one PDFPage by object id, with the attributes it inherits from its parents."""
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdftypes import dict_value, resolve1
+
+    attrs = dict_value(document.getobj(page_id)).copy()
+    parent = resolve1(attrs.get("Parent"))
+    seen = set()
+    while isinstance(parent, dict) and id(parent) not in seen:
+        seen.add(id(parent))
+        for key in PDFPage.INHERITABLE_ATTRS:
+            if key not in attrs and key in parent:
+                attrs[key] = parent[key]
+        parent = resolve1(parent.get("Parent"))
+    return PDFPage(document, page_id, attrs, None)
+
+
+def extract_pdf_pages(path: str, page_ids: List[int]) -> List[str]:
+    """Extracts the text of the given pages (object ids from pdf_page_ids) of a spooled PDF."""
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfparser import PDFParser
+
+    texts = []
+    resources = PDFResourceManager(caching=True)
+    with open(path, "rb") as fp:
+        document = PDFDocument(PDFParser(fp))
+        for page_id in page_ids:
+            output = io.StringIO()
+            device = TextConverter(resources, output, laparams=LAParams())
+            try:
+                PDFPageInterpreter(resources, device).process_page(_load_pdf_page(document, page_id))
+            finally:
+                device.close()
+            texts.append(output.getvalue().strip())
+    return texts
+
+
+class SpooledPdf:
+    """A decoded PDF payload kept in a temporary file for page-by-page extraction."""
+
+    __slots__ = ("path", "page_ids", "size")
+
+    def __init__(self, path: str, page_ids: List[int]):
+        self.path = path
+        self.page_ids = page_ids
+        self.size = os.path.getsize(path)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_ids)
+
+
+class PdfSpool:
+    """
+    Spooled PDFs keyed by mevzuat_id, least recently used first out.
+    Evicted, replaced and (on close) remaining files are deleted.
+    """
+
+    def __init__(self, max_files: int = 16, directory: Optional[str] = None):
+        self.max_files = max_files
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._files: "OrderedDict[str, SpooledPdf]" = OrderedDict()
+        self.spooled = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[SpooledPdf]:
+        spooled = self._files.get(key)
+        if spooled is not None:
+            if os.path.exists(spooled.path):
+                self._files.move_to_end(key)
+                return spooled
+            del self._files[key]
+        return None
+
+    def put(self, key: str, spooled: SpooledPdf) -> None:
+        previous = self._files.pop(key, None)
+        if previous is not None and previous.path != spooled.path:
+            self._delete(previous)
+        self._files[key] = spooled
+        self.spooled += 1
+        while len(self._files) > self.max_files:
+            _, evicted = self._files.popitem(last=False)
+            self._delete(evicted)
+            self.evictions += 1
+
+    @staticmethod
+    def _delete(spooled: SpooledPdf) -> None:
+        try:
+            os.unlink(spooled.path)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        for spooled in self._files.values():
+            self._delete(spooled)
+        self._files.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "files": len(self._files),
+            "max_files": self.max_files,
+            "bytes": sum(spooled.size for spooled in self._files.values()),
+            "spooled": self.spooled,
+            "evictions": self.evictions,
+        }
+
+
+_trace_lock = threading.Lock()
+
+
+def run_traced(fn: Callable[..., Any], *args: Any) -> Tuple[Any, int]:
+    """
+    Runs fn under tracemalloc and returns (result, peak bytes allocated by it).
+    Traced jobs run one at a time per process so their peaks do not mix.
+    """
+    with _trace_lock:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        try:
+            result = fn(*args)
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            if started:
+                tracemalloc.stop()
+    return result, peak
+
+
+class ConversionPool:
+    """
+    Runs blocking conversions on a thread or process pool with a bounded queue.
+
+    mode: "thread", "process" or "inline" (run on the event loop, no pool).
+    queue_size: jobs allowed to wait for a free worker before callers block.
+    timeout: seconds a caller waits for a job, including time spent queued. A job
+    that times out keeps its worker and queue slot until it actually finishes.
+    trace_memory: diagnostic; measure each job's peak allocation with tracemalloc.
+    This slows conversions down and runs them one at a time, so keep it off in production.
+    """
+
+    def __init__(
+        self, mode: str = "thread", max_workers: Optional[int] = None, queue_size: int = 32,
+        timeout: float = 60.0, trace_memory: bool = False
+    ):
+        self.mode = mode
+        self.trace_memory = trace_memory
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(self.max_workers + queue_size)
+        self._executor: Optional[concurrent.futures.Executor] = None
+        if mode == "thread":
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="mevzuat-convert"
+            )
+        elif mode == "process":
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        elif mode != "inline":
+            raise ValueError(f"Unknown conversion executor mode: {mode}")
+        self.queue_size = queue_size
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.last_peak_bytes = 0
+        self.max_peak_bytes = 0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.mode == "process":
+            # Payload memoryviews cannot be pickled to a worker process
+            args = tuple(bytes(arg) if isinstance(arg, memoryview) else arg for arg in args)
+        if not self.trace_memory:
+            return await self._run(fn, *args)
+        result, peak = await self._run(run_traced, fn, *args)
+        self.last_peak_bytes = peak
+        self.max_peak_bytes = max(self.max_peak_bytes, peak)
+        return result
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        self.submitted += 1
+        if self._executor is None:
+            try:
+                result = fn(*args)
+            except Exception:
+                self.failed += 1
+                raise
+            self.completed += 1
+            return result
+        try:
+            return await asyncio.wait_for(self._run_in_executor(fn, *args), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            name = args[0].__name__ if fn is run_traced else fn.__name__
+            logger.warning(f"Conversion job {name} timed out after {self.timeout}s")
+            raise
+
+    async def _run_in_executor(self, fn: Callable[..., Any], *args: Any) -> Any:
+        # The slot is held until the job itself finishes, not until the caller stops
+        # waiting: a timed-out job keeps its worker busy and must keep counting.
+        await self._slots.acquire()
+        self.in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._job_done()
+            raise
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: self._call_soon(loop, self._job_done))
+        try:
+            result = await asyncio.wrap_future(future)
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        return result
+
+    @staticmethod
+    def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+        try:
+            loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            pass  # event loop already closed
+
+    def _job_done(self) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    def saturated(self) -> bool:
+        """True when every worker is busy and new jobs would queue."""
+        return self._executor is not None and self.in_flight >= self.max_workers
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "timeout_seconds": self.timeout,
+            "in_flight": self.in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+        }
+        if self.trace_memory:
+            stats["last_peak_bytes"] = self.last_peak_bytes
+            stats["max_peak_bytes"] = self.max_peak_bytes
+        return stats
@@ -0,0 +1,402 @@
+"""
+Local full-text index over converted article markdown.
+The MevzuatApiClient adds articles to it as they are fetched and converted, so
+searches over the working set can be answered without upstream (BM25 ranking,
+Turkish-aware case folding).
+"""
+
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Collection, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from mevzuat_models import MevzuatDocument
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def turkish_lower(text: str) -> str:
+    """Lowercases with the Turkish dotted/dotless i rules (I -> ı, İ -> i)."""
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded word tokens (letters and digits, including ç ğ ı ö ş ü)."""
+    return _TOKEN_RE.findall(turkish_lower(text))
+
+
+def analyze(text: str) -> Tuple[Dict[str, array], int]:
+    """Token positions per term and the token count of a text, ready for LocalIndex.add_analyzed."""
+    positions: Dict[str, array] = {}
+    tokens = tokenize(text)
+    for position, term in enumerate(tokens):
+        entry = positions.get(term)
+        if entry is None:
+            positions[term] = array("i", (position,))
+        else:
+            entry.append(position)
+    return positions, len(tokens)
+
+
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _distance(masks: Dict[str, int], length: int, text: str) -> int:
+    """Levenshtein distance between the pattern given by its masks/length and text (Myers' bit-parallel algorithm)."""
+    if not length:
+        return len(text)
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    pv, mv, score = full, 0, length
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+def levenshtein(a: str, b: str) -> int:
+    return _distance(_pattern_masks(a), len(a), b)
+
+
+def _grams(term: str) -> List[str]:
+    padded = "\x02" + term + "\x03"
+    return [padded[i:i + 2] for i in range(len(padded) - 1)]
+
+
+class TermGramIndex:
+    """
+    Padded bigrams of the term dictionary, for fuzzy term lookup. Each edit
+    changes at most two of the len(term) + 1 bigrams of a term, so a term within
+    k edits of a query shares at least len(query) + 1 - 2k bigrams with it:
+    counting shared bigrams over the query's lists leaves few candidates to
+    verify with the exact (bit-parallel) distance. Terms cannot be removed;
+    callers filter out terms that no longer exist.
+    """
+
+    __slots__ = ("_lists", "size")
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._lists: Dict[str, List[str]] = {}
+        self.size = 0
+        for term in terms:
+            self.add(term)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, term: str) -> None:
+        lists = self._lists
+        for gram in _grams(term):
+            entries = lists.get(gram)
+            if entries is None:
+                lists[gram] = [term]
+            else:
+                entries.append(term)
+        self.size += 1
+
+    def search(self, term: str, max_edits: int, terms: Iterable[str] = ()) -> List[Tuple[str, int]]:
+        """
+        (term, distance) for every stored term within max_edits of term. When the
+        bigram bound is vacuous (short term, many edits) the given terms are scanned.
+        """
+        length = len(term)
+        needed = length + 1 - 2 * max_edits
+        if needed > 0:
+            counts: Counter = Counter()
+            for gram in _grams(term):
+                entries = self._lists.get(gram)
+                if entries:
+                    counts.update(entries)
+            candidates: Iterable[str] = (candidate for candidate, count in counts.items() if count >= needed)
+        else:
+            candidates = terms
+        masks = _pattern_masks(term)
+        found = []
+        for candidate in candidates:
+            if abs(len(candidate) - length) <= max_edits:
+                distance = _distance(masks, length, candidate)
+                if distance <= max_edits:
+                    found.append((candidate, distance))
+        return found
+
+
+class IndexedArticle:
+    """One indexed unit (an article, or a whole document without an article tree)."""
+
+    __slots__ = ("key", "mevzuat_id", "title", "length", "terms", "fingerprint")
+
+    def __init__(self, key: Hashable, mevzuat_id: str, title: Optional[str], length: int, terms: Tuple[str, ...], fingerprint: int):
+        self.key = key
+        self.mevzuat_id = mevzuat_id
+        self.title = title
+        self.length = length
+        self.terms = terms
+        self.fingerprint = fingerprint
+
+
+class LocalHit:
+    """A search hit: the article and its BM25 score."""
+
+    __slots__ = ("article", "score")
+
+    def __init__(self, article: IndexedArticle, score: float):
+        self.article = article
+        self.score = score
+
+
+class LocalIndex:
+    """
+    In-memory positional inverted index with BM25 ranking.
+
+    postings[term][doc] holds the token positions of term in indexed unit doc.
+    Units have a hashable key (the client uses its content cache keys); adding a
+    key again with different text replaces it. When max_documents is exceeded the
+    oldest units are dropped. Search metadata of legislation (name, number, type)
+    is kept separately from search results, for filtering and for building
+    MevzuatDocument results. Not thread-safe: use it from the event loop.
+
+    The term dictionary is also kept as a sorted list, for prefix and wildcard
+    expansion (built on first use, then updated with the terms added since at
+    the next lookup), and as a bigram index for fuzzy lookup (updated as terms
+    are added). Removed terms are skipped until these are rebuilt. Expansions
+    are memoized until the set of terms changes.
+    """
+
+    # New terms merged into the sorted term list one by one (beyond this it is re-sorted)
+    SORTED_MERGE_LIMIT = 1024
+    MAX_CACHED_EXPANSIONS = 1024
+
+    def __init__(self, max_documents: int = 100000, k1: float = 1.2, b: float = 0.75, max_document_info: int = 50000):
+        self.max_documents = max_documents
+        self.k1 = k1
+        self.b = b
+        self.max_document_info = max_document_info
+        self._postings: Dict[str, Dict[int, array]] = {}
+        self._articles: "OrderedDict[int, IndexedArticle]" = OrderedDict()
+        self._lengths: Dict[int, int] = {}
+        self._by_key: Dict[Hashable, int] = {}
+        self._next_doc = 0
+        self._total_length = 0
+        self._posting_count = 0
+        self._document_info: "OrderedDict[str, MevzuatDocument]" = OrderedDict()
+        self._sorted_terms: Optional[List[str]] = None
+        self._term_grams = TermGramIndex()
+        # Terms added since the sorted list was updated, and terms removed since it / the bigram index were built
+        self._new_sorted_terms: List[str] = []
+        self._dead_sorted_terms = 0
+        self._dead_gram_terms = 0
+        self._expansions: Dict[Hashable, Any] = {}
+        self.queries = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    # --- legislation metadata ------------------------------------------------
+    def set_document_info(self, document: MevzuatDocument) -> None:
+        self._document_info[document.mevzuat_id] = document
+        self._document_info.move_to_end(document.mevzuat_id)
+        while len(self._document_info) > self.max_document_info:
+            self._document_info.popitem(last=False)
+
+    def document_info(self, mevzuat_id: str) -> Optional[MevzuatDocument]:
+        return self._document_info.get(mevzuat_id)
+
+    # --- updates -------------------------------------------------------------
+    def contains(self, key: Hashable, text: str) -> bool:
+        """True if key is indexed with exactly this text."""
+        doc = self._by_key.get(key)
+        return doc is not None and self._articles[doc].fingerprint == hash(text)
+
+    def add(self, key: Hashable, mevzuat_id: str, title: Optional[str], text: str) -> bool:
+        """Indexes text under key; returns False if it was already indexed unchanged."""
+        if self.contains(key, text):
+            return False
+        self.add_analyzed(key, mevzuat_id, title, analyze(text), hash(text))
+        return True
+
+    def add_analyzed(self, key: Hashable, mevzuat_id: str, title: Optional[str], analyzed: Tuple[Dict[str, array], int], fingerprint: int) -> None:
+        """Indexes the output of analyze(text), computed elsewhere (e.g. off the event loop)."""
+        self.remove(key)
+        positions, length = analyzed
+        doc = self._next_doc
+        self._next_doc += 1
+        for term, term_positions in positions.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._term_added(term)
+            postings[doc] = term_positions
+        self._articles[doc] = IndexedArticle(key, mevzuat_id, title, length, tuple(positions), fingerprint)
+        self._lengths[doc] = length
+        self._by_key[key] = doc
+        self._total_length += length
+        self._posting_count += len(positions)
+        while len(self._articles) > self.max_documents:
+            self._remove_doc(next(iter(self._articles)))
+            self.evictions += 1
+
+    def remove(self, key: Hashable) -> None:
+        doc = self._by_key.get(key)
+        if doc is not None:
+            self._remove_doc(doc)
+
+    def _remove_doc(self, doc: int) -> None:
+        article = self._articles.pop(doc)
+        del self._lengths[doc]
+        del self._by_key[article.key]
+        for term in article.terms:
+            postings = self._postings[term]
+            del postings[doc]
+            if not postings:
+                del self._postings[term]
+                self._term_removed()
+        self._total_length -= article.length
+        self._posting_count -= len(article.terms)
+
+    # --- term dictionary -----------------------------------------------------
+    def _term_added(self, term: str) -> None:
+        if self._expansions:
+            self._expansions.clear()
+        if self._sorted_terms is not None:
+            if len(self._new_sorted_terms) < self.SORTED_MERGE_LIMIT:
+                self._new_sorted_terms.append(term)
+            else:
+                self._sorted_terms = None
+                self._new_sorted_terms = []
+        self._term_grams.add(term)
+
+    def _term_removed(self) -> None:
+        if self._expansions:
+            self._expansions.clear()
+        self._dead_sorted_terms += 1
+        self._dead_gram_terms += 1
+
+    def has_term(self, term: str) -> bool:
+        return term in self._postings
+
+    def terms(self) -> Iterable[str]:
+        return self._postings.keys()
+
+    def sorted_terms(self) -> List[str]:
+        """All terms in sorted order (may include removed terms; check has_term)."""
+        if self._sorted_terms is None or self._dead_sorted_terms > len(self._sorted_terms) // 4:
+            self._sorted_terms = sorted(self._postings)
+            self._new_sorted_terms = []
+            self._dead_sorted_terms = 0
+        elif self._new_sorted_terms:
+            terms = self._sorted_terms
+            for term in self._new_sorted_terms:
+                i = bisect_left(terms, term)
+                if i == len(terms) or terms[i] != term:
+                    terms.insert(i, term)
+            self._new_sorted_terms = []
+        return self._sorted_terms
+
+    def terms_with_prefix(self, prefix: str) -> Iterator[str]:
+        terms = self.sorted_terms()
+        i = bisect_left(terms, prefix)
+        while i < len(terms) and terms[i].startswith(prefix):
+            if terms[i] in self._postings:
+                yield terms[i]
+            i += 1
+
+    def fuzzy_terms(self, term: str, max_edits: int) -> List[Tuple[str, int]]:
+        """(term, edit distance) for the indexed terms within max_edits of term."""
+        if self._dead_gram_terms > len(self._postings):
+            self._term_grams = TermGramIndex(self._postings)
+            self._dead_gram_terms = 0
+        found = self._term_grams.search(term, max_edits, self._postings)
+        return [(match, distance) for match, distance in found if match in self._postings]
+
+    def expand(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Memoizes a term expansion (e.g. of a wildcard) until the set of terms changes."""
+        expansion = self._expansions.get(key)
+        if expansion is None:
+            if len(self._expansions) >= self.MAX_CACHED_EXPANSIONS:
+                self._expansions.clear()
+            expansion = self._expansions[key] = compute()
+        return expansion
+
+    # --- search --------------------------------------------------------------
+    def postings(self, term: str) -> Dict[int, array]:
+        """Positions of term per unit (empty if the term is not indexed)."""
+        return self._postings.get(term, {})
+
+    def idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        return math.log(1.0 + (len(self._articles) - df + 0.5) / (df + 0.5))
+
+    def rank_documents(
+        self, scores: Dict[int, float], accept: Optional[Callable[[IndexedArticle], bool]] = None, hits_per_document: int = 3
+    ) -> List[Tuple[str, float, List[LocalHit]]]:
+        """
+        Ranks legislation by its best matching unit: (mevzuat_id, score, best hits)
+        for every document with an accepted unit in scores (unit -> score), best first.
+        """
+        self.queries += 1
+        articles = self._articles
+        groups: Dict[str, List[Tuple[float, int]]] = {}
+        for doc, score in scores.items():
+            article = articles[doc]
+            if accept is None or accept(article):
+                entries = groups.get(article.mevzuat_id)
+                if entries is None:
+                    groups[article.mevzuat_id] = [(score, doc)]
+                else:
+                    entries.append((score, doc))
+        ranked = []
+        for mevzuat_id, entries in groups.items():
+            best = heapq.nlargest(hits_per_document, entries)
+            ranked.append((mevzuat_id, best[0][0], [LocalHit(articles[doc], score) for score, doc in best]))
+        ranked.sort(key=lambda group: group[1], reverse=True)
+        return ranked
+
+    def score_terms(self, terms: Iterable[str], docs: Optional[Collection[int]] = None) -> Dict[int, float]:
+        """BM25 score per unit containing any of terms, summed over terms (only units in docs, if given)."""
+        if not self._articles:
+            return {}
+        k1, b = self.k1, self.b
+        average = self._total_length / len(self._articles) or 1.0
+        lengths = self._lengths
+        scores: Dict[int, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            weight = self.idf(term) * (k1 + 1.0)
+            entries = postings.items() if docs is None else ((doc, postings[doc]) for doc in docs if doc in postings)
+            for doc, positions in entries:
+                tf = len(positions)
+                scores[doc] = scores.get(doc, 0.0) + weight * tf / (tf + k1 * (1.0 - b + b * lengths[doc] / average))
+        return scores
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self._articles),
+            "max_documents": self.max_documents,
+            "terms": len(self._postings),
+            "postings": self._posting_count,
+            "tokens": self._total_length,
+            "document_info": len(self._document_info),
+            "queries": self.queries,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,83 @@
+"""
+JSON response serialization for the web servers.
+Uses orjson when it is installed (falling back to pydantic-core otherwise), and
+lets hot responses be cached as already-serialized bytes.
+"""
+
+from typing import Any, Dict, Hashable, Optional
+
+import pydantic_core
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+from mevzuat_cache import LRUTTLCache
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+
+class JSONBytes(bytes):
+    """JSON that is already serialized; written to the response as is."""
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> JSONBytes:
+    """Serializes content (models serialize by alias, like FastAPI's response_model)."""
+    if isinstance(content, JSONBytes):
+        return content
+    if orjson is not None:
+        return JSONBytes(orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS))
+    return JSONBytes(pydantic_core.to_json(content, by_alias=True))
+
+
+def sse_event(event: str, content: Any) -> bytes:
+    """One Server-Sent Events message whose data line is content as JSON."""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(content) + b"\n\n"
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson. Returning it from an endpoint also skips
+    FastAPI's response_model validation and jsonable_encoder pass; JSONBytes
+    content is sent without re-encoding.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ResponseCache:
+    """
+    Short-lived cache of serialized responses keyed by endpoint and arguments,
+    so a hit is answered without calling the client or encoding again.
+    A non-positive ttl disables it.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self._cache = LRUTTLCache(max_bytes=max_bytes if ttl > 0 else 0, ttl=ttl)
+
+    def get(self, key: Hashable) -> Optional[JSONBytes]:
+        if self._cache.max_bytes <= 0:
+            return None
+        return self._cache.get(key)
+
+    def put(self, key: Hashable, content: Any, cacheable: bool = True) -> JSONBytes:
+        """Serializes content, caching the bytes if cacheable; returns them."""
+        body = dumps(content)
+        if cacheable:
+            self._cache.set(key, body, size=len(body))
+        return body
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
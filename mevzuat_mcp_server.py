@@ -8,6 +8,7 @@ import asyncio
 import logging
 import os
 import json
+import time
 from pydantic import Field
 from typing import Optional, List, Dict, Any, Union
 
@@ -29,11 +30,12 @@ logger = logging.getLogger(__name__)
 from fastmcp import FastMCP
 from fastmcp.exceptions import ToolError
 
-from mevzuat_client import MevzuatApiClient
+from mevzuat_client import MevzuatApiClient, convert_boolean_operators
 from mevzuat_models import (
     MevzuatSearchRequest, MevzuatSearchResult,
-    MevzuatTurEnum, SortFieldEnum, SortDirectionEnum,
-    MevzuatArticleNode, MevzuatArticleContent
+    MevzuatTurEnum, SortFieldEnum, SortDirectionEnum, SearchSourceEnum,
+    MevzuatArticleNode, MevzuatArticleContent, MevzuatBulkArticle, MevzuatResolvedArticle,
+    MevzuatContentWindow, MevzuatSimilarArticles
 )
 
 app = FastMCP(
@@ -42,7 +44,156 @@ app = FastMCP(
     dependencies=["httpx", "beautifulsoup4", "lxml", "markitdown", "pypdf"]
 )
 
-mevzuat_client = MevzuatApiClient()
+# Upstream HTTP client (same variables as web_server.py, see env.example)
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "30.0"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+# Converted content and search result caches (in-process)
+CONTENT_CACHE_MAX_BYTES = int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CONTENT_CACHE_TTL = float(os.getenv("CONTENT_CACHE_TTL", "21600"))
+CONTENT_CACHE_STALE_TTL = float(os.getenv("CONTENT_CACHE_STALE_TTL", "604800"))
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "300"))
+SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", "3600"))
+
+# Request coalescing and fan-out limits
+COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() == "true"
+BULK_FETCH_CONCURRENCY = int(os.getenv("BULK_FETCH_CONCURRENCY", "8"))
+SEARCH_PAGE_CONCURRENCY = int(os.getenv("SEARCH_PAGE_CONCURRENCY", "3"))
+
+# Upstream rate limit, adaptive concurrency, retries and circuit breaker
+UPSTREAM_RATE_LIMIT_PER_MINUTE = int(os.getenv("UPSTREAM_RATE_LIMIT_PER_MINUTE", "600"))
+UPSTREAM_RATE_LIMIT_BURST = int(os.getenv("UPSTREAM_RATE_LIMIT_BURST", "20"))
+UPSTREAM_CONCURRENCY_INITIAL = int(os.getenv("UPSTREAM_CONCURRENCY_INITIAL", "8"))
+UPSTREAM_CONCURRENCY_MIN = int(os.getenv("UPSTREAM_CONCURRENCY_MIN", "1"))
+UPSTREAM_CONCURRENCY_MAX = int(os.getenv("UPSTREAM_CONCURRENCY_MAX", "32"))
+UPSTREAM_LATENCY_TARGET = float(os.getenv("UPSTREAM_LATENCY_TARGET", "2.0"))
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "2"))
+UPSTREAM_RETRY_BASE_DELAY = float(os.getenv("UPSTREAM_RETRY_BASE_DELAY", "0.5"))
+UPSTREAM_RETRY_MAX_DELAY = float(os.getenv("UPSTREAM_RETRY_MAX_DELAY", "5.0"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30"))
+LAST_GOOD_CACHE_MAX_BYTES = int(os.getenv("LAST_GOOD_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Speculative prefetch of article tree + content for top search hits
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "false").lower() == "true"
+PREFETCH_TOP_N = int(os.getenv("PREFETCH_TOP_N", "1"))
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "2"))
+PREFETCH_MAX_BYTES_PER_MINUTE = int(os.getenv("PREFETCH_MAX_BYTES_PER_MINUTE", str(32 * 1024 * 1024)))
+
+# Document conversion pool (thread | process | inline); 0 workers = CPU count
+CONVERSION_EXECUTOR = os.getenv("CONVERSION_EXECUTOR", "thread")
+CONVERSION_WORKERS = int(os.getenv("CONVERSION_WORKERS", "0"))
+CONVERSION_QUEUE_SIZE = int(os.getenv("CONVERSION_QUEUE_SIZE", "32"))
+CONVERSION_TIMEOUT = float(os.getenv("CONVERSION_TIMEOUT", "60"))
+CONVERSION_TRACE_MEMORY = os.getenv("CONVERSION_TRACE_MEMORY", "false").lower() == "true"
+
+# Persistent content store (SQLite file shared with the web servers; disabled when empty)
+CONTENT_STORE_PATH = os.getenv("CONTENT_STORE_PATH") or None
+
+# Directory for decoded PDF payloads (system temp dir when empty)
+PDF_SPOOL_DIR = os.getenv("PDF_SPOOL_DIR") or None
+PDF_SPOOL_MAX_FILES = int(os.getenv("PDF_SPOOL_MAX_FILES", "16"))
+
+# Local full-text index of retrieved articles (search_documents source "local"/"auto")
+LOCAL_INDEX_ENABLED = os.getenv("LOCAL_INDEX_ENABLED", "true").lower() == "true"
+LOCAL_INDEX_MAX_DOCUMENTS = int(os.getenv("LOCAL_INDEX_MAX_DOCUMENTS", "100000"))
+
+# Memory-mapped article vectors for find_similar_articles (system temp dir when VECTOR_INDEX_DIR is empty)
+VECTOR_INDEX_ENABLED = os.getenv("VECTOR_INDEX_ENABLED", "true").lower() == "true"
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR") or None
+VECTOR_DIMENSIONS = int(os.getenv("VECTOR_DIMENSIONS", "512"))
+VECTOR_INDEX_MAX_ARTICLES = int(os.getenv("VECTOR_INDEX_MAX_ARTICLES", "100000"))
+
+mevzuat_client = MevzuatApiClient(
+    timeout=API_TIMEOUT,
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    http2=HTTP2_ENABLED,
+    rate_limit_per_minute=UPSTREAM_RATE_LIMIT_PER_MINUTE,
+    rate_limit_burst=UPSTREAM_RATE_LIMIT_BURST,
+    concurrency_initial=UPSTREAM_CONCURRENCY_INITIAL,
+    concurrency_min=UPSTREAM_CONCURRENCY_MIN,
+    concurrency_max=UPSTREAM_CONCURRENCY_MAX,
+    latency_target=UPSTREAM_LATENCY_TARGET,
+    max_retries=UPSTREAM_MAX_RETRIES,
+    retry_base_delay=UPSTREAM_RETRY_BASE_DELAY,
+    retry_max_delay=UPSTREAM_RETRY_MAX_DELAY,
+    circuit_failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+    circuit_recovery_timeout=CIRCUIT_RECOVERY_TIMEOUT,
+    last_good_max_bytes=LAST_GOOD_CACHE_MAX_BYTES,
+    content_cache_max_bytes=CONTENT_CACHE_MAX_BYTES,
+    content_cache_ttl=CONTENT_CACHE_TTL,
+    content_cache_stale_ttl=CONTENT_CACHE_STALE_TTL,
+    search_cache_max_bytes=SEARCH_CACHE_MAX_BYTES,
+    search_cache_ttl=SEARCH_CACHE_TTL,
+    search_cache_stale_ttl=SEARCH_CACHE_STALE_TTL,
+    content_store_path=CONTENT_STORE_PATH,
+    coalesce_requests=COALESCE_REQUESTS,
+    bulk_fetch_concurrency=BULK_FETCH_CONCURRENCY,
+    search_page_concurrency=SEARCH_PAGE_CONCURRENCY,
+    prefetch_enabled=PREFETCH_ENABLED,
+    prefetch_top_n=PREFETCH_TOP_N,
+    prefetch_concurrency=PREFETCH_CONCURRENCY,
+    prefetch_max_bytes_per_minute=PREFETCH_MAX_BYTES_PER_MINUTE,
+    conversion_executor=CONVERSION_EXECUTOR,
+    conversion_workers=CONVERSION_WORKERS or None,
+    conversion_queue_size=CONVERSION_QUEUE_SIZE,
+    conversion_timeout=CONVERSION_TIMEOUT,
+    conversion_trace_memory=CONVERSION_TRACE_MEMORY,
+    pdf_spool_dir=PDF_SPOOL_DIR,
+    pdf_spool_max_files=PDF_SPOOL_MAX_FILES,
+    local_index_enabled=LOCAL_INDEX_ENABLED,
+    local_index_max_documents=LOCAL_INDEX_MAX_DOCUMENTS,
+    vector_index_enabled=VECTOR_INDEX_ENABLED,
+    vector_index_dir=VECTOR_INDEX_DIR,
+    vector_dimensions=VECTOR_DIMENSIONS,
+    vector_index_max_articles=VECTOR_INDEX_MAX_ARTICLES,
+)
+
+# Maximum number of proximity fallback queries in flight at once
+PROXIMITY_FALLBACK_CONCURRENCY = 3
+
+async def run_search(
+    request: MevzuatSearchRequest, max_results: Optional[int] = None, source: str = "remote",
+    local_phrase: Optional[str] = None, coalesce: bool = True
+) -> MevzuatSearchResult:
+    """Runs one page of a search, or collects up to max_results documents across pages."""
+    if max_results:
+        return await mevzuat_client.search_all(request, max_results, source, local_phrase, coalesce)
+    return await mevzuat_client.search_documents(request, source, local_phrase, coalesce)
+
+async def run_proximity_fallback(pair_requests: List[tuple], max_results: Optional[int] = None) -> Optional[tuple]:
+    """
+    Runs proximity fallback searches concurrently (bounded by PROXIMITY_FALLBACK_CONCURRENCY)
+    and returns (pair_query, result) for the first one that finds documents, cancelling the rest.
+    The attempts are not coalesced with other searches, so cancelling one aborts its
+    upstream request and frees its rate limit and concurrency slots.
+    """
+    semaphore = asyncio.Semaphore(PROXIMITY_FALLBACK_CONCURRENCY)
+
+    async def attempt(pair_query: str, request: MevzuatSearchRequest) -> tuple:
+        async with semaphore:
+            started = time.perf_counter()
+            result = await run_search(request, max_results, coalesce=False)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.info(f"Proximity attempt '{pair_query}': {result.total_results} results in {elapsed_ms:.0f} ms")
+            return pair_query, result
+
+    tasks = [asyncio.create_task(attempt(pair_query, request)) for pair_query, request in pair_requests]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            pair_query, result = await next_done
+            if result.total_results > 0:
+                return pair_query, result
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
 
 @app.tool()
 async def search_mevzuat(
@@ -54,10 +205,12 @@ async def search_mevzuat(
     mevzuat_turleri: Optional[Union[List[MevzuatTurEnum], str]] = Field(None, description="Filter by legislation types. A JSON-formatted string of this list is also acceptable."),
     page_number: int = Field(1, ge=1, description="Page number for pagination."),
     page_size: int = Field(5, ge=1, le=10, description="Number of results to return per page."),
+    max_results: Optional[int] = Field(None, ge=1, le=200, description="Collect up to this many results across pages into a single response, starting from the first result. When set, page_number and page_size are ignored."),
     # AÇIKLAMA GÜNCELLENDİ
     sort_field: SortFieldEnum = Field("RESMI_GAZETE_TARIHI", description="Field to sort results by."),
     # AÇIKLAMA GÜNCELLENDİ
-    sort_direction: SortDirectionEnum = Field("desc", description="Sorting direction.")
+    sort_direction: SortDirectionEnum = Field("desc", description="Sorting direction."),
+    source: SearchSourceEnum = Field("remote", description="Where to search: 'remote' (mevzuat.gov.tr), 'local' (BM25 full-text index of the articles retrieved so far, evaluating the same operators; answers in milliseconds and works while upstream is down) or 'auto' (local when it fills the page, otherwise remote).")
 ) -> MevzuatSearchResult:
     """
     Searches for Turkish legislation on mevzuat.gov.tr.
@@ -66,47 +219,6 @@ async def search_mevzuat(
     if not phrase and not mevzuat_no:
         raise ToolError("You must provide at least one of the following search criteria: 'phrase' or 'mevzuat_no'.")
 
-    # Convert boolean operators to Solr syntax
-    def convert_boolean_operators(phrase_text: str) -> str:
-        if not phrase_text:
-            return phrase_text
-        
-        import re
-        text = phrase_text
-        
-        # Convert AND to space (implicit AND works)
-        text = re.sub(r'\s+AND\s+', ' ', text)
-        
-        # Convert NOT to - (this works!)
-        text = re.sub(r'\s+NOT\s+', ' -', text)
-        
-        # Convert OR chains to regex
-        def replace_or_chain(text):
-            while 'OR' in text:
-                # Match quoted terms separated by OR
-                match = re.search(r'"([^"]+)"\s+OR\s+"([^"]+)"(?:\s+OR\s+"([^"]+)")*', text)
-                if match:
-                    # Extract all quoted terms in the OR chain
-                    full_match = match.group(0)
-                    terms = re.findall(r'"([^"]+)"', full_match)
-                    # Convert to regex alternation
-                    regex_pattern = f"/({'|'.join(terms)})/"
-                    text = text.replace(full_match, regex_pattern, 1)
-                else:
-                    # Handle simple word OR word
-                    simple_or = re.search(r'(\w+)\s+OR\s+(\w+)', text)
-                    if simple_or:
-                        word1, word2 = simple_or.groups()
-                        regex_pattern = f"/({word1}|{word2})/"
-                        text = text.replace(simple_or.group(0), regex_pattern, 1)
-                    else:
-                        break
-            return text
-        
-        text = replace_or_chain(text)
-        
-        return text
-    
     # Convert query to proximity search for fallback
     def convert_to_proximity(phrase_text: str) -> str:
         if not phrase_text:
@@ -176,10 +288,14 @@ async def search_mevzuat(
     
     try:
         # First attempt: original query
-        result = await mevzuat_client.search_documents(search_req)
+        started = time.perf_counter()
+        # The local query engine parses the operators itself (OR included), so it gets
+        # the phrase as written; only the upstream call uses the Solr rewrite
+        result = await run_search(search_req, max_results, source, local_phrase=phrase)
+        logger.info(f"Original search attempt: {result.total_results} results in {(time.perf_counter() - started) * 1000:.0f} ms")
         
         # Smart proximity fallback: if no results and we have a phrase
-        if result.total_results == 0 and processed_phrase and not result.error_message:
+        if result.total_results == 0 and processed_phrase and not result.error_message and result.source == "remote":
             logger.info("No results found, attempting proximity fallback")
             
             # Try all proximity pairs until we find results
@@ -193,11 +309,9 @@ async def search_mevzuat(
                 for i in range(len(clean_words) - 1):
                     pairs.append(f'"{clean_words[i]} {clean_words[i+1]}"~10')
                 
-                # Try each pair until we find results
-                for pair_query in pairs:
-                    logger.info(f"Trying proximity pair: {pair_query}")
-                    
-                    proximity_req = MevzuatSearchRequest(
+                # Try all pairs concurrently and keep the first one that finds results
+                pair_requests = [
+                    (pair_query, MevzuatSearchRequest(
                         phrase=pair_query,
                         mevzuat_no=mevzuat_no,
                         resmi_gazete_sayisi=resmi_gazete_sayisi,
@@ -206,12 +320,18 @@ async def search_mevzuat(
                         page_size=page_size,
                         sort_field=sort_field,
                         sort_direction=sort_direction
-                    )
-                    
-                    proximity_result = await mevzuat_client.search_documents(proximity_req)
-                    if proximity_result.total_results > 0:
-                        logger.info(f"Proximity fallback successful with '{pair_query}': {proximity_result.total_results} results")
-                        return proximity_result
+                    ))
+                    for pair_query in pairs
+                ]
+                
+                started = time.perf_counter()
+                fallback = await run_proximity_fallback(pair_requests, max_results)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if fallback:
+                    pair_query, proximity_result = fallback
+                    logger.info(f"Proximity fallback successful with '{pair_query}': {proximity_result.total_results} results in {elapsed_ms:.0f} ms")
+                    return proximity_result
+                logger.info(f"Proximity fallback found no results after {len(pairs)} attempts in {elapsed_ms:.0f} ms")
         
         # Return original result if no fallback was needed or fallback didn't help
         if not result.documents and not result.error_message:
@@ -263,6 +383,89 @@ async def get_mevzuat_article_content(mevzuat_id: str = Field(..., description="
             markdown_content="", error_message=f"An unexpected error occurred: {str(e)}"
         )
 
+@app.tool()
+async def get_mevzuat_content_window(
+    mevzuat_id: str = Field(..., description="The ID of the legislation, obtained from 'search_mevzuat' results."),
+    offset: int = Field(0, ge=0, description="Where the window starts: a character offset, or an article position when by_article is true. Use the next_offset of the previous window to continue."),
+    limit: Optional[int] = Field(None, ge=1, le=MevzuatApiClient.MAX_WINDOW_CHARS, description="Window size in characters (default 20000) or, when by_article is true, in articles (default 10, at most 100)."),
+    by_article: bool = Field(False, description="Page by articles in table-of-contents order instead of by characters."),
+    by_page: bool = Field(False, description="For PDF-only documents: page by (0-based) PDF pages (default 10, at most 50 per window); only the requested pages are extracted.")
+) -> MevzuatContentWindow:
+    """
+    Retrieves one window of a (possibly very large) legislation's Markdown text instead of the whole document.
+    The result gives the total size (characters, or number of articles) and next_offset for the following window; next_offset is null at the end.
+    Use this for long codes where get_mevzuat_article_content with the mevzuat_id as madde_id would return megabytes of text.
+    """
+    logger.info(f"Tool 'get_mevzuat_content_window' called for mevzuat_id: {mevzuat_id}, offset: {offset}, limit: {limit}, by_article: {by_article}, by_page: {by_page}")
+    try:
+        if by_page:
+            return await mevzuat_client.get_pdf_pages(mevzuat_id, offset, limit)
+        if by_article:
+            return await mevzuat_client.get_article_window(mevzuat_id, offset, limit)
+        return await mevzuat_client.get_document_window(mevzuat_id, offset, limit)
+    except Exception as e:
+        logger.exception(f"Error in tool 'get_mevzuat_content_window' for id {mevzuat_id}.")
+        return MevzuatContentWindow(
+            mevzuat_id=mevzuat_id, unit="page" if by_page else "article" if by_article else "char",
+            offset=offset, limit=limit or 0, total=0,
+            error_message=f"An unexpected error occurred: {str(e)}"
+        )
+
+@app.tool()
+async def get_mevzuat_article_by_number(
+    mevzuat_no: str = Field(..., description="The number of the legislation, e.g., '5237' for the Turkish Penal Code (TCK)."),
+    madde_no: int = Field(..., ge=1, description="The article number, e.g., 141 for 'madde 141'."),
+    mevzuat_tur: Optional[MevzuatTurEnum] = Field(None, description="The legislation type, if the number alone is ambiguous. Defaults to preferring KANUN.")
+) -> MevzuatResolvedArticle:
+    """
+    Retrieves the text of one article given the legislation number and the article number, e.g. TCK (5237) madde 141, in a single call.
+    Use this instead of search_mevzuat + get_mevzuat_article_tree + get_mevzuat_article_content when the numbers are known.
+    """
+    logger.info(f"Tool 'get_mevzuat_article_by_number' called for mevzuat_no: {mevzuat_no}, madde_no: {madde_no}, mevzuat_tur: {mevzuat_tur}")
+    try:
+        return await mevzuat_client.resolve_article(mevzuat_no, madde_no, mevzuat_tur)
+    except Exception as e:
+        logger.exception(f"Error in tool 'get_mevzuat_article_by_number' for {mevzuat_no}/{madde_no}.")
+        return MevzuatResolvedArticle(
+            mevzuat_no=mevzuat_no, madde_no=madde_no, mevzuat_tur=mevzuat_tur,
+            error_message=f"An unexpected error occurred: {str(e)}"
+        )
+
+@app.tool()
+async def get_mevzuat_all_articles(mevzuat_id: str = Field(..., description="The ID of the legislation, obtained from 'search_mevzuat' results.")) -> List[MevzuatBulkArticle]:
+    """
+    Retrieves the text of every article of a legislation in one call, in table-of-contents order.
+    Use this when the whole law is needed article by article; for a single article prefer get_mevzuat_article_content.
+    Articles that could not be fetched carry an error_message. An empty list means the document has no article tree; use get_mevzuat_article_content with the mevzuat_id as madde_id instead.
+    """
+    logger.info(f"Tool 'get_mevzuat_all_articles' called for mevzuat_id: {mevzuat_id}")
+    try:
+        articles = [article async for article in mevzuat_client.iter_law_articles(mevzuat_id)]
+        failed = sum(1 for article in articles if article.error_message)
+        logger.info(f"Fetched {len(articles)} articles for mevzuat_id {mevzuat_id} ({failed} failed)")
+        return articles
+    except Exception as e:
+        logger.exception(f"Error in tool 'get_mevzuat_all_articles' for id {mevzuat_id}.")
+        raise ToolError(f"Failed to retrieve articles: {str(e)}")
+
+@app.tool()
+async def find_similar_articles(
+    query: str = Field(..., description="A question, passage or article text to compare against, e.g. 'kamu görevlisinin rüşvet alması'."),
+    k: int = Field(10, ge=1, le=100, description="Number of articles to return."),
+    mevzuat_id: Optional[str] = Field(None, description="Only search the articles of this legislation (an ID from 'search_mevzuat' results).")
+) -> MevzuatSimilarArticles:
+    """
+    Finds the articles whose wording is most similar to the given text, ranked by cosine similarity (score 0..1).
+    Only articles already retrieved in this session (via the content tools) are searched; indexed_articles tells how many.
+    Similarity is lexical (shared word stems and fragments, so inflected forms match) rather than semantic: synonyms are not matched.
+    """
+    logger.info(f"Tool 'find_similar_articles' called with query: {query[:200]!r}, k: {k}, mevzuat_id: {mevzuat_id}")
+    try:
+        return await mevzuat_client.similar_articles(query, k, mevzuat_id)
+    except Exception as e:
+        logger.exception("Error in tool 'find_similar_articles'.")
+        return MevzuatSimilarArticles(query=query, mevzuat_id=mevzuat_id, error_message=f"An unexpected error occurred: {str(e)}")
+
 
 def main():
     logger.info(f"Starting {app.name} server...")
@@ -272,6 +475,9 @@ def main():
         logger.info(f"{app.name} server shut down by user.")
     except Exception as e:
         logger.exception(f"{app.name} server crashed.")
+    finally:
+        # Removes spooled PDF files and other per-process temporary files
+        asyncio.run(mevzuat_client.close())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
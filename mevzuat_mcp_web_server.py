@@ -23,13 +23,14 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, Response, Depends, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
 # Import our existing client and models
 from mevzuat_client import MevzuatApiClient, MevzuatSearchRequest
 from mevzuat_models import MevzuatDocument, MevzuatSearchResult, MevzuatArticleNode
+from mevzuat_json import FastJSONResponse, JSONBytes, ResponseCache, dumps, sse_event
 
 # ============================================================================
 # LOGGING CONFIGURATION
@@ -68,6 +69,77 @@ DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 # CORS configuration
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", FLOWISE_ORIGIN).split(",")
 
+# Upstream HTTP client (same variables as web_server.py, see env.example)
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "30.0"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+# Upstream connections opened at startup
+HTTP_WARMUP_CONNECTIONS = int(os.getenv("HTTP_WARMUP_CONNECTIONS", "2"))
+
+# Converted content and search result caches (in-process per worker)
+CONTENT_CACHE_MAX_BYTES = int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CONTENT_CACHE_TTL = float(os.getenv("CONTENT_CACHE_TTL", "21600"))
+CONTENT_CACHE_STALE_TTL = float(os.getenv("CONTENT_CACHE_STALE_TTL", "604800"))
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "300"))
+SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", "3600"))
+
+# Request coalescing and fan-out limits
+COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() == "true"
+BULK_FETCH_CONCURRENCY = int(os.getenv("BULK_FETCH_CONCURRENCY", "8"))
+SEARCH_PAGE_CONCURRENCY = int(os.getenv("SEARCH_PAGE_CONCURRENCY", "3"))
+
+# Upstream rate limit, adaptive concurrency, retries and circuit breaker
+UPSTREAM_RATE_LIMIT_PER_MINUTE = int(os.getenv("UPSTREAM_RATE_LIMIT_PER_MINUTE", "600"))
+UPSTREAM_RATE_LIMIT_BURST = int(os.getenv("UPSTREAM_RATE_LIMIT_BURST", "20"))
+UPSTREAM_CONCURRENCY_INITIAL = int(os.getenv("UPSTREAM_CONCURRENCY_INITIAL", "8"))
+UPSTREAM_CONCURRENCY_MIN = int(os.getenv("UPSTREAM_CONCURRENCY_MIN", "1"))
+UPSTREAM_CONCURRENCY_MAX = int(os.getenv("UPSTREAM_CONCURRENCY_MAX", "32"))
+UPSTREAM_LATENCY_TARGET = float(os.getenv("UPSTREAM_LATENCY_TARGET", "2.0"))
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "2"))
+UPSTREAM_RETRY_BASE_DELAY = float(os.getenv("UPSTREAM_RETRY_BASE_DELAY", "0.5"))
+UPSTREAM_RETRY_MAX_DELAY = float(os.getenv("UPSTREAM_RETRY_MAX_DELAY", "5.0"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30"))
+LAST_GOOD_CACHE_MAX_BYTES = int(os.getenv("LAST_GOOD_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Speculative prefetch of article tree + content for top search hits
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "false").lower() == "true"
+PREFETCH_TOP_N = int(os.getenv("PREFETCH_TOP_N", "1"))
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "2"))
+PREFETCH_MAX_BYTES_PER_MINUTE = int(os.getenv("PREFETCH_MAX_BYTES_PER_MINUTE", str(32 * 1024 * 1024)))
+
+# Document conversion pool (thread | process | inline); 0 workers = CPU count
+CONVERSION_EXECUTOR = os.getenv("CONVERSION_EXECUTOR", "thread")
+CONVERSION_WORKERS = int(os.getenv("CONVERSION_WORKERS", "0"))
+CONVERSION_QUEUE_SIZE = int(os.getenv("CONVERSION_QUEUE_SIZE", "32"))
+CONVERSION_TIMEOUT = float(os.getenv("CONVERSION_TIMEOUT", "60"))
+CONVERSION_TRACE_MEMORY = os.getenv("CONVERSION_TRACE_MEMORY", "false").lower() == "true"
+
+# Persistent content store (SQLite file shared by workers; disabled when empty)
+CONTENT_STORE_PATH = os.getenv("CONTENT_STORE_PATH") or None
+
+# Directory for decoded PDF payloads (system temp dir when empty)
+PDF_SPOOL_DIR = os.getenv("PDF_SPOOL_DIR") or None
+PDF_SPOOL_MAX_FILES = int(os.getenv("PDF_SPOOL_MAX_FILES", "16"))
+
+# Local full-text index of retrieved articles (search_documents source "local"/"auto")
+LOCAL_INDEX_ENABLED = os.getenv("LOCAL_INDEX_ENABLED", "true").lower() == "true"
+LOCAL_INDEX_MAX_DOCUMENTS = int(os.getenv("LOCAL_INDEX_MAX_DOCUMENTS", "100000"))
+
+# Memory-mapped article vectors for find_similar_articles (system temp dir when VECTOR_INDEX_DIR is empty)
+VECTOR_INDEX_ENABLED = os.getenv("VECTOR_INDEX_ENABLED", "true").lower() == "true"
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR") or None
+VECTOR_DIMENSIONS = int(os.getenv("VECTOR_DIMENSIONS", "512"))
+VECTOR_INDEX_MAX_ARTICLES = int(os.getenv("VECTOR_INDEX_MAX_ARTICLES", "100000"))
+
+# Serialized tool results kept briefly for repeated identical calls (ttl 0 disables)
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
 # ============================================================================
 # MODELS
 # ============================================================================
@@ -94,6 +166,7 @@ class HealthCheck(BaseModel):
     version: str
     tools_count: int
     mcp_endpoint: str
+    upstream: Optional[Dict[str, Any]] = None
 
 class ServerInfo(BaseModel):
     """Server information model"""
@@ -132,6 +205,18 @@ MCP_TOOLS = {
                     "type": "integer",
                     "default": 5,
                     "description": "Number of results to return per page"
+                },
+                "max_results": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 200,
+                    "description": "Collect up to this many results across pages, starting from the first result (page_number and page_size are ignored)"
+                },
+                "source": {
+                    "type": "string",
+                    "enum": ["remote", "local", "auto"],
+                    "default": "remote",
+                    "description": "'remote' (mevzuat.gov.tr), 'local' (BM25 full-text index of the articles retrieved so far; fast, works while upstream is down) or 'auto' (local when it fills the page, otherwise remote)"
                 }
             },
             "required": []
@@ -171,17 +256,96 @@ MCP_TOOLS = {
     },
     "get_document_content": {
         "name": "get_document_content",
-        "description": "Retrieves the full content of a legislation document",
+        "description": "Retrieves the full content of a legislation document, or one window of it for large documents. Called with Accept: text/event-stream, the full content is streamed as it is produced",
         "inputSchema": {
             "type": "object",
             "properties": {
                 "mevzuat_id": {
                     "type": "string",
                     "description": "The ID of the legislation"
+                },
+                "offset": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "description": "Return only the window starting at this character offset (or article position with by_article); continue with next_offset"
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Window size in characters (default 20000) or articles (default 10)"
+                },
+                "by_article": {
+                    "type": "boolean",
+                    "description": "Page by articles in table-of-contents order instead of by characters"
+                },
+                "by_page": {
+                    "type": "boolean",
+                    "description": "For PDF-only documents: page by PDF pages (0-based); only the requested pages are extracted"
                 }
             },
             "required": ["mevzuat_id"]
         }
+    },
+    "get_all_articles": {
+        "name": "get_all_articles",
+        "description": "Retrieves every article of a legislation in table-of-contents order",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "mevzuat_id": {
+                    "type": "string",
+                    "description": "The ID of the legislation"
+                }
+            },
+            "required": ["mevzuat_id"]
+        }
+    },
+    "get_article_by_number": {
+        "name": "get_article_by_number",
+        "description": "Retrieves one article by legislation number and article number, e.g. 5237 madde 141",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "mevzuat_no": {
+                    "type": "string",
+                    "description": "The number of the legislation, e.g. 5237"
+                },
+                "madde_no": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "The article number, e.g. 141"
+                },
+                "mevzuat_tur": {
+                    "type": "string",
+                    "description": "The legislation type if the number is ambiguous (default: prefer KANUN)"
+                }
+            },
+            "required": ["mevzuat_no", "madde_no"]
+        }
+    },
+    "find_similar_articles": {
+        "name": "find_similar_articles",
+        "description": "Finds the already retrieved articles whose wording is most similar to a text (cosine similarity)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "A question, passage or article text to compare against"
+                },
+                "k": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 100,
+                    "description": "Number of articles to return (default: 10)"
+                },
+                "mevzuat_id": {
+                    "type": "string",
+                    "description": "Only search the articles of this legislation"
+                }
+            },
+            "required": ["query"]
+        }
     }
 }
 
@@ -190,7 +354,52 @@ MCP_TOOLS = {
 # ============================================================================
 
 # Initialize Mevzuat API client
-mevzuat_client = MevzuatApiClient()
+mevzuat_client = MevzuatApiClient(
+    timeout=API_TIMEOUT,
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    http2=HTTP2_ENABLED,
+    rate_limit_per_minute=UPSTREAM_RATE_LIMIT_PER_MINUTE,
+    rate_limit_burst=UPSTREAM_RATE_LIMIT_BURST,
+    concurrency_initial=UPSTREAM_CONCURRENCY_INITIAL,
+    concurrency_min=UPSTREAM_CONCURRENCY_MIN,
+    concurrency_max=UPSTREAM_CONCURRENCY_MAX,
+    latency_target=UPSTREAM_LATENCY_TARGET,
+    max_retries=UPSTREAM_MAX_RETRIES,
+    retry_base_delay=UPSTREAM_RETRY_BASE_DELAY,
+    retry_max_delay=UPSTREAM_RETRY_MAX_DELAY,
+    circuit_failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+    circuit_recovery_timeout=CIRCUIT_RECOVERY_TIMEOUT,
+    last_good_max_bytes=LAST_GOOD_CACHE_MAX_BYTES,
+    content_cache_max_bytes=CONTENT_CACHE_MAX_BYTES,
+    content_cache_ttl=CONTENT_CACHE_TTL,
+    content_cache_stale_ttl=CONTENT_CACHE_STALE_TTL,
+    search_cache_max_bytes=SEARCH_CACHE_MAX_BYTES,
+    search_cache_ttl=SEARCH_CACHE_TTL,
+    search_cache_stale_ttl=SEARCH_CACHE_STALE_TTL,
+    content_store_path=CONTENT_STORE_PATH,
+    coalesce_requests=COALESCE_REQUESTS,
+    bulk_fetch_concurrency=BULK_FETCH_CONCURRENCY,
+    search_page_concurrency=SEARCH_PAGE_CONCURRENCY,
+    prefetch_enabled=PREFETCH_ENABLED,
+    prefetch_top_n=PREFETCH_TOP_N,
+    prefetch_concurrency=PREFETCH_CONCURRENCY,
+    prefetch_max_bytes_per_minute=PREFETCH_MAX_BYTES_PER_MINUTE,
+    conversion_executor=CONVERSION_EXECUTOR,
+    conversion_workers=CONVERSION_WORKERS or None,
+    conversion_queue_size=CONVERSION_QUEUE_SIZE,
+    conversion_timeout=CONVERSION_TIMEOUT,
+    conversion_trace_memory=CONVERSION_TRACE_MEMORY,
+    pdf_spool_dir=PDF_SPOOL_DIR,
+    pdf_spool_max_files=PDF_SPOOL_MAX_FILES,
+    local_index_enabled=LOCAL_INDEX_ENABLED,
+    local_index_max_documents=LOCAL_INDEX_MAX_DOCUMENTS,
+    vector_index_enabled=VECTOR_INDEX_ENABLED,
+    vector_index_dir=VECTOR_INDEX_DIR,
+    vector_dimensions=VECTOR_DIMENSIONS,
+    vector_index_max_articles=VECTOR_INDEX_MAX_ARTICLES,
+)
 
 # ============================================================================
 # AUTHENTICATION
@@ -241,10 +450,15 @@ async def lifespan(app: FastAPI):
     logger.info(f"Debug mode: {DEBUG}")
     logger.info(f"API Key configured: {'Yes' if API_KEY != 'your-secret-api-key-here' else 'No'}")
     
+    if HTTP_WARMUP_CONNECTIONS > 0:
+        opened = await mevzuat_client.warmup(HTTP_WARMUP_CONNECTIONS)
+        logger.info(f"Upstream warmup: {opened}/{HTTP_WARMUP_CONNECTIONS} connections opened")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Mevzuat MCP Web Server...")
+    await mevzuat_client.close()
 
 # ============================================================================
 # FASTAPI APPLICATION
@@ -266,11 +480,17 @@ app = FastAPI(
     • get_article_tree - Get legislation table of contents
     • get_article_content - Get specific article content
     • get_document_content - Get full legislation content
+    • get_all_articles - Get every article of a legislation
+    • get_article_by_number - Get an article by legislation and article number
+    • find_similar_articles - Find retrieved articles similar to a text
     """,
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+response_cache = ResponseCache(max_bytes=RESPONSE_CACHE_MAX_BYTES, ttl=RESPONSE_CACHE_TTL)
+
 # Add CORS middleware for web client access - only allow Flowise
 app.add_middleware(
     CORSMiddleware,
@@ -306,14 +526,16 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     uptime = (datetime.now() - SERVER_START_TIME).total_seconds()
+    upstream = mevzuat_client.upstream_health()
     
     return HealthCheck(
-        status="healthy",
+        status="healthy" if upstream["circuit"]["state"] == "closed" else "degraded",
         timestamp=datetime.now(),
         uptime_seconds=uptime,
         version="1.0.0",
         tools_count=len(MCP_TOOLS),
-        mcp_endpoint="/mcp"
+        mcp_endpoint="/mcp",
+        upstream=upstream
     )
 
 @app.get("/mcp")
@@ -435,6 +657,8 @@ async def status():
         "timestamp": datetime.now().isoformat(),
         "uptime_seconds": (datetime.now() - SERVER_START_TIME).total_seconds(),
         "tools_count": len(MCP_TOOLS),
+        "client": await mevzuat_client.stats(),
+        "response_cache": response_cache.stats(),
         "endpoints": {
             "mcp": "/mcp",
             "discovery": "/mcp/discovery",
@@ -482,6 +706,8 @@ async def mcp_endpoint(
             logger.info(f"ListActions response: {len(result.result.get('actions', []))} actions")
             return result
         elif mcp_request.method == "tools/call":
+            if "text/event-stream" in request.headers.get("accept", "") and is_streamable_tool_call(mcp_request):
+                return stream_call_tool(mcp_request)
             return await handle_call_tool(mcp_request)
         elif mcp_request.method == "initialize":
             result = await handle_initialize(mcp_request)
@@ -578,7 +804,22 @@ async def handle_list_actions(request: MCPRequest) -> MCPResponse:
             }
         )
 
-async def handle_call_tool(request: MCPRequest) -> MCPResponse:
+def _is_cacheable_tool_result(result: Dict[str, Any]) -> bool:
+    """Errors, stale fallbacks, local and vector index results and empty trees are not kept in the response cache."""
+    if "error" in result or result.get("error_message") or result.get("stale") or result.get("source") == "local" or "indexed_articles" in result:
+        return False
+    if "nodes" in result and not result["nodes"]:
+        return False
+    content = result.get("content")
+    return not (getattr(content, "error_message", None) or getattr(content, "stale", False))
+
+def _tool_response(request_id: Union[int, str], payload: bytes) -> FastJSONResponse:
+    """JSON-RPC envelope around an already serialized tool result."""
+    return FastJSONResponse(JSONBytes(
+        b'{"jsonrpc":"2.0","id":' + dumps(request_id) + b',"result":{"content":' + payload + b'},"error":null}'
+    ))
+
+async def handle_call_tool(request: MCPRequest) -> Union[MCPResponse, FastJSONResponse]:
     """Handle MCP tools/call request"""
     if not request.params:
         return MCPResponse(
@@ -595,6 +836,11 @@ async def handle_call_tool(request: MCPRequest) -> MCPResponse:
             error={"code": -32601, "message": f"Tool not found: {tool_name}"}
         )
     
+    cache_key = ("tool", tool_name, json.dumps(arguments, sort_keys=True, default=str))
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return _tool_response(request.id, cached)
+    
     try:
         # Call the appropriate tool
         if tool_name == "search_documents":
@@ -605,16 +851,20 @@ async def handle_call_tool(request: MCPRequest) -> MCPResponse:
             result = await get_article_content_tool(arguments)
         elif tool_name == "get_document_content":
             result = await get_document_content_tool(arguments)
+        elif tool_name == "get_all_articles":
+            result = await get_all_articles_tool(arguments)
+        elif tool_name == "get_article_by_number":
+            result = await get_article_by_number_tool(arguments)
+        elif tool_name == "find_similar_articles":
+            result = await find_similar_articles_tool(arguments)
         else:
             return MCPResponse(
                 id=request.id,
                 error={"code": -32601, "message": f"Tool not implemented: {tool_name}"}
             )
         
-        return MCPResponse(
-            id=request.id,
-            result={"content": result}
-        )
+        payload = response_cache.put(cache_key, result, cacheable=_is_cacheable_tool_result(result))
+        return _tool_response(request.id, payload)
         
     except Exception as e:
         logger.error(f"Error calling tool {tool_name}: {e}")
@@ -626,6 +876,47 @@ async def handle_call_tool(request: MCPRequest) -> MCPResponse:
             }
         )
 
+def is_streamable_tool_call(request: MCPRequest) -> bool:
+    """Full-document content calls can be answered as an event stream."""
+    params = request.params or {}
+    arguments = params.get("arguments") or {}
+    return (
+        params.get("name") == "get_document_content" and bool(arguments.get("mevzuat_id"))
+        and not any(arguments.get(key) is not None for key in ("offset", "limit", "by_article", "by_page"))
+    )
+
+def stream_call_tool(request: MCPRequest) -> StreamingResponse:
+    """
+    Answers a get_document_content call over SSE (MCP streamable HTTP): the text is
+    sent as "notifications/content_chunk" messages (MevzuatContentChunk params) as it
+    is produced, followed by the JSON-RPC response summarising the stream. Articles
+    that could not be fetched arrive as chunks with an error_message; the summary
+    counts them in failed_articles.
+    """
+    mevzuat_id = request.params["arguments"]["mevzuat_id"]
+    
+    async def events():
+        count = 0
+        failed = 0
+        error = None
+        try:
+            async for chunk in mevzuat_client.iter_document_content(mevzuat_id):
+                count += 1
+                if chunk.unit == "char":
+                    error = chunk.error_message
+                elif chunk.error_message:
+                    failed += 1
+                yield sse_event("message", {"jsonrpc": "2.0", "method": "notifications/content_chunk", "params": chunk})
+        except Exception as e:
+            logger.error(f"Error streaming get_document_content for {mevzuat_id}: {e}")
+            error = str(e)
+        if failed and error is None:
+            error = f"{failed} article(s) could not be retrieved"
+        summary = {"mevzuat_id": mevzuat_id, "streamed": True, "chunks": count, "failed_articles": failed, "error_message": error}
+        yield sse_event("message", MCPResponse(id=request.id, result={"content": summary}))
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 # ============================================================================
 # TOOL IMPLEMENTATIONS
 # ============================================================================
@@ -642,7 +933,14 @@ async def search_documents_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
         )
         
         # Perform search
-        result = await mevzuat_client.search_documents(search_request)
+        max_results = arguments.get("max_results")
+        source = arguments.get("source", "remote")
+        if source not in ("remote", "local", "auto"):
+            return {"error": f"Unknown source: {source}"}
+        if max_results:
+            result = await mevzuat_client.search_all(search_request, min(int(max_results), 200), source)
+        else:
+            result = await mevzuat_client.search_documents(search_request, source)
         
         # Convert to dict
         return {
@@ -651,7 +949,10 @@ async def search_documents_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
             "current_page": result.current_page,
             "page_size": result.page_size,
             "total_pages": result.total_pages,
-            "error_message": result.error_message
+            "error_message": result.error_message,
+            "stale": result.stale,
+            "source": result.source,
+            "article_hits": [hit.model_dump() for hit in result.article_hits]
         }
         
     except Exception as e:
@@ -665,8 +966,9 @@ async def get_article_tree_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
         if not mevzuat_id:
             return {"error": "mevzuat_id is required"}
         
-        result = await mevzuat_client.get_article_tree(mevzuat_id)
-        return {"nodes": [node.model_dump() for node in result]}
+        # Plain nested dicts straight from the compact tree, without building node models
+        tree = await mevzuat_client.get_compact_article_tree(mevzuat_id)
+        return {"nodes": tree.to_dicts(by_alias=False)}
         
     except Exception as e:
         logger.error(f"Error in get_article_tree_tool: {e}")
@@ -695,13 +997,69 @@ async def get_document_content_tool(arguments: Dict[str, Any]) -> Dict[str, Any]
         if not mevzuat_id:
             return {"error": "mevzuat_id is required"}
         
-        result = await mevzuat_client.get_document_content(mevzuat_id)
+        offset = arguments.get("offset")
+        limit = arguments.get("limit")
+        if arguments.get("by_page"):
+            window = await mevzuat_client.get_pdf_pages(mevzuat_id, int(offset or 0), limit and int(limit))
+            return window.model_dump()
+        if arguments.get("by_article"):
+            window = await mevzuat_client.get_article_window(mevzuat_id, int(offset or 0), limit and int(limit))
+            return window.model_dump()
+        if offset is not None or limit is not None:
+            window = await mevzuat_client.get_document_window(mevzuat_id, int(offset or 0), limit and int(limit))
+            return window.model_dump()
+        
+        result = await mevzuat_client.get_full_document_content(mevzuat_id)
         return {"content": result}
         
     except Exception as e:
         logger.error(f"Error in get_document_content_tool: {e}")
         return {"error": str(e)}
 
+async def get_all_articles_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Implementation of get_all_articles tool"""
+    try:
+        mevzuat_id = arguments.get("mevzuat_id")
+        if not mevzuat_id:
+            return {"error": "mevzuat_id is required"}
+        
+        articles = [article.model_dump() async for article in mevzuat_client.iter_law_articles(mevzuat_id)]
+        return {"articles": articles, "count": len(articles)}
+        
+    except Exception as e:
+        logger.error(f"Error in get_all_articles_tool: {e}")
+        return {"error": str(e)}
+
+async def get_article_by_number_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Implementation of get_article_by_number tool"""
+    try:
+        mevzuat_no = arguments.get("mevzuat_no")
+        madde_no = arguments.get("madde_no")
+        if not mevzuat_no or not madde_no:
+            return {"error": "mevzuat_no and madde_no are required"}
+        
+        result = await mevzuat_client.resolve_article(str(mevzuat_no), int(madde_no), arguments.get("mevzuat_tur"))
+        return result.model_dump()
+        
+    except Exception as e:
+        logger.error(f"Error in get_article_by_number_tool: {e}")
+        return {"error": str(e)}
+
+async def find_similar_articles_tool(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Implementation of find_similar_articles tool"""
+    try:
+        query = arguments.get("query")
+        if not query:
+            return {"error": "query is required"}
+        
+        k = max(1, min(int(arguments.get("k") or 10), 100))
+        result = await mevzuat_client.similar_articles(query, k, arguments.get("mevzuat_id"))
+        return result.model_dump()
+        
+    except Exception as e:
+        logger.error(f"Error in find_similar_articles_tool: {e}")
+        return {"error": str(e)}
+
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
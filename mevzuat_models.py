@@ -4,7 +4,7 @@ Pydantic models for the Adalet Bakanlığı Mevzuat MCP server.
 Defines data structures for search requests, search results, and document content.
 """
 
-from pydantic import BaseModel, Field, HttpUrl, PlainSerializer, ConfigDict
+from pydantic import BaseModel, Field, HttpUrl, PlainSerializer, ConfigDict, TypeAdapter
 from typing import List, Optional, Dict, Any, Annotated, Literal
 from enum import Enum
 import datetime
@@ -22,6 +22,9 @@ SortFieldEnum = Literal[
 
 SortDirectionEnum = Literal["desc", "asc"]
 
+# Where a search is answered: upstream, the local full-text index, or local with upstream fallback
+SearchSourceEnum = Literal["remote", "local", "auto"]
+
 class MevzuatSearchRequest(BaseModel):
     """Request model for searching legislation documents. Used by the client."""
     mevzuat_adi: Optional[str] = Field(None, description="The name of the legislation or a keyword to search for. For an exact phrase search, enclose the term in double quotes. E.g., 'ticaret' or '\"türk ceza kanunu\"'.")
@@ -59,6 +62,23 @@ class MevzuatDocument(BaseModel):
     resmi_gazete_sayisi: Optional[str] = Field(None, alias="resmiGazeteSayisi")
     url: Optional[str] = None
 
+class MevzuatArticleHit(BaseModel):
+    """Model for an article matched by a local full-text or similarity search, with its score."""
+    mevzuat_id: str
+    madde_id: str
+    title: Optional[str] = None
+    score: float
+    snippet: str = ""
+    mevzuat_adi: Optional[str] = None  # name of the legislation, when known
+
+class MevzuatSimilarArticles(BaseModel):
+    """Model for the articles most similar to a query text, by cosine similarity of their vectors."""
+    query: str
+    mevzuat_id: Optional[str] = None  # search restricted to this legislation
+    hits: List[MevzuatArticleHit] = []
+    indexed_articles: int = 0
+    error_message: Optional[str] = None
+
 class MevzuatSearchResult(BaseModel):
     """Model for the overall search result from the legislation API."""
     documents: List[MevzuatDocument]
@@ -68,6 +88,9 @@ class MevzuatSearchResult(BaseModel):
     total_pages: int
     query_used: Dict[str, Any]
     error_message: Optional[str] = None
+    stale: bool = False  # served from cache past its TTL because upstream could not refresh it yet
+    source: Literal["remote", "local"] = "remote"
+    article_hits: List[MevzuatArticleHit] = []  # best matching articles per document (local search only)
 
 class MevzuatArticleNode(BaseModel):
     """Recursive model for an article/section in the legislation's table of contents tree."""
@@ -85,4 +108,90 @@ class MevzuatArticleContent(BaseModel):
     madde_id: str
     mevzuat_id: str
     markdown_content: str
-    error_message: Optional[str] = None
\ No newline at end of file
+    error_message: Optional[str] = None
+    stale: bool = False  # served from cache past its TTL because upstream could not refresh it yet
+
+class MevzuatResolvedArticle(BaseModel):
+    """Model for an article looked up by legislation number and article number."""
+    mevzuat_no: str
+    madde_no: int
+    mevzuat_tur: Optional[str] = None
+    mevzuat_id: Optional[str] = None
+    mevzuat_adi: Optional[str] = None
+    madde_id: Optional[str] = None
+    title: Optional[str] = None
+    markdown_content: str = ""
+    error_message: Optional[str] = None
+    not_found: bool = False  # error_message reports a missing legislation or article, not a failed lookup
+    stale: bool = False
+
+class MevzuatBulkArticle(BaseModel):
+    """Model for one article of a whole-law fetch, returned in article tree order."""
+    index: int
+    madde_id: str
+    mevzuat_id: str
+    madde_no: Optional[int] = None
+    title: Optional[str] = None
+    markdown_content: str
+    error_message: Optional[str] = None
+
+class MevzuatContentWindow(BaseModel):
+    """
+    Model for one slice of a legislation's content, for paging through large documents.
+    With unit "char", offset/limit/total count characters of the converted markdown;
+    with unit "article", they count articles in table-of-contents order; with unit
+    "page", (0-based) pages of a PDF document, whose texts are also listed in pages.
+    next_offset is the offset of the following window, or None at the end.
+    not_found marks an error_message about a window that does not exist (offset past
+    the end, or a unit the document lacks) rather than a failed fetch or conversion.
+    """
+    mevzuat_id: str
+    unit: Literal["char", "article", "page"]
+    offset: int
+    limit: int
+    total: int
+    next_offset: Optional[int] = None
+    markdown_content: str = ""
+    articles: List[MevzuatBulkArticle] = []
+    pages: List[str] = []
+    error_message: Optional[str] = None
+    not_found: bool = False
+    stale: bool = False
+
+class MevzuatContentChunk(BaseModel):
+    """
+    Model for one piece of a streamed legislation document. unit "article" pieces carry
+    one article (offset is its table-of-contents position), unit "page" pieces one
+    (0-based) page of a PDF document; unit "char" pieces carry a run of the full
+    document's markdown starting at character offset.
+    """
+    mevzuat_id: str
+    index: int
+    unit: Literal["char", "article", "page"]
+    offset: int
+    madde_id: Optional[str] = None
+    title: Optional[str] = None
+    markdown_content: str
+    error_message: Optional[str] = None
+
+# Upstream (bedesten) response envelopes. The client validates raw response bytes
+# against these in one pass (pydantic-core parses the JSON), instead of json.loads
+# followed by a model_validate call per document or article node.
+
+class SearchDocumentsData(BaseModel):
+    total: int = 0
+    mevzuat_list: Optional[List[MevzuatDocument]] = Field(None, alias="mevzuatList")
+
+class SearchDocumentsResponse(BaseModel):
+    metadata: Dict[str, Any] = {}
+    data: Optional[SearchDocumentsData] = None
+
+class ArticleTreeData(BaseModel):
+    children: Optional[List[MevzuatArticleNode]] = None
+
+class ArticleTreeResponse(BaseModel):
+    metadata: Dict[str, Any] = {}
+    data: Optional[ArticleTreeData] = None
+
+# Article tree as a list of top-level nodes, e.g. for (de)serializing stored trees
+ArticleTreeAdapter = TypeAdapter(List[MevzuatArticleNode])
@@ -0,0 +1,110 @@
+"""
+Speculative background prefetching of legislation likely to be requested next.
+After a search, the MevzuatApiClient schedules its top hits here so that the
+follow-up article tree and content calls are served from cache.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """
+    Runs warm-up coroutines in the background with a global concurrency limit and
+    a rolling byte budget. Jobs are skipped while is_busy() reports load, and all
+    running jobs can be cancelled at once; cancellation reaches the warm coroutine,
+    which should not shield its upstream calls from it.
+
+    warm: coroutine taking a mevzuat_id and returning the number of bytes it loaded.
+    max_bytes_per_minute: prefetched bytes allowed within any 60 second window.
+    max_pending: jobs allowed to wait for a free slot; extra requests are dropped.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(
+        self,
+        warm: Callable[[str], Awaitable[int]],
+        concurrency: int = 2,
+        max_bytes_per_minute: int = 32 * 1024 * 1024,
+        max_pending: int = 16,
+        is_busy: Optional[Callable[[], bool]] = None,
+    ):
+        self._warm = warm
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.concurrency = concurrency
+        self.max_bytes_per_minute = max_bytes_per_minute
+        self.max_pending = max_pending
+        self._is_busy = is_busy or (lambda: False)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._window: Deque[Tuple[float, int]] = deque()
+        self.scheduled = 0
+        self.completed = 0
+        self.skipped = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.bytes_prefetched = 0
+
+    def _bytes_in_window(self) -> int:
+        cutoff = time.monotonic() - self.WINDOW_SECONDS
+        while self._window and self._window[0][0] < cutoff:
+            self._window.popleft()
+        return sum(size for _, size in self._window)
+
+    def schedule(self, mevzuat_ids: Iterable[str]) -> None:
+        """Queues background warm-ups; never blocks the caller. Under load, drops them all."""
+        if self._is_busy():
+            self.cancel_all()
+            self.skipped += len(list(mevzuat_ids))
+            return
+        for mevzuat_id in mevzuat_ids:
+            if mevzuat_id in self._tasks:
+                continue
+            if len(self._tasks) >= self.concurrency + self.max_pending:
+                self.skipped += 1
+                continue
+            self.scheduled += 1
+            task = asyncio.ensure_future(self._run(mevzuat_id))
+            self._tasks[mevzuat_id] = task
+            task.add_done_callback(lambda done, key=mevzuat_id: self._tasks.pop(key, None))
+
+    async def _run(self, mevzuat_id: str) -> None:
+        try:
+            async with self._semaphore:
+                if self._is_busy() or self._bytes_in_window() >= self.max_bytes_per_minute:
+                    self.skipped += 1
+                    return
+                size = await self._warm(mevzuat_id)
+            self._window.append((time.monotonic(), size))
+            self.bytes_prefetched += size
+            self.completed += 1
+        except Exception:
+            self.failed += 1
+            logger.debug(f"Prefetch failed for mevzuatId {mevzuat_id}", exc_info=True)
+
+    def cancel_all(self) -> int:
+        """Cancels every queued or running prefetch; returns how many were cancelled."""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        self.cancelled += len(tasks)
+        return len(tasks)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "pending": len(self._tasks),
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "bytes_prefetched": self.bytes_prefetched,
+            "bytes_last_minute": self._bytes_in_window(),
+            "max_bytes_per_minute": self.max_bytes_per_minute,
+        }
@@ -0,0 +1,409 @@
+"""
+Query language of the local full-text index.
+Parses the search operators documented for search_mevzuat (AND/OR/NOT, +/-,
+"phrases", "proximity"~N, wildcards, fuzzy~0.8, boosting^2, /regex/) into a
+query tree, and evaluates it against a LocalIndex. Parsed queries are cached.
+"""
+
+import heapq
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from mevzuat_index import LocalIndex, tokenize, turkish_lower
+
+# Most terms a wildcard, regex or fuzzy query expands to (as Lucene's default clause limit)
+MAX_EXPANSIONS = 1024
+# Edits allowed for "term~"; Lucene caps fuzzy queries at two edits. A term of n
+# characters allows at most (n - 1) // 2, so short terms do not match most of the dictionary
+DEFAULT_FUZZY_EDITS = 2
+MAX_FUZZY_EDITS = 2
+QUERY_CACHE_SIZE = 1024
+
+
+class TermQuery(NamedTuple):
+    text: str
+    boost: float = 1.0
+
+
+class PhraseQuery(NamedTuple):
+    """Terms in order, adjacent (slop 0) or all within a window of len(terms) + slop positions."""
+    terms: Tuple[str, ...]
+    slop: int = 0
+    boost: float = 1.0
+
+
+class WildcardQuery(NamedTuple):
+    """Terms matching pattern, where * stands for any characters and ? for one."""
+    pattern: str
+    boost: float = 1.0
+
+
+class FuzzyQuery(NamedTuple):
+    text: str
+    max_edits: int = DEFAULT_FUZZY_EDITS
+    boost: float = 1.0
+
+
+class RegexQuery(NamedTuple):
+    """Terms fully matching pattern (case-insensitive)."""
+    pattern: str
+    boost: float = 1.0
+
+
+class BooleanQuery(NamedTuple):
+    """
+    Units matching every must clause (or, without must clauses, any should
+    clause) and no must_not clause; matching should clauses add to the score.
+    """
+    must: Tuple["Query", ...] = ()
+    should: Tuple["Query", ...] = ()
+    must_not: Tuple["Query", ...] = ()
+    boost: float = 1.0
+
+
+Query = Union[TermQuery, PhraseQuery, WildcardQuery, FuzzyQuery, RegexQuery, BooleanQuery]
+
+_LEXER_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<open>\()
+  | (?P<close>\))
+  | (?P<phrase>"(?:[^"\\]|\\.)*"?)
+  | (?P<regex>/(?:[^/\\]|\\.)+/)
+  | (?P<operator>(?:AND|OR|NOT)(?=[\s()"]|$)|&&|\|\||!)
+  | (?P<modifier>[+-])(?=[^\s+-])
+  | (?P<tilde>~(?:\d+(?:\.\d+)?)?)
+  | (?P<boost>\^\d+(?:\.\d+)?)
+  | (?P<word>(?:[^\s()"~^\\]|\\.)+)
+  | (?P<other>.)
+""", re.VERBOSE)
+
+_OPERATORS = {"AND": "AND", "&&": "AND", "OR": "OR", "||": "OR", "NOT": "NOT", "!": "NOT"}
+_WILDCARD_CHARS = re.compile(r"[^\w*?]")
+
+
+def _lex(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    for match in _LEXER_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "space" or kind == "other":
+            continue
+        value = match.group()
+        if kind == "operator":
+            value = _OPERATORS[value]
+        tokens.append((kind, value))
+    return tokens
+
+
+def _fuzzy_edits(text: str, value: str) -> int:
+    """Edits allowed by a ~ suffix: ~ alone, ~N edits, or ~0.8 minimum similarity."""
+    if not value:
+        edits = DEFAULT_FUZZY_EDITS
+    elif float(value) < 1:
+        edits = int((1.0 - float(value)) * len(text))
+    else:
+        edits = int(float(value))
+    return min(edits, MAX_FUZZY_EDITS, (len(text) - 1) // 2)
+
+
+class _Parser:
+    """
+    Recursive descent over the lexed query. Malformed input is read leniently:
+    unterminated quotes and parentheses are closed at the end, stray operators
+    and modifiers are ignored.
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> Tuple[Optional[str], str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, "")
+
+    def next(self) -> Tuple[Optional[str], str]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def suffix(self, kind: str) -> Optional[str]:
+        if self.peek()[0] == kind:
+            return self.next()[1][1:]
+        return None
+
+    def parse(self) -> Optional[Query]:
+        clauses = []
+        while self.position < len(self.tokens):
+            clause = self.parse_or()
+            if clause is not None:
+                clauses.append(clause)
+            if self.peek()[0] == "close":
+                self.next()
+        return _conjunction(clauses, ())
+
+    def parse_or(self) -> Optional[Query]:
+        alternatives = [self.parse_and()]
+        while self.peek() == ("operator", "OR"):
+            self.next()
+            alternatives.append(self.parse_and())
+        alternatives = [clause for clause in alternatives if clause is not None]
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return BooleanQuery(should=tuple(alternatives)) if alternatives else None
+
+    def parse_and(self) -> Optional[Query]:
+        must: List[Query] = []
+        must_not: List[Query] = []
+        while True:
+            kind, value = self.peek()
+            if kind is None or kind == "close" or (kind == "operator" and value == "OR"):
+                break
+            self.next()
+            if kind == "operator" and value == "AND":
+                continue
+            target = must
+            if (kind == "operator" and value == "NOT") or (kind == "modifier" and value == "-"):
+                target = must_not
+            if kind in ("operator", "modifier"):
+                kind, value = self.peek()
+                if kind not in ("open", "phrase", "regex", "word"):
+                    continue
+                self.next()
+            clause = self.parse_clause(kind, value)
+            if clause is not None:
+                target.append(clause)
+        return _conjunction(must, must_not)
+
+    def parse_clause(self, kind: Optional[str], value: str) -> Optional[Query]:
+        if kind == "open":
+            clause = self.parse_or()
+            if self.peek()[0] == "close":
+                self.next()
+        elif kind == "phrase":
+            terms = tuple(tokenize(value.strip('"')))
+            slop = self.suffix("tilde")
+            clause = _phrase(terms, int(float(slop)) if slop else 0)
+        elif kind == "regex":
+            clause = RegexQuery(value[1:-1])
+        elif kind == "word":
+            clause = self.parse_word(value)
+        else:
+            return None
+        boost = self.suffix("boost")
+        if clause is not None and boost:
+            clause = clause._replace(boost=clause.boost * float(boost))
+        return clause
+
+    def parse_word(self, word: str) -> Optional[Query]:
+        fuzzy = self.suffix("tilde")
+        if "*" in word or "?" in word:
+            pattern = _WILDCARD_CHARS.sub("", turkish_lower(word))
+            return WildcardQuery(pattern) if pattern.strip("*?") else None
+        terms = tuple(tokenize(word))
+        if fuzzy is not None and len(terms) == 1:
+            return FuzzyQuery(terms[0], _fuzzy_edits(terms[0], fuzzy))
+        return _phrase(terms, 0)
+
+
+def _phrase(terms: Tuple[str, ...], slop: int) -> Optional[Query]:
+    if not terms:
+        return None
+    return TermQuery(terms[0]) if len(terms) == 1 else PhraseQuery(terms, slop)
+
+
+def _conjunction(must: List[Query], must_not: Iterable[Query]) -> Optional[Query]:
+    must_not = tuple(must_not)
+    if len(must) == 1 and not must_not:
+        return must[0]
+    if not must and not must_not:
+        return None
+    return BooleanQuery(must=tuple(must), must_not=must_not)
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def compile_query(text: str) -> Optional[Query]:
+    """Query tree of a search phrase (None if it has no searchable terms); cached per phrase."""
+    return _Parser(_lex(text)).parse()
+
+
+def query_terms(query: Optional[Query]) -> List[str]:
+    """Literal terms a match must or may contain (wildcards give their fixed prefix), for highlighting."""
+    terms: List[str] = []
+    stack = [query] if query is not None else []
+    while stack:
+        node = stack.pop()
+        if isinstance(node, BooleanQuery):
+            stack.extend(reversed(node.should))
+            stack.extend(reversed(node.must))
+        elif isinstance(node, (TermQuery, FuzzyQuery)):
+            terms.append(node.text)
+        elif isinstance(node, PhraseQuery):
+            terms.extend(node.terms)
+        elif isinstance(node, WildcardQuery):
+            prefix = re.split(r"[*?]", node.pattern, maxsplit=1)[0]
+            if prefix:
+                terms.append(prefix)
+    return list(dict.fromkeys(terms))
+
+
+# --- evaluation ---------------------------------------------------------------
+
+def execute(query: Query, index: LocalIndex) -> Dict[int, float]:
+    """Score (BM25, times boosts) of every indexed unit matching query."""
+    return _EVALUATORS[type(query)](query, index)
+
+
+def _boosted(scores: Dict[int, float], boost: float) -> Dict[int, float]:
+    if boost != 1.0:
+        for doc in scores:
+            scores[doc] *= boost
+    return scores
+
+
+def _term(query: TermQuery, index: LocalIndex) -> Dict[int, float]:
+    return _boosted(index.score_terms((query.text,)), query.boost)
+
+
+def _phrase_matches(positions: List, slop: int) -> bool:
+    if slop == 0:
+        # Start positions p such that terms[i] occurs at p + i
+        starts = set(positions[0])
+        for offset, term_positions in enumerate(positions[1:], 1):
+            starts.intersection_update(map((-offset).__add__, term_positions))
+            if not starts:
+                return False
+        return True
+    # Smallest window holding one occurrence of each term (in any order)
+    width = len(positions) - 1 + slop
+    heap = [(term_positions[0], i, 0) for i, term_positions in enumerate(positions)]
+    heapq.heapify(heap)
+    highest = max(entry[0] for entry in heap)
+    while True:
+        lowest, i, j = heap[0]
+        if highest - lowest <= width:
+            return True
+        if j + 1 == len(positions[i]):
+            return False
+        following = positions[i][j + 1]
+        heapq.heapreplace(heap, (following, i, j + 1))
+        highest = max(highest, following)
+
+
+def _phrase_query(query: PhraseQuery, index: LocalIndex) -> Dict[int, float]:
+    postings = [index.postings(term) for term in query.terms]
+    if not all(postings):
+        return {}
+    rarest = min(postings, key=len)
+    candidates = set(rarest).intersection(*(term_postings for term_postings in postings if term_postings is not rarest))
+    matched = [
+        doc for doc in candidates
+        if _phrase_matches([term_postings[doc] for term_postings in postings], query.slop)
+    ]
+    if not matched:
+        return {}
+    return _boosted(index.score_terms(set(query.terms), matched), query.boost)
+
+
+def _expanded(index: LocalIndex, weighted_terms: List[Tuple[str, float]], boost: float) -> Dict[int, float]:
+    """A unit scores as its best matching expansion (so matching many variants does not add up)."""
+    scores: Dict[int, float] = {}
+    for term, weight in weighted_terms:
+        for doc, score in index.score_terms((term,)).items():
+            score *= weight
+            if score > scores.get(doc, 0.0):
+                scores[doc] = score
+    return _boosted(scores, boost)
+
+
+def _matching_terms(index: LocalIndex, prefix: str, matches: Callable[[str], bool]) -> List[Tuple[str, float]]:
+    candidates = index.terms_with_prefix(prefix) if prefix else index.terms()
+    terms: List[Tuple[str, float]] = []
+    for term in candidates:
+        if matches(term):
+            terms.append((term, 1.0))
+            if len(terms) == MAX_EXPANSIONS:
+                break
+    return terms
+
+
+def _wildcard(query: WildcardQuery, index: LocalIndex) -> Dict[int, float]:
+    def expand() -> List[Tuple[str, float]]:
+        prefix = re.split(r"[*?]", query.pattern, maxsplit=1)[0]
+        if query.pattern == prefix + "*":
+            return _matching_terms(index, prefix, lambda term: True)
+        pattern = re.compile("".join(
+            ".*" if char == "*" else "." if char == "?" else re.escape(char) for char in query.pattern
+        ))
+        return _matching_terms(index, prefix, pattern.fullmatch)
+    return _expanded(index, index.expand(("wildcard", query.pattern), expand), query.boost)
+
+
+_REGEX_LITERAL_PREFIX = re.compile(r"\w*")
+
+
+def _regex_prefix(pattern: str) -> str:
+    """Literal characters every match starts with ("" if unknown), to seek instead of scanning all terms."""
+    if "|" in pattern:
+        return ""
+    prefix = _REGEX_LITERAL_PREFIX.match(pattern).group()
+    if len(prefix) < len(pattern) and pattern[len(prefix)] in "?*{":
+        # The last literal is optional or repeated
+        prefix = prefix[:-1]
+    return turkish_lower(prefix)
+
+
+def _regex(query: RegexQuery, index: LocalIndex) -> Dict[int, float]:
+    def expand() -> List[Tuple[str, float]]:
+        try:
+            pattern = re.compile(query.pattern, re.IGNORECASE)
+        except re.error:
+            return []
+        return _matching_terms(index, _regex_prefix(query.pattern), pattern.fullmatch)
+    return _expanded(index, index.expand(("regex", query.pattern), expand), query.boost)
+
+
+def _fuzzy(query: FuzzyQuery, index: LocalIndex) -> Dict[int, float]:
+    def expand() -> List[Tuple[str, float]]:
+        # Closer terms weigh more, as in Lucene: 1 - edits / term length
+        length = max(len(query.text), 1)
+        found = sorted(index.fuzzy_terms(query.text, query.max_edits), key=lambda item: item[1])[:MAX_EXPANSIONS]
+        return [(term, max(0.0, 1.0 - distance / length)) for term, distance in found]
+    return _expanded(index, index.expand(("fuzzy", query.text, query.max_edits), expand), query.boost)
+
+
+def _boolean(query: BooleanQuery, index: LocalIndex) -> Dict[int, float]:
+    scores: Optional[Dict[int, float]] = None
+    for clause in query.must:
+        clause_scores = execute(clause, index)
+        if scores is None:
+            scores = clause_scores
+        else:
+            scores = {doc: score + clause_scores[doc] for doc, score in scores.items() if doc in clause_scores}
+        if not scores:
+            return {}
+    if query.should:
+        optional = scores is not None
+        if scores is None:
+            scores = {}
+        for clause in query.should:
+            for doc, score in execute(clause, index).items():
+                if doc in scores:
+                    scores[doc] += score
+                elif not optional:
+                    scores[doc] = score
+    if not scores:
+        # Only prohibited clauses: nothing to match, as in Lucene
+        return {}
+    for clause in query.must_not:
+        for doc in execute(clause, index):
+            scores.pop(doc, None)
+    return _boosted(scores, query.boost)
+
+
+_EVALUATORS: Dict[type, Callable[..., Dict[int, float]]] = {
+    TermQuery: _term,
+    PhraseQuery: _phrase_query,
+    WildcardQuery: _wildcard,
+    FuzzyQuery: _fuzzy,
+    RegexQuery: _regex,
+    BooleanQuery: _boolean,
+}
@@ -0,0 +1,139 @@
+"""
+Persistent SQLite-backed store for upstream payloads and converted legislation.
+Shared by all worker processes pointing at the same file; survives restarts.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    kind TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    raw_content TEXT NOT NULL,
+    markdown TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (kind, doc_id)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents (content_hash);
+CREATE TABLE IF NOT EXISTS trees (
+    mevzuat_id TEXT PRIMARY KEY,
+    tree_json TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def content_hash(raw_content: Union[str, bytes, memoryview]) -> str:
+    """Stable hash of an upstream base64 payload (the same for its str and ASCII bytes forms)."""
+    return hashlib.sha256(raw_content.encode("utf-8") if isinstance(raw_content, str) else raw_content).hexdigest()
+
+
+class StoredDocument(NamedTuple):
+    content_hash: str
+    raw_content: str
+    markdown: str
+    updated_at: float
+
+
+class StoredTree(NamedTuple):
+    tree_json: str  # JSON list of top-level article nodes
+    updated_at: float
+
+
+class SQLiteContentStore:
+    """
+    Blocking SQLite store; call its methods from a worker thread (asyncio.to_thread).
+    Each thread gets its own connection and the database runs in WAL mode, so any
+    number of processes can read concurrently while one writes. close() closes
+    every thread's connection; the store must not be used afterwards.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self._busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only the owning thread uses it; close() may run on another one.
+            conn = sqlite3.connect(self.path, timeout=self._busy_timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def get_document(self, kind: str, doc_id: str) -> Optional[StoredDocument]:
+        row = self._connection().execute(
+            "SELECT content_hash, raw_content, markdown, updated_at FROM documents WHERE kind = ? AND doc_id = ?",
+            (kind, doc_id),
+        ).fetchone()
+        return StoredDocument(*row) if row else None
+
+    def get_markdown_by_hash(self, hash_value: str) -> Optional[str]:
+        """Returns markdown already converted from an identical payload, if any."""
+        row = self._connection().execute(
+            "SELECT markdown FROM documents WHERE content_hash = ? LIMIT 1", (hash_value,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put_document(self, kind: str, doc_id: str, raw_content: Union[str, bytes, memoryview], markdown: str, hash_value: Optional[str] = None) -> None:
+        hash_value = hash_value or content_hash(raw_content)
+        if not isinstance(raw_content, str):
+            raw_content = str(raw_content, "ascii")
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (kind, doc_id, content_hash, raw_content, markdown, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, doc_id, hash_value, raw_content, markdown, time.time()),
+            )
+
+    def get_tree(self, mevzuat_id: str) -> Optional[StoredTree]:
+        row = self._connection().execute(
+            "SELECT tree_json, updated_at FROM trees WHERE mevzuat_id = ?", (mevzuat_id,)
+        ).fetchone()
+        return StoredTree(row[0], row[1]) if row else None
+
+    def put_tree(self, mevzuat_id: str, tree_json: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO trees (mevzuat_id, tree_json, updated_at) VALUES (?, ?, ?)",
+                (mevzuat_id, tree_json, time.time()),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connection()
+        documents = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        trees = conn.execute("SELECT COUNT(*) FROM trees").fetchone()[0]
+        return {
+            "path": self.path,
+            "documents": documents,
+            "trees": trees,
+            "size_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
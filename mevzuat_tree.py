@@ -0,0 +1,203 @@
+"""
+Compact, array-backed form of a legislation's article tree.
+Cached per mevzuat_id by the MevzuatApiClient instead of nested MevzuatArticleNode
+models, with O(1) lookups by madde_id / madde_no and lossless conversion back
+to the nested form returned by the API.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from mevzuat_models import MevzuatArticleNode
+
+# Marks a missing value in the integer arrays (no parent, no madde_no, None string)
+NONE = -1
+
+
+class CompactArticleTree:
+    """
+    Article tree stored as parallel arrays in pre-order (document order).
+
+    Node i has parent parents[i] (NONE for top-level nodes) and madde_no
+    madde_nos[i]. Its madde_id, title and description are slices of one string
+    buffer given by start/end offsets; a start of NONE stands for None. Nodes
+    whose mevzuat_id differs from the tree's are kept in a small override map.
+    Subtrees are contiguous: node i's descendants are i+1 .. subtree_ends[i]-1.
+    An empty tree returned because the tree could not be fetched carries the
+    reason in error_message.
+    """
+
+    __slots__ = (
+        "mevzuat_id", "error_message", "parents", "subtree_ends", "madde_nos", "_offsets", "_buffer",
+        "_mevzuat_id_overrides", "_by_madde_id", "_by_madde_no",
+    )
+
+    def __init__(self, mevzuat_id: str, error_message: Optional[str] = None):
+        self.mevzuat_id = mevzuat_id
+        self.error_message = error_message
+        self.parents = array("i")
+        self.subtree_ends = array("i")
+        self.madde_nos = array("i")
+        # Six offsets per node: madde_id, title and description (start, end)
+        self._offsets = array("i")
+        self._buffer = ""
+        self._mevzuat_id_overrides: Dict[int, str] = {}
+        self._by_madde_id: Optional[Dict[str, int]] = None
+        self._by_madde_no: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_nodes(cls, mevzuat_id: str, nodes: Iterable[MevzuatArticleNode]) -> "CompactArticleTree":
+        tree = cls(mevzuat_id)
+        parts: List[str] = []
+        position = 0
+
+        def add_string(value: Optional[str]) -> None:
+            nonlocal position
+            if value is None:
+                tree._offsets.extend((NONE, NONE))
+                return
+            parts.append(value)
+            tree._offsets.extend((position, position + len(value)))
+            position += len(value)
+
+        # Iterative pre-order walk; a None entry closes the subtree opened before it
+        stack: List[Any] = [(node, NONE) for node in reversed(list(nodes))]
+        open_nodes: List[int] = []
+        while stack:
+            item = stack.pop()
+            if item is None:
+                tree.subtree_ends[open_nodes.pop()] = len(tree.parents)
+                continue
+            node, parent = item
+            index = len(tree.parents)
+            tree.parents.append(parent)
+            tree.subtree_ends.append(index + 1)
+            tree.madde_nos.append(NONE if node.madde_no is None else node.madde_no)
+            add_string(node.madde_id)
+            add_string(node.title)
+            add_string(node.description)
+            if node.mevzuat_id != mevzuat_id:
+                tree._mevzuat_id_overrides[index] = node.mevzuat_id
+            if node.children:
+                open_nodes.append(index)
+                stack.append(None)
+                stack.extend((child, index) for child in reversed(node.children))
+        tree._buffer = "".join(parts)
+        return tree
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def nbytes(self) -> int:
+        """Approximate memory footprint, for cache accounting."""
+        arrays = (self.parents, self.subtree_ends, self.madde_nos, self._offsets)
+        return (
+            sum(a.itemsize * len(a) for a in arrays)
+            + len(self._buffer.encode("utf-8"))
+            + 128 * len(self._mevzuat_id_overrides)
+            + 256
+        )
+
+    def _string(self, index: int, field: int) -> Optional[str]:
+        start = self._offsets[index * 6 + field * 2]
+        if start == NONE:
+            return None
+        return self._buffer[start:self._offsets[index * 6 + field * 2 + 1]]
+
+    def madde_id(self, index: int) -> str:
+        return self._string(index, 0)
+
+    def title(self, index: int) -> Optional[str]:
+        return self._string(index, 1)
+
+    def description(self, index: int) -> Optional[str]:
+        return self._string(index, 2)
+
+    def madde_no(self, index: int) -> Optional[int]:
+        value = self.madde_nos[index]
+        return None if value == NONE else value
+
+    def node_mevzuat_id(self, index: int) -> str:
+        return self._mevzuat_id_overrides.get(index, self.mevzuat_id)
+
+    def is_leaf(self, index: int) -> bool:
+        return self.subtree_ends[index] == index + 1
+
+    def leaves(self) -> List[int]:
+        """Indices of the leaf nodes (maddeler) in document order."""
+        return [i for i in range(len(self)) if self.subtree_ends[i] == i + 1]
+
+    def children(self, index: int) -> List[int]:
+        """Indices of the direct children of a node."""
+        result = []
+        child = index + 1
+        end = self.subtree_ends[index]
+        while child < end:
+            result.append(child)
+            child = self.subtree_ends[child]
+        return result
+
+    def index_of(self, madde_id: str) -> Optional[int]:
+        """O(1) lookup by madde_id (the index is built on first use)."""
+        if self._by_madde_id is None:
+            self._by_madde_id = {self.madde_id(i): i for i in range(len(self) - 1, -1, -1)}
+        return self._by_madde_id.get(madde_id)
+
+    def index_of_madde_no(self, madde_no: int) -> Optional[int]:
+        """
+        O(1) lookup of the first leaf with the given madde_no in document order.
+        Later duplicates (e.g. geçici maddeler) are reachable via leaves().
+        """
+        if self._by_madde_no is None:
+            self._by_madde_no = {}
+            for i in self.leaves():
+                value = self.madde_nos[i]
+                if value != NONE:
+                    self._by_madde_no.setdefault(value, i)
+        return self._by_madde_no.get(madde_no)
+
+    def path_to_root(self, index: int) -> List[int]:
+        """Indices from the node up to its top-level ancestor, node first."""
+        path = []
+        while index != NONE:
+            path.append(index)
+            index = self.parents[index]
+        return path
+
+    def node(self, index: int, with_children: bool = True) -> MevzuatArticleNode:
+        """Rebuilds one node (and by default its subtree) as a MevzuatArticleNode."""
+        # Validating constructor: with flat scalar inputs it is cheaper than model_construct
+        node = MevzuatArticleNode(
+            maddeId=self.madde_id(index), maddeNo=self.madde_no(index),
+            title=self.title(index), description=self.description(index),
+            children=[], mevzuatId=self.node_mevzuat_id(index),
+        )
+        if with_children:
+            node.children.extend(self.node(child) for child in self.children(index))
+        return node
+
+    def to_nodes(self) -> List[MevzuatArticleNode]:
+        """Lossless conversion back to the nested model form."""
+        built: List[MevzuatArticleNode] = []
+        roots: List[MevzuatArticleNode] = []
+        for i in range(len(self)):
+            node = self.node(i, with_children=False)
+            built.append(node)
+            parent = self.parents[i]
+            (roots if parent == NONE else built[parent].children).append(node)
+        return roots
+
+    def to_dicts(self, by_alias: bool = True) -> List[Dict[str, Any]]:
+        """Nested plain form, equal to dumping to_nodes() but without building models."""
+        keys = ("maddeId", "maddeNo", "title", "description", "children", "mevzuatId") if by_alias else \
+            ("madde_id", "madde_no", "title", "description", "children", "mevzuat_id")
+        built: List[Dict[str, Any]] = []
+        roots: List[Dict[str, Any]] = []
+        for i in range(len(self)):
+            node = dict(zip(keys, (
+                self.madde_id(i), self.madde_no(i), self.title(i), self.description(i), [], self.node_mevzuat_id(i),
+            )))
+            built.append(node)
+            parent = self.parents[i]
+            (roots if parent == NONE else built[parent][keys[4]]).append(node)
+        return roots
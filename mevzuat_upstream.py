@@ -0,0 +1,314 @@
+"""
+Helpers that govern traffic from MevzuatApiClient to bedesten.adalet.gov.tr:
+connection pool configuration and metrics, request rate limiting, an
+adaptive (AIMD) concurrency limit, retry backoff and a circuit breaker.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """HTTP/2 support in httpx needs the optional 'h2' package (httpx[http2])."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class PoolMetrics:
+    """
+    Connection pool usage of the upstream httpx client.
+    Pool wait is measured with httpcore trace events: the time between sending a
+    request to the pool and the first connection-level event for it.
+    """
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.saturated_requests = 0
+        self.new_connections = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_samples = 0
+
+    def request_started(self) -> None:
+        self.requests += 1
+        if self.in_flight >= self.max_connections:
+            self.saturated_requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+
+    def tracer(self) -> Callable[[str, Dict[str, Any]], Awaitable[None]]:
+        """Returns an httpcore trace callback for a single request."""
+        started = time.perf_counter()
+        state = {"acquired": False}
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if not state["acquired"] and event_name.endswith(".started"):
+                state["acquired"] = True
+                waited = time.perf_counter() - started
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+                self.wait_samples += 1
+            if event_name == "connection.connect_tcp.started":
+                self.new_connections += 1
+
+        return trace
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_connections": self.max_connections,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturation": round(self.in_flight / self.max_connections, 4) if self.max_connections else 0.0,
+            "saturated_requests": self.saturated_requests,
+            "new_connections": self.new_connections,
+            "avg_wait_ms": round(self.wait_total / self.wait_samples * 1000, 3) if self.wait_samples else 0.0,
+            "max_wait_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+def build_http_client(
+    headers: Dict[str, str],
+    timeout: float,
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry: float,
+    http2: bool,
+) -> httpx.AsyncClient:
+    if http2 and not http2_available():
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    return httpx.AsyncClient(headers=headers, timeout=timeout, limits=limits, http2=http2, follow_redirects=True)
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the upstream request rate. Tokens refill continuously at
+    rate_per_minute / 60 per second up to burst; callers wait in FIFO order.
+    A non-positive rate disables the limit.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waits = 0
+        self.wait_total = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                self.waits += 1
+                self.wait_total += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self._tokens -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        if self.rate > 0:
+            self._refill()
+        return {
+            "rate_per_minute": round(self.rate * 60, 3),
+            "burst": self.burst,
+            "tokens": round(self._tokens, 3),
+            "throttled_requests": self.waits,
+            "throttled_seconds": round(self.wait_total, 3),
+        }
+
+
+class AIMDLimiter:
+    """
+    Adaptive concurrency limit for upstream calls (additive increase, multiplicative
+    decrease). Each healthy response grows the limit by 1/limit, i.e. about one slot
+    per round of requests; an error or a response slower than latency_target
+    multiplies it by backoff, at most once per latency_target interval.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, latency_target: float, backoff: float = 0.7):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.waits = 0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        self.waits += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just before the cancellation; give it back
+                self.in_flight -= 1
+                self._wake_waiters()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: float, error: bool) -> None:
+        """Frees a slot and adapts the limit to the outcome of the call."""
+        self.in_flight -= 1
+        now = time.monotonic()
+        if error or latency > self.latency_target:
+            if now - self._last_decrease >= self.latency_target:
+                self.limit = max(self.minimum, self.limit * self.backoff)
+                self._last_decrease = now
+                self.decreases += 1
+        elif self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self.increases += 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "latency_target_seconds": self.latency_target,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "queued_requests": self.waits,
+        }
+
+
+class CircuitOpenError(Exception):
+    """Raised when the upstream circuit breaker rejects a call."""
+
+
+def retry_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff for the given (0-based) retry attempt."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for upstream calls.
+
+    closed: calls pass; failure_threshold consecutive failures open the circuit.
+    open: calls are rejected until recovery_timeout has elapsed.
+    half_open: up to half_open_max_calls probe calls pass; a success closes the
+    circuit, a failure opens it again for another recovery_timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Returns True if a call may proceed. In half-open state this reserves a probe,
+        freed by record_success(), record_failure() or release().
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+            self._probes_in_flight += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self) -> None:
+        """Gives back a probe reserved by allow() for a call that ended without an outcome (e.g. cancelled)."""
+        if self._state == self.HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        if self._state != self.CLOSED:
+            logger.info("Upstream circuit closed")
+        self._state = self.CLOSED
+        self._probes_in_flight = 0
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.times_opened += 1
+                logger.warning(f"Upstream circuit opened after {self.consecutive_failures} consecutive failures")
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probes_in_flight = 0
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout_seconds": self.recovery_timeout,
+            "retry_in_seconds": round(max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at)), 3) if state == self.OPEN else 0.0,
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected,
+        }
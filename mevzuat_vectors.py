@@ -0,0 +1,393 @@
+"""
+Vector similarity search over converted articles.
+Articles are encoded as hashed TF-IDF vectors of word stems and character
+trigrams (so inflected Turkish forms of a word land close together) and kept,
+L2-normalized, in a memory-mapped NumPy matrix. Queries are answered with
+blocked matrix products; concurrent queries are batched into one product.
+"""
+
+import asyncio
+import math
+import os
+import tempfile
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from mevzuat_index import tokenize
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class HashingEncoder:
+    """
+    Maps texts to fixed-size vectors without a vocabulary: each feature (the
+    first STEM_CHARS characters of a word, and the word's padded character
+    trigrams) is hashed to a dimension and a sign. Document vectors hold
+    sublinear term frequencies; query vectors weight their features by inverse
+    document frequency over the stored documents (see observe/forget), so
+    stored vectors never need re-weighting. Hashes are crc32, stable across
+    processes.
+    """
+
+    STEM_CHARS = 5
+    FEATURE_BITS = 20
+    MAX_MEMOIZED_WORDS = 200000
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+        self.documents = 0
+        self._document_frequency = np.zeros(1 << self.FEATURE_BITS, dtype=np.int32)
+        self._words: Dict[str, Tuple[List[int], List[float], List[int]]] = {}
+
+    def _word_features(self, word: str) -> Tuple[List[int], List[float], List[int]]:
+        """(dimensions, signs, feature ids) of a word's features; memoized (words repeat a lot)."""
+        features = self._words.get(word)
+        if features is not None:
+            return features
+        names = ["w:" + word[:self.STEM_CHARS]]
+        if len(word) > 2 and not word.isdigit():
+            padded = "<" + word + ">"
+            names.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        hashes = [zlib.crc32(name.encode("utf-8")) for name in names]
+        mask = (1 << self.FEATURE_BITS) - 1
+        features = (
+            [value % self.dimensions for value in hashes],
+            [-1.0 if value >> 31 else 1.0 for value in hashes],
+            [value & mask for value in hashes],
+        )
+        if len(self._words) >= self.MAX_MEMOIZED_WORDS:
+            self._words.clear()
+        self._words[word] = features
+        return features
+
+    def _accumulate(self, words: Counter, weight_by_idf: bool) -> Tuple[Any, List[int]]:
+        dims: List[int] = []
+        weights: List[float] = []
+        feature_ids: List[int] = []
+        if weight_by_idf:
+            total = self.documents + 1
+            frequency = self._document_frequency
+        for word, count in words.items():
+            word_dims, signs, ids = self._word_features(word)
+            dims.extend(word_dims)
+            feature_ids.extend(ids)
+            if weight_by_idf:
+                weights.extend(sign * count * (math.log(total / (1 + frequency[i])) + 1.0) for sign, i in zip(signs, ids))
+            else:
+                weights.extend(sign * count for sign in signs)
+        vector = np.bincount(np.array(dims, dtype=np.intp), weights=weights, minlength=self.dimensions)
+        return vector, feature_ids
+
+    @staticmethod
+    def _normalized(vector: Any) -> Any:
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).astype(np.float32)
+
+    def encode_document(self, text: str) -> Tuple[Any, Any]:
+        """(unit vector, feature ids) of a document; pass the ids to observe() when it is stored."""
+        vector, feature_ids = self._accumulate(Counter(tokenize(text)), weight_by_idf=False)
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        return self._normalized(vector), np.unique(np.array(feature_ids, dtype=np.uint32))
+
+    def observe(self, feature_ids: Any) -> None:
+        """Counts a stored document's features towards document frequencies."""
+        self._document_frequency[feature_ids] += 1
+        self.documents += 1
+
+    def forget(self, feature_ids: Any) -> None:
+        """Undoes observe() for a document that is replaced or removed."""
+        self._document_frequency[feature_ids] -= 1
+        self.documents -= 1
+
+    def encode_query(self, text: str) -> Any:
+        """Unit vector of a query (all zeros if it has no words)."""
+        vector, _ = self._accumulate(Counter(tokenize(text)), weight_by_idf=True)
+        return self._normalized(vector)
+
+
+class VectorIndex:
+    """
+    Unit vectors keyed by a hashable key, one row each of a float32 matrix
+    memory-mapped from a temporary file, created on the first add and deleted
+    on close. The file grows by doubling up to max_rows; beyond that the oldest
+    rows are reused. Each row also keeps the document's feature ids, so its
+    document frequencies can be given back when it goes. Cosine
+    similarity of unit vectors is their dot product, computed over blocks of
+    rows so large indexes stay within a bounded working set.
+    """
+
+    INITIAL_ROWS = 1024
+    BLOCK_ROWS = 32768
+
+    def __init__(self, dimensions: int = 512, max_rows: int = 100000, directory: Optional[str] = None):
+        self.dimensions = dimensions
+        self.max_rows = max_rows
+        self.directory = directory
+        self.path: Optional[str] = None
+        self._capacity = 0
+        self._matrix = None
+        self._rows: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._entries: List[Optional[Tuple[Hashable, str, Optional[str], int, Any]]] = []
+        self._rows_by_mevzuat: Dict[str, set] = {}
+        self._free: List[int] = []
+        self._used = 0
+        self.queries = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _grow(self, capacity: int) -> None:
+        if self.path is None:
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+            handle = tempfile.NamedTemporaryFile(prefix="mevzuat-vectors-", suffix=".f32", dir=self.directory, delete=False)
+            handle.close()
+            self.path = handle.name
+        with open(self.path, "r+b") as handle:
+            handle.truncate(capacity * self.dimensions * 4)
+        # Earlier mappings stay valid for queries still reading them
+        self._matrix = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
+        self._capacity = capacity
+
+    def _allocate(self) -> Tuple[int, Optional[Tuple]]:
+        """A free row, and the entry evicted to free it (if any)."""
+        if self._free:
+            return self._free.pop(), None
+        if self._used == self._capacity:
+            if self._capacity < self.max_rows:
+                self._grow(min(self.max_rows, max(self._capacity * 2, self.INITIAL_ROWS)))
+            else:
+                evicted = self.remove(next(iter(self._rows)))
+                self.evictions += 1
+                return self._free.pop(), evicted
+        self._used += 1
+        self._entries.append(None)
+        return self._used - 1, None
+
+    def contains(self, key: Hashable, text: str) -> bool:
+        """True if key is stored for exactly this text."""
+        row = self._rows.get(key)
+        return row is not None and self._entries[row][3] == hash(text)
+
+    def add(
+        self, key: Hashable, mevzuat_id: str, title: Optional[str], vector: Any, fingerprint: int = 0, features: Any = None
+    ) -> List[Tuple]:
+        """Stores vector under key; returns the entries it displaced (the previous one for key, an evicted one)."""
+        displaced = []
+        row = self._rows.pop(key, None)
+        if row is None:
+            row, evicted = self._allocate()
+            if evicted is not None:
+                displaced.append(evicted)
+        else:
+            displaced.append(self._entries[row])
+            self._rows_by_mevzuat[self._entries[row][1]].discard(row)
+        self._matrix[row] = vector
+        self._rows[key] = row
+        self._entries[row] = (key, mevzuat_id, title, fingerprint, features)
+        self._rows_by_mevzuat.setdefault(mevzuat_id, set()).add(row)
+        return displaced
+
+    def remove(self, key: Hashable) -> Optional[Tuple]:
+        """Removes key; returns its entry, or None if it was not stored."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return None
+        entry = self._entries[row]
+        mevzuat_id = self._entries[row][1]
+        rows = self._rows_by_mevzuat[mevzuat_id]
+        rows.discard(row)
+        if not rows:
+            del self._rows_by_mevzuat[mevzuat_id]
+        self._matrix[row] = 0.0
+        self._entries[row] = None
+        self._free.append(row)
+        return entry
+
+    def entry(self, row: int) -> Optional[Tuple[Hashable, str, Optional[str], int, Any]]:
+        """(key, mevzuat_id, title, fingerprint, features) stored in a row, or None if it is free."""
+        return self._entries[row] if row < len(self._entries) else None
+
+    def rows_of(self, mevzuat_id: str) -> Any:
+        return np.fromiter(sorted(self._rows_by_mevzuat.get(mevzuat_id, ())), dtype=np.intp)
+
+    def top_k(self, queries: Any, k: int, rows: Optional[Any] = None) -> List[List[Tuple[int, float]]]:
+        """
+        For each row of queries (n x dimensions), the k (row, score) pairs with
+        the highest positive dot product, best first. rows restricts the search.
+        Safe to run in a worker thread while rows are being added.
+        """
+        matrix, used = self._matrix, self._used
+        queries = np.asarray(queries, dtype=np.float32)
+        self.queries += len(queries)
+        candidate_scores, candidate_rows = [], []
+        if matrix is None:
+            blocks = []
+        elif rows is not None:
+            blocks = [(rows, matrix[rows])] if len(rows) else []
+        else:
+            blocks = (
+                (np.arange(start, min(start + self.BLOCK_ROWS, used)), matrix[start:min(start + self.BLOCK_ROWS, used)])
+                for start in range(0, used, self.BLOCK_ROWS)
+            )
+        for block_rows, block in blocks:
+            scores = block @ queries.T
+            if len(block) > k:
+                best = np.argpartition(scores, len(block) - k, axis=0)[len(block) - k:]
+                scores = np.take_along_axis(scores, best, axis=0)
+            else:
+                best = np.broadcast_to(np.arange(len(block))[:, None], scores.shape)
+            candidate_scores.append(scores)
+            candidate_rows.append(block_rows[best])
+        if not candidate_scores:
+            return [[] for _ in range(len(queries))]
+        scores = np.vstack(candidate_scores)
+        found_rows = np.vstack(candidate_rows)
+        order = np.argsort(-scores, axis=0, kind="stable")[:k]
+        results = []
+        for column in range(len(queries)):
+            ranked = []
+            for position in order[:, column]:
+                score = float(scores[position, column])
+                if score <= 0.0:
+                    break
+                ranked.append((int(found_rows[position, column]), score))
+            results.append(ranked)
+        return results
+
+    def close(self) -> None:
+        self._matrix = None
+        if self.path is None:
+            return
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rows": len(self._rows),
+            "capacity": self._capacity,
+            "max_rows": self.max_rows,
+            "dimensions": self.dimensions,
+            "file_bytes": self._capacity * self.dimensions * 4,
+            "queries": self.queries,
+            "evictions": self.evictions,
+        }
+
+
+class QueryBatcher:
+    """
+    Coalesces the top-k queries submitted during one event loop iteration into
+    a single matrix product, run in a worker thread.
+    """
+
+    def __init__(self, index: VectorIndex, max_batch: int = 64):
+        self._index = index
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Any, int, asyncio.Future]] = []
+        self._tasks: set = set()
+        self.batches = 0
+        self.largest_batch = 0
+
+    async def top_k(self, vector: Any, k: int, rows: Optional[Any] = None) -> List[Tuple[int, float]]:
+        if rows is not None:
+            # Restricted searches touch few rows; no need to batch them
+            return (await asyncio.to_thread(self._index.top_k, vector[None, :], k, rows))[0]
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((vector, k, future))
+        if len(self._pending) == 1:
+            asyncio.get_running_loop().call_soon(self._flush)
+        elif len(self._pending) >= self.max_batch:
+            self._flush()
+        return await future
+
+    def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Sequence[Tuple[Any, int, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            queries = np.stack([vector for vector, _, _ in batch])
+            results = await asyncio.to_thread(self._index.top_k, queries, max(k for _, k, _ in batch))
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, k, future), ranked in zip(batch, results):
+            if not future.done():
+                future.set_result(ranked[:k])
+
+    def stats(self) -> Dict[str, Any]:
+        return {"batches": self.batches, "largest_batch": self.largest_batch, "pending": len(self._pending)}
+
+
+class VectorSearch:
+    """
+    Article vectors for similarity search: encodes texts with a HashingEncoder
+    (off the event loop when long), stores them in a VectorIndex and answers
+    queries through a QueryBatcher.
+    """
+
+    INLINE_CHARS = 65536
+
+    def __init__(self, dimensions: int = 512, max_articles: int = 100000, directory: Optional[str] = None):
+        self.encoder = HashingEncoder(dimensions=dimensions)
+        self.index = VectorIndex(dimensions=dimensions, max_rows=max_articles, directory=directory)
+        self._batcher = QueryBatcher(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    async def add(self, key: Hashable, mevzuat_id: str, title: Optional[str], text: str) -> bool:
+        """Stores the vector of text under key; returns False if it was already stored unchanged."""
+        if self.index.contains(key, text):
+            return False
+        if len(text) > self.INLINE_CHARS:
+            vector, feature_ids = await asyncio.to_thread(self.encoder.encode_document, text)
+        else:
+            vector, feature_ids = self.encoder.encode_document(text)
+        for entry in self.index.add(key, mevzuat_id, title, vector, hash(text), feature_ids):
+            self.encoder.forget(entry[4])
+        self.encoder.observe(feature_ids)
+        return True
+
+    def remove(self, key: Hashable) -> None:
+        entry = self.index.remove(key)
+        if entry is not None:
+            self.encoder.forget(entry[4])
+
+    async def search(self, query: str, k: int, mevzuat_id: Optional[str] = None) -> List[Tuple[Hashable, str, Optional[str], float]]:
+        """(key, mevzuat_id, title, cosine similarity) of the k stored texts most similar to query."""
+        vector = self.encoder.encode_query(query)
+        if not vector.any():
+            return []
+        rows = self.index.rows_of(mevzuat_id) if mevzuat_id else None
+        ranked = await self._batcher.top_k(vector, k, rows)
+        hits = []
+        for row, score in ranked:
+            entry = self.index.entry(row)
+            if entry is not None:
+                hits.append((entry[0], entry[1], entry[2], score))
+        return hits
+
+    def close(self) -> None:
+        self.index.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.index.stats(), idf_documents=self.encoder.documents, batching=self._batcher.stats())
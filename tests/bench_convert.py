@@ -0,0 +1,34 @@
+"""
+Per-article conversion time of the native converter vs MarkItDown, over the
+HTML fixtures. Run with: python tests/bench_convert.py [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mevzuat_convert import _fallback_html_to_markdown, native_html_to_markdown  # noqa: E402
+
+
+def per_call_us(convert, html: str, repeats: int) -> float:
+    convert(html)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        convert(html)
+    return (time.perf_counter() - started) / repeats * 1e6
+
+
+def main() -> None:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{'fixture':<12} {'native us':>10} {'markitdown us':>14} {'speedup':>8}")
+    for path in sorted((Path(__file__).parent / "fixtures" / "html").glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        native = per_call_us(native_html_to_markdown, html, repeats)
+        markitdown = per_call_us(_fallback_html_to_markdown, html, max(1, repeats // 10))
+        print(f"{path.stem:<12} {native:>10.0f} {markitdown:>14.0f} {markitdown / native:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
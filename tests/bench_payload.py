@@ -0,0 +1,69 @@
+"""
+Peak memory and time of turning a large getDocumentContent response into
+markdown: the old path (json.loads, full base64 decode, str decode, convert)
+against split_content_payload + convert_html_payload, which decode the base64
+piece by piece straight into the parser. Peaks are measured with tracemalloc,
+times are the best of three untraced runs.
+Run with: python tests/bench_payload.py [html_megabytes]
+"""
+
+import base64
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mevzuat_convert import convert_html_payload, html_from_base64, html_to_markdown, split_content_payload  # noqa: E402
+
+ARTICLE = (
+    "<p><b>MADDE {n} –</b> (1) Bu Kanunun amacı; kişi hak ve özgürlüklerini, kamu düzen ve güvenliğini, "
+    "hukuk devletini, kamu sağlığını ve çevreyi, toplum barışını korumak, suç işlenmesini önlemektir.</p>"
+    "<p>a) Birinci bent hükmü,</p><p>b) İkinci bent hükmü.</p>"
+)
+
+
+def response_body(megabytes: float) -> bytes:
+    pieces, size, n = ["<html><body>"], 0, 0
+    while size < megabytes * 1024 * 1024:
+        n += 1
+        piece = ARTICLE.format(n=n)
+        pieces.append(piece)
+        size += len(piece.encode("utf-8"))
+    pieces.append("</body></html>")
+    content = base64.b64encode("".join(pieces).encode("utf-8")).decode("ascii")
+    return json.dumps({"metadata": {"FMTY": "SUCCESS"}, "data": {"content": content, "mimeType": "text/html"}}).encode()
+
+
+def before(body: bytes) -> str:
+    return html_to_markdown(html_from_base64(json.loads(body)["data"]["content"]))
+
+
+def after(body: bytes) -> str:
+    _, content = split_content_payload(body)
+    return convert_html_payload(content)
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    body = response_body(megabytes)
+    print(f"{megabytes:.1f} MB HTML document in a {len(body) / 1e6:.1f} MB response")
+    outputs = {}
+    for name, convert in (("before", before), ("after", after)):
+        elapsed = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            outputs[name] = convert(body)
+            elapsed = min(elapsed, time.perf_counter() - started)
+        tracemalloc.start()
+        convert(body)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {name:<7} peak {peak / 1e6:6.1f} MB, {elapsed:5.2f} s")
+    print(f"  markdown identical: {outputs['before'] == outputs['after']} ({len(outputs['after']) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
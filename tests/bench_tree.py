@@ -0,0 +1,93 @@
+"""
+Article tree payload validation and CompactArticleTree construction, on a
+synthetic tree in the bedesten mevzuatMaddeTree shape. Compares the old
+json.loads + per-node model_validate path with one-pass model_validate_json,
+then reports build time and memory of the compact form against the node list.
+Run with: python tests/bench_tree.py [nodes] [repeats]
+"""
+
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mevzuat_models import ArticleTreeAdapter, ArticleTreeResponse, MevzuatArticleNode  # noqa: E402
+from mevzuat_tree import CompactArticleTree  # noqa: E402
+
+
+def tree_payload(nodes: int) -> bytes:
+    """Sections of 20 articles each, grouped 10 sections to a part, until nodes is reached."""
+    parts, count, madde_no = [], 0, 0
+    while count < nodes:
+        part = {"maddeId": f"k{count}", "title": f"KISIM {len(parts) + 1}", "mevzuatId": "1", "children": []}
+        count += 1
+        for _ in range(10):
+            if count >= nodes:
+                break
+            section = {"maddeId": f"b{count}", "title": "BÖLÜM", "description": "Genel hükümler", "mevzuatId": "1", "children": []}
+            count += 1
+            for _ in range(20):
+                if count >= nodes:
+                    break
+                madde_no += 1
+                section["children"].append({
+                    "maddeId": f"m{count}", "maddeNo": madde_no, "title": f"Madde {madde_no}",
+                    "description": "Kişi hak ve özgürlükleri", "mevzuatId": "1", "children": [],
+                })
+                count += 1
+            part["children"].append(section)
+        parts.append(part)
+    return json.dumps({"metadata": {"FMTY": "SUCCESS"}, "data": {"children": parts}}, ensure_ascii=False).encode("utf-8")
+
+
+def mean_ms(fn, repeats: int) -> float:
+    fn()
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return statistics.mean(times) * 1e3
+
+
+def traced(fn):
+    """(result, bytes still allocated by the result, peak bytes while building it)."""
+    tracemalloc.start()
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main() -> None:
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 3140
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    body = tree_payload(nodes)
+    print(f"{nodes} nodes, {len(body) / 1024:.0f} KB payload, mean of {repeats} runs")
+
+    validators = {
+        "json.loads + model_validate per node": lambda: [
+            MevzuatArticleNode.model_validate(child) for child in json.loads(body)["data"]["children"]
+        ],
+        "json.loads + TypeAdapter(list)": lambda: ArticleTreeAdapter.validate_python(json.loads(body)["data"]["children"]),
+        "model_validate_json on the envelope": lambda: ArticleTreeResponse.model_validate_json(body).data.children,
+    }
+    for name, fn in validators.items():
+        print(f"  {name:<40} {mean_ms(fn, repeats):8.1f} ms")
+
+    children = ArticleTreeResponse.model_validate_json(body).data.children
+    print(f"  {'CompactArticleTree.from_nodes':<40} {mean_ms(lambda: CompactArticleTree.from_nodes('1', children), repeats):8.1f} ms")
+
+    _, node_bytes, node_peak = traced(lambda: ArticleTreeResponse.model_validate_json(body).data.children)
+    tree, tree_bytes, tree_peak = traced(lambda: CompactArticleTree.from_nodes("1", children))
+    print("memory (tracemalloc):")
+    print(f"  node list         {node_bytes / 1024:8.0f} KB retained, {node_peak / 1024:8.0f} KB peak")
+    print(f"  compact tree      {tree_bytes / 1024:8.0f} KB retained, {tree_peak / 1024:8.0f} KB peak (nbytes {tree.nbytes() / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
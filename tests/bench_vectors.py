@@ -0,0 +1,93 @@
+"""
+Indexing and query latency of the article vector index on a synthetic corpus
+(default 100k articles of 40-160 words drawn from a Zipf-like vocabulary), plus
+the vector file size and the process's peak RSS. For single-core
+numbers, pin the process and BLAS:
+    OPENBLAS_NUM_THREADS=1 OMP_NUM_THREADS=1 taskset -c 0 python tests/bench_vectors.py
+Run with: python tests/bench_vectors.py [articles] [queries]
+"""
+
+import asyncio
+import itertools
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mevzuat_vectors import VectorSearch  # noqa: E402
+
+STEMS = [
+    "hak", "özgürlük", "ceza", "suç", "hapis", "kanun", "madde", "fıkra", "bent", "mahkeme", "karar",
+    "dava", "tazminat", "sözleşme", "borç", "alacak", "vergi", "idare", "memur", "belediye", "ihale",
+    "kira", "miras", "evlilik", "boşanma", "velayet", "şirket", "ortak", "sermaye", "işçi", "işveren",
+]
+SUFFIXES = ["", "ler", "lar", "i", "ı", "in", "ın", "e", "a", "de", "da", "den", "dan", "leri", "ları", "ine", "ına"]
+
+
+def corpus(articles: int, seed: int = 7):
+    rng = random.Random(seed)
+    vocabulary = [stem + suffix for stem in STEMS for suffix in SUFFIXES]
+    vocabulary += [f"terim{i}" for i in range(20000)]
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocabulary))))
+    for n in range(articles):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(40, 160))
+        yield f"m{n}", f"{n // 50}", " ".join(words)
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run(articles: int, queries: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        search = VectorSearch(max_articles=articles, directory=directory)
+        started = time.perf_counter()
+        for key, mevzuat_id, text in corpus(articles):
+            await search.add(key, mevzuat_id, None, text)
+        indexing = time.perf_counter() - started
+        size = search.index.stats()["file_bytes"]
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        print(f"{articles} articles indexed in {indexing:.1f} s ({indexing / articles * 1e3:.2f} ms each)")
+        print(f"  vector file {size / 2**20:.0f} MiB, peak RSS {peak / 2**20:.0f} MiB")
+
+        rng = random.Random(11)
+        texts = [text for _, _, text in corpus(queries, seed=13)]
+        phrases = [" ".join(rng.sample(text.split(), 4)) for text in texts]
+        await search.search(phrases[0], 10)
+
+        latencies = []
+        for phrase in phrases:
+            started = time.perf_counter()
+            await search.search(phrase, 10)
+            latencies.append((time.perf_counter() - started) * 1e3)
+        print(f"  single query, k=10: median {statistics.median(latencies):.1f} ms, p95 {percentile(latencies, 0.95):.1f} ms")
+
+        batch = phrases[:64]
+        started = time.perf_counter()
+        await asyncio.gather(*(search.search(phrase, 10) for phrase in batch))
+        elapsed = (time.perf_counter() - started) * 1e3
+        print(f"  {len(batch)} concurrent queries, batched: {elapsed:.0f} ms total, {elapsed / len(batch):.1f} ms each")
+
+        latencies = []
+        for phrase in phrases:
+            started = time.perf_counter()
+            await search.search(phrase, 10, mevzuat_id="7")
+            latencies.append((time.perf_counter() - started) * 1e3)
+        print(f"  restricted to one mevzuat_id: median {statistics.median(latencies):.2f} ms")
+        search.close()
+
+
+def main() -> None:
+    articles = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    asyncio.run(run(articles, queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Shared fixtures: a MevzuatApiClient wired to an in-process fake of the
+bedesten API (httpx.MockTransport), so no test touches the network.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mevzuat_client import MevzuatApiClient  # noqa: E402
+
+ARTICLE_HTML = """<html><body><p><b>Amaç</b></p>
+<p><b>MADDE {id} – </b>(1) Bu Kanunun amacı; kişi hak ve özgürlüklerini korumaktır.</p>
+<p>a) birinci bent,</p><p>b) ikinci bent.</p></body></html>"""
+
+
+def _ok(data):
+    return httpx.Response(200, json={"metadata": {"FMTY": "SUCCESS"}, "data": data})
+
+
+def _error(message):
+    return httpx.Response(200, json={"metadata": {"FMTY": "ERROR", "FMTE": message}, "data": None})
+
+
+class FakeBedesten:
+    """
+    Answers searchDocuments, mevzuatMaddeTree and getDocumentContent. Every
+    search returns TOTAL documents "1000", "1001", ...; every document has the
+    articles "<id>-m1" .. "<id>-m5" under one section. texts maps a document or
+    article id to the HTML it returns; pdfs maps a document id to PDF bytes
+    (such documents have no article tree); errors maps an id to the error
+    message upstream reports for it. Set fail or hang to make calls raise
+    ConnectError or block until release is set; cancelled counts blocked calls
+    that were cancelled instead.
+    """
+
+    TOTAL = 23
+
+    def __init__(self):
+        self.calls = []
+        self.texts = {}
+        self.pdfs = {}
+        self.errors = {}
+        self.fail = False
+        self.hang = False
+        self.release = asyncio.Event()
+        self.cancelled = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        endpoint = request.url.path.rsplit("/", 1)[-1]
+        self.calls.append((endpoint, body))
+        if self.fail:
+            raise httpx.ConnectError("connection refused", request=request)
+        if self.hang:
+            try:
+                await self.release.wait()
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        data = body["data"]
+        if endpoint == "searchDocuments":
+            size, page = data["pageSize"], data["pageNumber"]
+            first = (page - 1) * size
+            documents = [
+                {
+                    "mevzuatId": str(1000 + i), "mevzuatNo": 5237, "mevzuatAdi": f"Kanun {i}",
+                    "mevzuatTur": {"id": 1, "name": "KANUN", "description": "Kanun"},
+                    "resmiGazeteTarihi": "2004-10-12T00:00:00",
+                }
+                for i in range(first, min(first + size, self.TOTAL))
+            ]
+            return _ok({"total": self.TOTAL, "mevzuatList": documents})
+        if endpoint == "mevzuatMaddeTree":
+            mevzuat_id = data["mevzuatId"]
+            if mevzuat_id in self.errors:
+                return _error(self.errors[mevzuat_id])
+            if mevzuat_id in self.pdfs:
+                return _ok({"children": []})
+            articles = [
+                {"maddeId": f"{mevzuat_id}-m{i}", "maddeNo": i, "title": f"Madde {i}", "mevzuatId": mevzuat_id, "children": []}
+                for i in range(1, 6)
+            ]
+            return _ok({"children": [{"maddeId": f"{mevzuat_id}-b1", "title": "BİRİNCİ KISIM", "mevzuatId": mevzuat_id, "children": articles}]})
+        if endpoint == "getDocumentContent":
+            doc_id = data["id"]
+            if doc_id in self.errors:
+                return _error(self.errors[doc_id])
+            if doc_id in self.pdfs:
+                return _ok({"content": base64.b64encode(self.pdfs[doc_id]).decode("ascii")})
+            html = self.texts.get(doc_id) or ARTICLE_HTML.format(id=doc_id)
+            return _ok({"content": base64.b64encode(html.encode("utf-8")).decode("ascii")})
+        return httpx.Response(404)
+
+
+def make_pdf(pages):
+    """A minimal PDF whose page i reads "Sayfa i metni"."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(1, pages + 1):
+        text = f"BT /F1 12 Tf 72 720 Td (Sayfa {page} metni) Tj ET"
+        objects.append(f"<< /Length {len(text)} >>\nstream\n{text}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R /Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+    out, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+@pytest.fixture
+def upstream():
+    return FakeBedesten()
+
+
+@pytest.fixture
+def make_client(upstream, tmp_path):
+    """Builds clients talking to the fake upstream; closes them after the test."""
+    clients = []
+
+    def make(**kwargs):
+        kwargs.setdefault("pdf_spool_dir", str(tmp_path))
+        kwargs.setdefault("vector_index_dir", str(tmp_path))
+        kwargs.setdefault("retry_base_delay", 0.0)
+        kwargs.setdefault("retry_max_delay", 0.0)
+        client = MevzuatApiClient(**kwargs)
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream), headers=client.HEADERS)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        asyncio.run(client.close())
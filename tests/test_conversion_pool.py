@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+import pytest
+
+from mevzuat_convert import ConversionPool
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes():
+    release = threading.Event()
+    started = []
+
+    def slow(name):
+        started.append(name)
+        release.wait(5)
+        return name
+
+    pool = ConversionPool(max_workers=1, queue_size=0, timeout=0.05)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(slow, "first")
+        assert pool.in_flight == 1 and pool.saturated()
+        # The only slot is still taken by the running job, so this one cannot start
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(slow, "second")
+        assert started == ["first"]
+        release.set()
+        while pool.in_flight:
+            await asyncio.sleep(0.01)
+        pool.timeout = 5
+        return await pool.run(slow, "third")
+
+    try:
+        assert asyncio.run(scenario()) == "third"
+    finally:
+        release.set()
+        pool.shutdown()
+    assert started == ["first", "third"] and pool.timeouts == 2
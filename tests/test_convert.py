@@ -0,0 +1,56 @@
+"""
+The native HTML converter against MarkItDown on representative bedesten HTML.
+Outputs are compared after normalize(), which removes the formatting choices
+that differ but render the same (list markers, blank lines, no-break spaces).
+"""
+
+import base64
+import re
+from pathlib import Path
+
+import pytest
+
+from mevzuat_convert import _fallback_html_to_markdown, convert_html_payload, html_to_markdown, native_html_to_markdown
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "html").glob("*.html"))
+
+
+def normalize(markdown: str) -> str:
+    markdown = markdown.replace("\xa0", " ")
+    markdown = re.sub(r"^(\s*)[*+-] ", r"\1- ", markdown, flags=re.MULTILINE)
+    lines = (line.rstrip() for line in markdown.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda path: path.stem)
+def test_native_matches_markitdown(path):
+    html = path.read_text(encoding="utf-8")
+    native = native_html_to_markdown(html)
+    assert native
+    assert normalize(native) == normalize(_fallback_html_to_markdown(html))
+
+
+def test_madde_structure():
+    markdown = native_html_to_markdown((Path(__file__).parent / "fixtures" / "html" / "madde.html").read_text(encoding="utf-8"))
+    assert markdown.splitlines()[0] == "**BİRİNCİ BÖLÜM**"
+    assert "**MADDE 1 –** (1) Bu Kanunun amacı; kişi hak ve *özgürlüklerini* korumaktır." in markdown
+    assert "(2) İkinci fıkra  \nikinci satır." in markdown
+    assert "var x" not in markdown and "MsoNormal" not in markdown
+
+
+def test_table_cells_escape_pipes():
+    html = "<table><tr><td>Sıra</td><td>Ad</td></tr><tr><td>1</td><td>Ali | Veli</td></tr></table>"
+    assert native_html_to_markdown(html) == "| Sıra | Ad |\n| --- | --- |\n| 1 | Ali \\| Veli |"
+
+
+def test_nested_layout_tables_are_flattened_into_their_cell():
+    html = "<table><tr><td><table><tr><td>iç</td><td>hücre</td></tr></table></td><td>dış</td></tr></table>"
+    assert native_html_to_markdown(html) == "| iç hücre | dış |\n| --- | --- |"
+
+
+def test_payload_conversion_and_fallback():
+    html = (Path(__file__).parent / "fixtures" / "html" / "headings.html").read_text(encoding="utf-8")
+    payload = base64.b64encode(html.encode("utf-8")).decode("ascii")
+    assert convert_html_payload(payload) == native_html_to_markdown(html)
+    assert convert_html_payload(memoryview(payload.encode("ascii"))) == native_html_to_markdown(html)
+    assert html_to_markdown("") == ""
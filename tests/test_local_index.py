@@ -0,0 +1,97 @@
+import asyncio
+import math
+
+from mevzuat_index import LocalIndex, analyze, tokenize
+from mevzuat_models import MevzuatSearchRequest
+
+
+def keys(index, scores):
+    return {index._articles[doc].key for doc in scores}
+
+
+def test_tokenize_folds_turkish_case():
+    assert tokenize("İSTANBUL'da ILIK Şeker-2") == ["istanbul", "da", "ılık", "şeker", "2"]
+    positions, length = analyze("kişi hak kişi")
+    assert length == 3 and list(positions["kişi"]) == [0, 2]
+
+
+def test_bm25_prefers_frequent_terms_in_short_units():
+    index = LocalIndex()
+    index.add("short", "1", None, "rüşvet rüşvet suçu")
+    index.add("long", "2", None, "rüşvet " + " ".join(f"kelime{i}" for i in range(40)))
+    index.add("other", "3", None, "vergi borcu")
+    scores = index.score_terms(["rüşvet"])
+    assert keys(index, scores) == {"short", "long"}
+    by_key = {index._articles[doc].key: score for doc, score in scores.items()}
+    assert by_key["short"] > by_key["long"] > 0
+    assert index.idf("rüşvet") < index.idf("vergi")
+    assert math.isclose(index.idf("yok"), math.log(1 + 3.5 / 0.5))
+
+
+def test_replacing_and_removing_units_updates_postings():
+    index = LocalIndex()
+    assert index.add("a", "1", None, "kişi hak")
+    assert not index.add("a", "1", None, "kişi hak")  # unchanged
+    index.add("a", "1", None, "vergi borcu")
+    assert not index.has_term("kişi") and keys(index, index.score_terms(["vergi"])) == {"a"}
+    index.remove("a")
+    assert len(index) == 0 and not index.has_term("vergi")
+    assert index.stats()["postings"] == 0 and index.stats()["tokens"] == 0
+
+
+def test_oldest_units_are_evicted_beyond_max_documents():
+    index = LocalIndex(max_documents=2)
+    for key in "abc":
+        index.add(key, key, None, f"ortak {key}")
+    assert len(index) == 2 and index.evictions == 1
+    assert keys(index, index.score_terms(["ortak"])) == {"b", "c"}
+
+
+def test_rank_documents_groups_units_by_legislation():
+    index = LocalIndex()
+    index.add(("madde", "1a"), "1", "Madde 1", "ceza ceza")
+    index.add(("madde", "1b"), "1", "Madde 2", "ceza")
+    index.add(("madde", "1c"), "1", "Madde 3", "ceza hukuku")
+    index.add(("madde", "2a"), "2", "Madde 1", "ceza davası uzun bir metin içinde geçer")
+    ranked = index.rank_documents(index.score_terms(["ceza"]), hits_per_document=2)
+    assert [mevzuat_id for mevzuat_id, _, _ in ranked] == ["1", "2"]
+    mevzuat_id, score, hits = ranked[0]
+    assert len(hits) == 2 and hits[0].article.key == ("madde", "1a") and score == hits[0].score
+    rejected = index.rank_documents(index.score_terms(["ceza"]), accept=lambda article: article.mevzuat_id == "2")
+    assert [mevzuat_id for mevzuat_id, _, _ in rejected] == ["2"]
+
+
+def test_client_local_search(make_client, upstream):
+    client = make_client(vector_index_enabled=False)
+    upstream.texts["1000-m2"] = "<p>Vergi borcu doğar.</p>"
+
+    async def scenario():
+        await client.search_documents(MevzuatSearchRequest(phrase="x", page_size=10))
+        await client.get_compact_article_tree("1000")
+        for i in range(1, 4):
+            await client.get_article_content(f"1000-m{i}", "1000")
+        await client.get_full_document_content("1001")  # no tree cached: indexed as one unit
+        request = MevzuatSearchRequest(phrase="özgürlüklerini", page_size=5)
+        result = await client.search_documents(request, "local")
+        assert result.source == "local" and result.total_results == 2
+        assert {doc.mevzuat_id for doc in result.documents} == {"1000", "1001"}
+        assert {hit.madde_id for hit in result.article_hits} == {"1000-m1", "1000-m3", "1001"}
+        assert all("özgürlüklerini" in hit.snippet for hit in result.article_hits)
+        assert all(hit.title == "Madde 1" or hit.title == "Madde 3" for hit in result.article_hits if hit.mevzuat_id == "1000")
+        # metadata filters apply to local results
+        assert (await client.search_documents(request.model_copy(update={"mevzuat_tur_list": ["YONETMELIK"]}), "local")).total_results == 0
+        assert (await client.search_documents(request.model_copy(update={"mevzuat_no": "5237"}), "local")).total_results == 2
+        # auto answers locally only when the index fills the page
+        calls = len(upstream.calls)
+        assert (await client.search_documents(request.model_copy(update={"page_size": 2}), "auto")).source == "local"
+        assert len(upstream.calls) == calls
+        assert (await client.search_documents(request, "auto")).source == "remote"
+        # articles replace the document's single unit
+        await client.get_compact_article_tree("1001")
+        await client.get_article_content("1001-m1", "1001")
+        assert ("mevzuat", "1001") not in client._local_index._by_key
+        assert (await client.search_documents(MevzuatSearchRequest(mevzuat_no="5"), "local")).error_message
+
+    asyncio.run(scenario())
+    disabled = make_client(local_index_enabled=False)
+    assert asyncio.run(disabled.search_documents(MevzuatSearchRequest(phrase="kişi"), "local")).error_message
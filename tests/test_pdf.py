@@ -0,0 +1,34 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import config
+import web_server
+from conftest import make_pdf
+
+
+def test_pdf_pages_are_extracted_from_spool_and_spool_removed_on_close(make_client, upstream, tmp_path):
+    upstream.pdfs["pdf1"] = make_pdf(12)
+    client = make_client(vector_index_enabled=False)
+
+    async def scenario():
+        window = await client.get_pdf_pages("pdf1", 3, 2)
+        assert not window.error_message
+        assert window.total == 12 and window.next_offset == 5
+        assert len(window.pages) == 2 and "Sayfa 4" in window.pages[0] and "Sayfa 6" not in window.markdown_content
+        assert list(tmp_path.glob("mevzuat-*.pdf"))
+        await client.close()
+
+    asyncio.run(scenario())
+    assert not list(tmp_path.glob("mevzuat-*.pdf"))
+
+
+def test_streamed_pdf_matches_full_content(make_client, upstream, monkeypatch):
+    upstream.pdfs["pdf1"] = make_pdf(5)
+    monkeypatch.setattr(config.settings, "http_warmup_connections", 0)
+    with TestClient(web_server.app) as api:
+        monkeypatch.setattr(web_server, "mevzuat_client", make_client(vector_index_enabled=False))
+        streamed = api.get("/api/legislation/pdf1/content/stream").text
+        full = api.get("/api/legislation/pdf1/content").json()["markdown_content"]
+    assert "Sayfa 1 metni\n\nSayfa 2 metni" in streamed
+    assert streamed == full
@@ -0,0 +1,22 @@
+import asyncio
+
+from mevzuat_models import MevzuatSearchRequest
+
+
+def test_cancelling_prefetch_aborts_its_upstream_call(make_client, upstream):
+    client = make_client(prefetch_enabled=True, max_retries=0)
+
+    async def scenario():
+        await client.search_documents(MevzuatSearchRequest(phrase="ceza"))
+        upstream.hang = True
+        while len(upstream.calls) < 2:
+            await asyncio.sleep(0.01)
+        assert upstream.calls[-1] == ("mevzuatMaddeTree", {"data": {"mevzuatId": "1000"}, "applicationName": "UyapMevzuat"})
+        assert client._prefetcher.cancel_all() == 1
+        await asyncio.sleep(0.01)
+        in_flight = (await client.stats())["concurrency_limiter"]["in_flight"]
+        upstream.release.set()
+        return in_flight
+
+    assert asyncio.run(scenario()) == 0
+    assert upstream.cancelled == 1 and len(upstream.calls) == 2
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from mevzuat_index import LocalIndex
+from mevzuat_models import MevzuatSearchRequest
+from mevzuat_query import BooleanQuery, FuzzyQuery, PhraseQuery, TermQuery, compile_query, execute, query_terms
+
+ARTICLES = {
+    "a": "Kişi hak ve özgürlüklerini korumak devletin görevidir.",
+    "b": "Hakim, kişi özgürlüğü ile ilgili kararını gerekçeli verir.",
+    "c": "Vergi borcu, vergiyi doğuran olayın meydana gelmesiyle doğar.",
+    "d": "Kamu görevlisi rüşvet alırsa cezalandırılır.",
+}
+
+
+@pytest.fixture(scope="module")
+def index():
+    index = LocalIndex()
+    for key, text in ARTICLES.items():
+        index.add(key, key, None, text)
+    return index
+
+
+def matches(index, text):
+    return {index._articles[doc].key for doc in execute(compile_query(text), index)}
+
+
+def test_parser_builds_expected_tree():
+    assert compile_query("kişi") == TermQuery("kişi")
+    assert compile_query('"kişi hak"~3') == PhraseQuery(("kişi", "hak"), 3)
+    assert compile_query("özgürlük~1") == FuzzyQuery("özgürlük", 1)
+    query = compile_query("+vergi -borç hak^2")
+    assert isinstance(query, BooleanQuery)
+    assert query.must == (TermQuery("vergi"), TermQuery("hak", 2.0))  # space is AND
+    assert query.must_not == (TermQuery("borç"),) and not query.should
+    assert compile_query("  ") is None and compile_query("AND OR") is None
+
+
+def test_parser_is_lenient_with_malformed_input():
+    assert compile_query('"kişi hak') == PhraseQuery(("kişi", "hak"), 0)
+    assert compile_query("(kişi OR hak") is not None
+
+
+def test_query_terms_lists_positive_terms():
+    assert query_terms(compile_query('"kişi hak" OR vergi NOT rüşvet')) == ["kişi", "hak", "vergi"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("kişi", {"a", "b"}),
+    ("KİŞİ", {"a", "b"}),  # Turkish case folding
+    ("kişi vergi", set()),  # space is AND
+    ("kişi OR vergi", {"a", "b", "c"}),
+    ("kişi NOT hakim", {"a"}),
+    ("kişi -hakim", {"a"}),
+    ('"kişi hak"', {"a"}),
+    ('"kişi korumak"~3', {"a"}),
+    ('"kişi korumak"~1', set()),
+    ("özgürl*", {"a", "b"}),
+    ("vergi?i", {"c"}),
+    ("rüşvat~1", {"d"}),
+    ("/verg.*/", {"c"}),
+    ("(vergi OR rüşvet) AND kamu", {"d"}),
+])
+def test_operators(index, text, expected):
+    assert matches(index, text) == expected
+
+
+def test_boost_changes_ranking(index):
+    plain = execute(compile_query("kişi OR vergi"), index)
+    boosted = execute(compile_query("kişi OR vergi^10"), index)
+    best = lambda scores: index._articles[max(scores, key=scores.get)].key
+    assert best(boosted) == "c"
+    assert boosted[next(doc for doc in plain if index._articles[doc].key == "c")] > max(plain.values())
+
+
+def test_auto_search_evaluates_raw_phrase_locally(make_client, upstream):
+    """source="auto" must give the local index the phrase as written, not its upstream rewrite."""
+    client = make_client()
+    upstream.texts["1000-m1"] = "<p>Kişi özgürlüğü</p>"
+    upstream.texts["1001"] = "<p>Vergi borcu</p>"
+
+    async def scenario():
+        await client.search_documents(MevzuatSearchRequest(phrase="x"))
+        await client.get_compact_article_tree("1000")
+        await client.get_article_content("1000-m1", "1000")
+        await client.get_full_document_content("1001")
+        raw = '"kişi" OR "vergi"'
+        upstream_form = MevzuatSearchRequest(phrase="/(kişi|vergi)/", page_size=2)
+        calls = len(upstream.calls)
+        result = await client.search_documents(upstream_form, "auto", local_phrase=raw)
+        assert result.source == "local" and result.total_results == 2
+        assert len(upstream.calls) == calls
+        assert (await client.search_documents(upstream_form, "local", local_phrase=raw)).total_results == 2
+
+    asyncio.run(scenario())
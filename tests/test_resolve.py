@@ -0,0 +1,46 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import config
+import web_server
+
+
+def resolve(client, mevzuat_no="5237", madde_no=3):
+    return asyncio.run(client.resolve_article(mevzuat_no, madde_no))
+
+
+def test_resolves_number_to_article(make_client):
+    resolved = resolve(make_client())
+    assert not resolved.error_message
+    assert resolved.mevzuat_id == "1000" and resolved.madde_id == "1000-m3" and resolved.title == "Madde 3"
+    assert "MADDE 1000-m3" in resolved.markdown_content
+
+
+def test_missing_legislation_or_article_is_not_found(make_client):
+    client = make_client()
+    missing_law = resolve(client, mevzuat_no="1")
+    assert missing_law.not_found and "No legislation found with number 1" in missing_law.error_message
+    missing_article = resolve(client, madde_no=9)
+    assert missing_article.not_found and missing_article.error_message == "Article 9 not found in Kanun 0."
+
+
+def test_search_failure_is_passed_through(make_client, upstream):
+    upstream.fail = True
+    resolved = resolve(make_client(max_retries=0))
+    assert not resolved.not_found and resolved.error_message.startswith("An unexpected error occurred")
+
+
+def test_tree_failure_is_passed_through(make_client, upstream):
+    upstream.errors["1000"] = "Servis geçici olarak kullanılamıyor"
+    resolved = resolve(make_client())
+    assert not resolved.not_found and resolved.error_message == "Servis geçici olarak kullanılamıyor"
+
+
+def test_endpoint_maps_not_found_to_404_and_upstream_errors_to_502(make_client, upstream, monkeypatch):
+    monkeypatch.setattr(config.settings, "http_warmup_connections", 0)
+    with TestClient(web_server.app) as api:
+        monkeypatch.setattr(web_server, "mevzuat_client", make_client(max_retries=0))
+        assert api.get("/api/articles/resolve", params={"mevzuat_no": "5237", "madde_no": 9}).status_code == 404
+        upstream.fail = True
+        assert api.get("/api/articles/resolve", params={"mevzuat_no": "6098", "madde_no": 1}).status_code == 502
@@ -0,0 +1,41 @@
+import sqlite3
+import threading
+
+from mevzuat_store import SQLiteContentStore
+
+
+def test_round_trip_and_dedup_by_hash(tmp_path):
+    store = SQLiteContentStore(str(tmp_path / "store.db"))
+    store.put_document("madde", "1", "cGF5bG9hZA==", "# Madde 1")
+    store.put_tree("10", "[]")
+    assert store.get_document("madde", "1").markdown == "# Madde 1"
+    assert store.get_markdown_by_hash(store.get_document("madde", "1").content_hash) == "# Madde 1"
+    assert store.get_tree("10").tree_json == "[]"
+    assert store.stats()["documents"] == 1 and store.stats()["trees"] == 1
+    store.close()
+
+
+def test_close_closes_every_threads_connection(tmp_path):
+    store = SQLiteContentStore(str(tmp_path / "store.db"))
+    opened, closed = threading.Barrier(4), threading.Event()
+    errors = []
+
+    def worker():
+        store.put_tree(threading.current_thread().name, "[]")
+        conn = store._connection()
+        opened.wait()
+        closed.wait()
+        try:
+            conn.execute("SELECT 1")
+        except sqlite3.ProgrammingError as exc:
+            errors.append(str(exc))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    opened.wait()
+    store.close()
+    closed.set()
+    for thread in threads:
+        thread.join()
+    assert errors == ["Cannot operate on a closed database."] * 3
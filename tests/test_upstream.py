@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+import pytest
+
+from mevzuat_models import MevzuatSearchRequest
+from mevzuat_upstream import AIMDLimiter, CircuitBreaker, CircuitOpenError, TokenBucket
+
+
+def test_breaker_opens_after_threshold_and_probes_after_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_breaker_release_frees_probe():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_cancelled_probe_does_not_wedge_circuit(make_client, upstream):
+    client = make_client(
+        coalesce_requests=False, max_retries=0, circuit_failure_threshold=1,
+        circuit_recovery_timeout=0.05, search_cache_ttl=0, search_cache_stale_ttl=0,
+    )
+    request = MevzuatSearchRequest(phrase="ceza")
+
+    async def scenario():
+        upstream.fail = True
+        assert (await client.search_documents(request)).error_message
+        assert client.upstream_health()["circuit"]["state"] == "open"
+        await asyncio.sleep(0.06)
+        upstream.fail, upstream.hang = False, True
+        probe = asyncio.create_task(client.search_documents(request))
+        while len(upstream.calls) < 2:
+            await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        upstream.hang = False
+        result = await client.search_documents(request)
+        assert not result.error_message and result.total_results == upstream.TOTAL
+        assert client.upstream_health()["circuit"]["state"] == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_open_circuit_fails_fast_without_upstream_call(make_client, upstream):
+    client = make_client(coalesce_requests=False, max_retries=0, circuit_failure_threshold=1, circuit_recovery_timeout=60)
+
+    async def scenario():
+        upstream.fail = True
+        await client.search_documents(MevzuatSearchRequest(phrase="a"))
+        calls = len(upstream.calls)
+        with pytest.raises(CircuitOpenError):
+            await client._post("searchDocuments", {"data": {"phrase": "b"}})
+        assert len(upstream.calls) == calls
+
+    asyncio.run(scenario())
+
+
+def test_retries_transport_errors_then_succeeds(make_client, upstream):
+    client = make_client(coalesce_requests=False, max_retries=2)
+    attempts = []
+    original = upstream.__call__
+
+    async def flaky(request):
+        attempts.append(request)
+        upstream.fail = len(attempts) < 3
+        return await original(request)
+
+    client._http_client._transport.handler = flaky
+    result = asyncio.run(client.search_documents(MevzuatSearchRequest(phrase="ceza")))
+    assert not result.error_message
+    assert len(attempts) == 3 and client.retries == 2
+
+
+def test_token_bucket_spaces_requests_beyond_burst():
+    async def scenario():
+        bucket = TokenBucket(rate_per_minute=600, burst=2)
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) >= 0.15  # two tokens at 10/s
+
+
+def test_aimd_limiter_shrinks_on_errors_and_grows_on_success():
+    async def scenario():
+        limiter = AIMDLimiter(initial=8, minimum=1, maximum=16, latency_target=1.0)
+        await limiter.acquire()
+        limiter.release(0.01, True)
+        shrunk = limiter.stats()["limit"]
+        for _ in range(64):
+            await limiter.acquire()
+            limiter.release(0.01, False)
+        return shrunk, limiter.stats()["limit"]
+
+    shrunk, grown = asyncio.run(scenario())
+    assert shrunk < 8
+    assert grown > shrunk
+
+
+@pytest.mark.parametrize("coalesce, aborted", [(False, True), (True, False)])
+def test_cancelling_a_search_aborts_upstream_call_only_without_coalescing(make_client, upstream, coalesce, aborted):
+    client = make_client(max_retries=0)
+
+    async def scenario():
+        upstream.hang = True
+        search = asyncio.create_task(client.search_documents(MevzuatSearchRequest(phrase="ceza"), coalesce=coalesce))
+        while not upstream.calls:
+            await asyncio.sleep(0.01)
+        search.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await search
+        await asyncio.sleep(0.01)
+        in_flight = (await client.stats())["concurrency_limiter"]["in_flight"]
+        upstream.release.set()
+        await asyncio.sleep(0.01)
+        return in_flight
+
+    in_flight = asyncio.run(scenario())
+    assert (upstream.cancelled == 1) is aborted
+    assert (in_flight == 0) is aborted
@@ -0,0 +1,104 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from mevzuat_vectors import HashingEncoder, VectorIndex, VectorSearch
+
+
+def unit_rows(count, dimensions, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((count, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_file_is_created_on_first_add_and_removed_on_close(tmp_path):
+    index = VectorIndex(dimensions=8, max_rows=10, directory=str(tmp_path))
+    assert index.path is None and not list(tmp_path.iterdir())
+    assert index.top_k(unit_rows(1, 8), 3) == [[]]
+    index.add(("madde", "1"), "1", None, unit_rows(1, 8)[0])
+    assert list(tmp_path.glob("mevzuat-vectors-*.f32"))
+    index.close()
+    assert not list(tmp_path.iterdir())
+
+
+def test_top_k_matches_brute_force_across_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(VectorIndex, "BLOCK_ROWS", 100)
+    vectors = unit_rows(1000, 16)
+    index = VectorIndex(dimensions=16, max_rows=1000, directory=str(tmp_path))
+    for i, vector in enumerate(vectors):
+        index.add(("madde", str(i)), str(i % 7), None, vector)
+    queries = unit_rows(3, 16, seed=1)
+    results = index.top_k(queries, 5)
+    for query, ranked in zip(queries, results):
+        scores = vectors @ query
+        expected = [i for i in np.argsort(-scores)[:5] if scores[i] > 0]
+        assert [int(index.entry(row)[0][1]) for row, _ in ranked] == expected
+    restricted = index.top_k(queries[:1], 50, index.rows_of("3"))[0]
+    assert restricted and all(index.entry(row)[1] == "3" for row, _ in restricted)
+    index.close()
+
+
+def test_oldest_rows_are_reused_beyond_max_rows(tmp_path):
+    vectors = unit_rows(30, 8)
+    index = VectorIndex(dimensions=8, max_rows=20, directory=str(tmp_path))
+    displaced = [index.add(("madde", str(i)), "1", None, vector) for i, vector in enumerate(vectors)]
+    assert len(index) == 20 and index.evictions == 10
+    assert displaced[20][0][0] == ("madde", "0")
+    [[(row, score)]] = index.top_k(vectors[25:26], 1)
+    assert index.entry(row)[0] == ("madde", "25") and score == pytest.approx(1.0, abs=1e-5)
+    index.close()
+
+
+def test_document_frequencies_follow_replacements_and_removals(tmp_path):
+    search = VectorSearch(dimensions=64, max_articles=2, directory=str(tmp_path))
+    encoder = search.encoder
+    empty = HashingEncoder(dimensions=64)
+
+    async def scenario():
+        await search.add(("madde", "1"), "1", None, "kişi özgürlüğü")
+        assert not await search.add(("madde", "1"), "1", None, "kişi özgürlüğü")
+        await search.add(("madde", "1"), "1", None, "ceza hukuku")
+        await search.add(("madde", "2"), "1", None, "ceza muhakemesi")
+        await search.add(("madde", "3"), "1", None, "vergi usul")  # evicts madde 1
+        assert encoder.documents == 2
+        search.remove(("madde", "2"))
+        search.remove(("madde", "3"))
+
+    asyncio.run(scenario())
+    assert encoder.documents == 0
+    assert not encoder._document_frequency.any() and not empty._document_frequency.any()
+    search.close()
+
+
+def test_inflected_forms_rank_above_unrelated_text(tmp_path):
+    search = VectorSearch(dimensions=512, max_articles=100, directory=str(tmp_path))
+
+    async def scenario():
+        await search.add(("madde", "a"), "1", "Madde 1", "Kişi hak ve özgürlüklerinin korunması esastır.")
+        await search.add(("madde", "b"), "2", "Madde 2", "Vergi borcu tahakkuk ettiği tarihte doğar.")
+        return await asyncio.gather(search.search("özgürlüğün korunmasına", 2), search.search("vergilerin tahakkuku", 2))
+
+    freedom, tax = asyncio.run(scenario())
+    assert freedom[0][0] == ("madde", "a") and tax[0][0] == ("madde", "b")
+    assert search.stats()["batching"]["largest_batch"] == 2
+    search.close()
+
+
+def test_client_similar_articles(make_client):
+    client = make_client()
+
+    async def scenario():
+        await client.get_compact_article_tree("1000")
+        for i in range(1, 4):
+            await client.get_article_content(f"1000-m{i}", "1000")
+        await client.get_full_document_content("1001")
+        result = await client.similar_articles("kişi özgürlükleri", 2)
+        assert result.indexed_articles == 4 and len(result.hits) == 2
+        assert result.hits[0].title and result.hits[0].score > 0
+        restricted = await client.similar_articles("kişi", 10, "1001")
+        assert [hit.madde_id for hit in restricted.hits] == ["1001"]
+        assert (await client.similar_articles("...")).error_message
+
+    asyncio.run(scenario())
+    disabled = make_client(vector_index_enabled=False)
+    assert asyncio.run(disabled.similar_articles("kişi")).error_message
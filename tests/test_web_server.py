@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import config
+import mevzuat_mcp_web_server
+import web_server
+
+
+@pytest.fixture
+def api(make_client, monkeypatch):
+    monkeypatch.setattr(config.settings, "http_warmup_connections", 0)
+    with TestClient(web_server.app) as test_client:
+        monkeypatch.setattr(web_server, "mevzuat_client", make_client())
+        yield test_client
+
+
+@pytest.fixture
+def mcp(make_client, monkeypatch):
+    monkeypatch.setattr(mevzuat_mcp_web_server, "HTTP_WARMUP_CONNECTIONS", 0)
+    with TestClient(mevzuat_mcp_web_server.app) as test_client:
+        monkeypatch.setattr(mevzuat_mcp_web_server, "mevzuat_client", make_client())
+        yield test_client
+
+
+def sse_events(body: str):
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        yield fields["event"], json.loads(fields["data"])
+
+
+def test_markdown_stream_marks_failed_articles(api, upstream):
+    upstream.errors["1000-m2"] = "Belge bulunamadı"
+    response = api.get("/api/legislation/1000/content/stream")
+    assert response.status_code == 200
+    text = response.text
+    assert "MADDE 1000-m1" in text and "MADDE 1000-m3" in text
+    assert "_[Article Madde 2 could not be retrieved: Belge bulunamadı]_" in text
+    assert text.endswith("_[1 article(s) could not be retrieved]_")
+
+
+def test_sse_stream_reports_failed_articles(api, upstream):
+    upstream.errors["1000-m2"] = "Belge bulunamadı"
+    upstream.errors["1000-m4"] = "Belge bulunamadı"
+    events = list(sse_events(api.get("/api/legislation/1000/content/stream", params={"format": "sse"}).text))
+    kinds = [kind for kind, _ in events]
+    assert kinds == ["chunk", "error", "chunk", "error", "chunk", "end"]
+    assert events[1][1]["madde_id"] == "1000-m2" and events[1][1]["error_message"] == "Belge bulunamadı"
+    assert events[-1][1] == {"mevzuat_id": "1000", "chunks": 5, "failed": 2, "error": None}
+
+
+def test_similar_articles_endpoint(api):
+    api.get("/api/legislation/1000/article/1000-m1")
+    response = api.get("/api/articles/similar", params={"q": "kişi özgürlükleri", "k": 1})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["indexed_articles"] == 1 and body["hits"][0]["madde_id"] == "1000-m1"
+    assert api.get("/api/articles/similar", params={"q": "..."}).status_code == 400
+
+
+def test_mcp_stream_counts_failed_articles(mcp, upstream):
+    upstream.errors["1000-m3"] = "Belge bulunamadı"
+    headers = {
+        "Authorization": f"Bearer {mevzuat_mcp_web_server.API_KEY}", "Origin": mevzuat_mcp_web_server.FLOWISE_ORIGIN,
+        "Accept": "text/event-stream",
+    }
+    body = {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "get_document_content", "arguments": {"mevzuat_id": "1000"}}}
+    events = [data for _, data in sse_events(mcp.post("/mcp", json=body, headers=headers).text)]
+    chunks = [event["params"] for event in events[:-1]]
+    assert [chunk["madde_id"] for chunk in chunks if chunk["error_message"]] == ["1000-m3"]
+    summary = events[-1]["result"]["content"]
+    assert summary["chunks"] == 5 and summary["failed_articles"] == 1
+    assert summary["error_message"] == "1 article(s) could not be retrieved"
+
+
+@pytest.mark.parametrize("params", [{"article_offset": 5}, {"offset": 100000}, {"page_offset": 0}])
+def test_missing_content_window_is_404(api, params):
+    response = api.get("/api/legislation/1000/content", params=params)
+    assert response.status_code == 404
+    assert "past the end" in response.json()["detail"] or "not a PDF" in response.json()["detail"]
+
+
+def test_failed_content_window_is_502(api, upstream):
+    upstream.errors["1000"] = "Servis geçici olarak kullanılamıyor"
+    response = api.get("/api/legislation/1000/content", params={"article_offset": 0})
+    assert response.status_code == 502 and response.json()["detail"] == "Servis geçici olarak kullanılamıyor"
+    upstream.fail = True
+    response = api.get("/api/legislation/1001/content", params={"offset": 0, "limit": 100})
+    assert response.status_code == 502 and response.json()["detail"].startswith("An unexpected error occurred")
@@ -9,23 +9,25 @@ import logging
 import os
 import json
 from contextlib import asynccontextmanager
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Literal, Union
 
 from fastapi import FastAPI, HTTPException, Query, Body, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 # Import configuration
 from config import Settings, get_settings
 
 # Import our existing models and client
-from mevzuat_client import MevzuatApiClient
+from mevzuat_client import MevzuatApiClient, MevzuatSearchError
+from mevzuat_json import FastJSONResponse, ResponseCache, orjson_available, sse_event
 from mevzuat_models import (
     MevzuatSearchRequest, MevzuatSearchResult,
-    MevzuatTurEnum, SortFieldEnum, SortDirectionEnum,
+    MevzuatTurEnum, SortFieldEnum, SortDirectionEnum, SearchSourceEnum,
     MevzuatArticleNode, MevzuatArticleContent,
-    MevzuatDocument
+    MevzuatDocument, MevzuatResolvedArticle, MevzuatContentWindow,
+    MevzuatSimilarArticles
 )
 
 # Configure logging
@@ -61,7 +63,56 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Debug mode: {settings.debug}")
     
-    mevzuat_client = MevzuatApiClient(timeout=settings.api_timeout)
+    mevzuat_client = MevzuatApiClient(
+        timeout=settings.api_timeout,
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+        http2=settings.http2_enabled,
+        rate_limit_per_minute=settings.upstream_rate_limit_per_minute,
+        rate_limit_burst=settings.upstream_rate_limit_burst,
+        concurrency_initial=settings.upstream_concurrency_initial,
+        concurrency_min=settings.upstream_concurrency_min,
+        concurrency_max=settings.upstream_concurrency_max,
+        latency_target=settings.upstream_latency_target,
+        max_retries=settings.upstream_max_retries,
+        retry_base_delay=settings.upstream_retry_base_delay,
+        retry_max_delay=settings.upstream_retry_max_delay,
+        circuit_failure_threshold=settings.circuit_failure_threshold,
+        circuit_recovery_timeout=settings.circuit_recovery_timeout,
+        last_good_max_bytes=settings.last_good_cache_max_bytes,
+        content_cache_max_bytes=settings.content_cache_max_bytes,
+        content_cache_ttl=settings.content_cache_ttl,
+        content_cache_stale_ttl=settings.content_cache_stale_ttl,
+        search_cache_max_bytes=settings.search_cache_max_bytes,
+        search_cache_ttl=settings.search_cache_ttl,
+        search_cache_stale_ttl=settings.search_cache_stale_ttl,
+        content_store_path=settings.content_store_path,
+        coalesce_requests=settings.coalesce_requests,
+        bulk_fetch_concurrency=settings.bulk_fetch_concurrency,
+        search_page_concurrency=settings.search_page_concurrency,
+        prefetch_enabled=settings.prefetch_enabled,
+        prefetch_top_n=settings.prefetch_top_n,
+        prefetch_concurrency=settings.prefetch_concurrency,
+        prefetch_max_bytes_per_minute=settings.prefetch_max_bytes_per_minute,
+        conversion_executor=settings.conversion_executor,
+        conversion_workers=settings.conversion_workers or None,
+        conversion_queue_size=settings.conversion_queue_size,
+        conversion_timeout=settings.conversion_timeout,
+        conversion_trace_memory=settings.conversion_trace_memory,
+        pdf_spool_dir=settings.pdf_spool_dir or None,
+        pdf_spool_max_files=settings.pdf_spool_max_files,
+        local_index_enabled=settings.local_index_enabled,
+        local_index_max_documents=settings.local_index_max_documents,
+        vector_index_enabled=settings.vector_index_enabled,
+        vector_index_dir=settings.vector_index_dir or None,
+        vector_dimensions=settings.vector_dimensions,
+        vector_index_max_articles=settings.vector_index_max_articles,
+    )
+    
+    if settings.http_warmup_connections > 0:
+        opened = await mevzuat_client.warmup(settings.http_warmup_connections)
+        logger.info(f"Upstream warmup: {opened}/{settings.http_warmup_connections} connections opened")
     
     yield
     
@@ -73,6 +124,11 @@ async def lifespan(app: FastAPI):
 # Get settings for app configuration
 settings = get_settings()
 
+# Serialized bytes of recent successful responses, per worker
+response_cache = ResponseCache(max_bytes=settings.response_cache_max_bytes, ttl=settings.response_cache_ttl)
+if not orjson_available():
+    logger.warning("orjson is not installed; responses are serialized with pydantic-core")
+
 # Create FastAPI app with lifespan
 app = FastAPI(
     title="Mevzuat API Server",
@@ -81,7 +137,8 @@ app = FastAPI(
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
     debug=settings.debug,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware for web client access
@@ -106,12 +163,14 @@ class SearchRequestAPI(BaseModel):
     page_size: int = Field(5, ge=1, le=10, description="Number of results per page")
     sort_field: str = Field("RESMI_GAZETE_TARIHI", description="Field to sort by")
     sort_direction: str = Field("desc", description="Sort direction: 'asc' or 'desc'")
+    source: SearchSourceEnum = Field("remote", description="'remote' (upstream), 'local' (BM25 index of the articles retrieved so far) or 'auto' (local when it fills the page)")
 
 class HealthResponse(BaseModel):
     """Health check response model"""
     status: str
     message: str
     timestamp: str
+    upstream: Optional[Dict[str, Any]] = None
 
 class ErrorResponse(BaseModel):
     """Standard error response model"""
@@ -140,10 +199,41 @@ async def health_check():
     Health check endpoint for monitoring and load balancers
     """
     import datetime
+    upstream = mevzuat_client.upstream_health() if mevzuat_client else None
+    degraded = upstream is not None and upstream["circuit"]["state"] != "closed"
     return HealthResponse(
-        status="healthy",
-        message="Mevzuat API Server is running",
-        timestamp=datetime.datetime.now().isoformat()
+        status="degraded" if degraded else "healthy",
+        message="Upstream legislation API unavailable, serving cached data" if degraded else "Mevzuat API Server is running",
+        timestamp=datetime.datetime.now().isoformat(),
+        upstream=upstream
+    )
+
+@app.get("/api/stats", response_model=Dict[str, Any])
+async def get_stats():
+    """
+    Cache statistics of the upstream client for this worker
+    """
+    if not mevzuat_client:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    stats = await mevzuat_client.stats()
+    stats["response_cache"] = response_cache.stats()
+    return stats
+
+def build_search_request(request: SearchRequestAPI) -> MevzuatSearchRequest:
+    """Converts an API search request to the client's search request"""
+    return MevzuatSearchRequest(
+        phrase=request.phrase,
+        mevzuat_no=request.mevzuat_no,
+        resmi_gazete_sayisi=request.resmi_gazete_sayisi,
+        mevzuat_tur_list=request.mevzuat_turleri or [
+            "KANUN", "CB_KARARNAME", "YONETMELIK", "CB_YONETMELIK", 
+            "CB_KARAR", "CB_GENELGE", "KHK", "TUZUK", "KKY", "UY", 
+            "TEBLIGLER", "MULGA"
+        ],
+        page_number=request.page_number,
+        page_size=request.page_size,
+        sort_field=request.sort_field,
+        sort_direction=request.sort_direction
     )
 
 @app.post("/api/search", response_model=MevzuatSearchResult)
@@ -172,34 +262,68 @@ async def search_legislation(request: SearchRequestAPI):
     
     try:
         # Convert API request to internal search request
-        search_req = MevzuatSearchRequest(
-            phrase=request.phrase,
-            mevzuat_no=request.mevzuat_no,
-            resmi_gazete_sayisi=request.resmi_gazete_sayisi,
-            mevzuat_tur_list=request.mevzuat_turleri or [
-                "KANUN", "CB_KARARNAME", "YONETMELIK", "CB_YONETMELIK", 
-                "CB_KARAR", "CB_GENELGE", "KHK", "TUZUK", "KKY", "UY", 
-                "TEBLIGLER", "MULGA"
-            ],
-            page_number=request.page_number,
-            page_size=request.page_size,
-            sort_field=request.sort_field,
-            sort_direction=request.sort_direction
-        )
+        search_req = build_search_request(request)
         
         logger.info(f"Search request: {request.model_dump(exclude_defaults=True)}")
         
+        cache_key = ("search", request.source, search_req.model_dump_json())
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return FastJSONResponse(cached)
+        
         # Perform search using existing client logic
-        result = await mevzuat_client.search_documents(search_req)
+        result = await mevzuat_client.search_documents(search_req, request.source)
         
-        logger.info(f"Search completed: {result.total_results} results found")
+        logger.info(f"Search completed: {result.total_results} {result.source} results found")
         
-        return result
+        # Local results change as documents are indexed, so only upstream answers are cached
+        cacheable = not (result.error_message or result.stale) and result.source == "remote"
+        return FastJSONResponse(response_cache.put(cache_key, result, cacheable=cacheable))
         
     except Exception as e:
         logger.exception("Error during legislation search")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
+@app.post("/api/search/stream", response_class=StreamingResponse)
+async def stream_search_results(
+    request: SearchRequestAPI,
+    max_results: Optional[int] = Query(None, ge=1, description="Stop after this many documents (default: all matches)"),
+    concurrency: Optional[int] = Query(None, ge=1, le=10, description="Maximum number of result pages fetched ahead")
+):
+    """
+    Stream every document matching a search as NDJSON
+    
+    Result pages are fetched concurrently ahead of the response and documents are
+    emitted one JSON object per line (MevzuatDocument) in result order.
+    page_number and page_size are ignored; streaming starts at the first result.
+    If a page cannot be fetched, a final {"error": ...} line ends the stream.
+    """
+    if not mevzuat_client:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    
+    if not request.phrase and not request.mevzuat_no:
+        raise HTTPException(
+            status_code=400, 
+            detail="At least one search criterion required: 'phrase' or 'mevzuat_no'"
+        )
+    
+    search_req = build_search_request(request)
+    logger.info(f"Streaming search request: {request.model_dump(exclude_defaults=True)}")
+    
+    async def document_lines():
+        count = 0
+        try:
+            async for document in mevzuat_client.iter_search(search_req, max_results, concurrency):
+                count += 1
+                yield document.model_dump_json(by_alias=True) + "\n"
+        except MevzuatSearchError as e:
+            logger.warning(f"Streaming search stopped after {count} documents: {e}")
+            yield json.dumps({"error": str(e)}, ensure_ascii=False) + "\n"
+            return
+        logger.info(f"Streamed {count} search results")
+    
+    return StreamingResponse(document_lines(), media_type="application/x-ndjson")
+
 @app.get("/api/legislation/{mevzuat_id}/structure", response_model=List[MevzuatArticleNode])
 async def get_legislation_structure(mevzuat_id: str):
     """
@@ -214,29 +338,91 @@ async def get_legislation_structure(mevzuat_id: str):
     try:
         logger.info(f"Fetching structure for legislation: {mevzuat_id}")
         
-        article_tree = await mevzuat_client.get_article_tree(mevzuat_id)
+        cache_key = ("structure", mevzuat_id)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return FastJSONResponse(cached)
+        
+        # Nested JSON straight from the compact tree, without building node models
+        article_tree = (await mevzuat_client.get_compact_article_tree(mevzuat_id)).to_dicts(by_alias=True)
         
         logger.info(f"Structure fetched: {len(article_tree)} top-level nodes")
         
-        return article_tree
+        return FastJSONResponse(response_cache.put(cache_key, article_tree, cacheable=bool(article_tree)))
         
     except Exception as e:
         logger.exception(f"Error fetching structure for legislation {mevzuat_id}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve structure: {str(e)}")
 
-@app.get("/api/legislation/{mevzuat_id}/content", response_model=MevzuatArticleContent)
-async def get_full_legislation_content(mevzuat_id: str):
+@app.get("/api/legislation/{mevzuat_id}/articles", response_class=StreamingResponse)
+async def get_all_legislation_articles(
+    mevzuat_id: str,
+    concurrency: Optional[int] = Query(None, ge=1, le=32, description="Maximum number of articles fetched in parallel")
+):
+    """
+    Stream every article of a legislation document as NDJSON
+    
+    Articles are fetched concurrently and emitted one JSON object per line
+    (MevzuatBulkArticle) in table-of-contents order as soon as they are ready.
+    Articles that could not be fetched carry an error_message.
+    """
+    if not mevzuat_client:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    
+    logger.info(f"Streaming all articles for legislation: {mevzuat_id}")
+    
+    async def article_lines():
+        count = 0
+        async for article in mevzuat_client.iter_law_articles(mevzuat_id, concurrency):
+            count += 1
+            yield article.model_dump_json() + "\n"
+        logger.info(f"Streamed {count} articles for legislation: {mevzuat_id}")
+    
+    return StreamingResponse(article_lines(), media_type="application/x-ndjson")
+
+@app.get("/api/legislation/{mevzuat_id}/content", response_model=Union[MevzuatArticleContent, MevzuatContentWindow])
+async def get_full_legislation_content(
+    mevzuat_id: str,
+    offset: Optional[int] = Query(None, ge=0, description="Return the markdown starting at this character offset"),
+    limit: Optional[int] = Query(None, ge=1, le=MevzuatApiClient.MAX_WINDOW_CHARS, description="Maximum number of characters to return"),
+    article_offset: Optional[int] = Query(None, ge=0, description="Return articles starting at this position in the table of contents"),
+    article_limit: Optional[int] = Query(None, ge=1, le=MevzuatApiClient.MAX_WINDOW_ARTICLES, description="Maximum number of articles to return"),
+    page_offset: Optional[int] = Query(None, ge=0, description="PDF documents: return text starting at this (0-based) page"),
+    page_limit: Optional[int] = Query(None, ge=1, le=MevzuatApiClient.MAX_WINDOW_PAGES, description="PDF documents: maximum number of pages to return")
+):
     """
     Get the full content of a legislation document as markdown
     
-    This retrieves the entire document content in one call.
+    This retrieves the entire document content in one call. With offset/limit
+    (characters), article_offset/article_limit (articles) or page_offset/page_limit
+    (pages of PDF documents, extracted on demand), only that window is returned,
+    together with the total size and the next_offset to continue from.
     """
     if not mevzuat_client:
         raise HTTPException(status_code=503, detail="Service temporarily unavailable")
     
     try:
+        if page_offset is not None or page_limit is not None:
+            window = await mevzuat_client.get_pdf_pages(mevzuat_id, page_offset or 0, page_limit)
+        elif article_offset is not None or article_limit is not None:
+            window = await mevzuat_client.get_article_window(mevzuat_id, article_offset or 0, article_limit)
+        elif offset is not None or limit is not None:
+            window = await mevzuat_client.get_document_window(mevzuat_id, offset or 0, limit)
+        else:
+            window = None
+        if window is not None:
+            if window.error_message:
+                # Only a window that does not exist is a 404; failed fetches and conversions are not
+                raise HTTPException(status_code=404 if window.not_found else 502, detail=window.error_message)
+            return FastJSONResponse(window)
+        
         logger.info(f"Fetching full content for legislation: {mevzuat_id}")
         
+        cache_key = ("content", mevzuat_id)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return FastJSONResponse(cached)
+        
         content = await mevzuat_client.get_full_document_content(mevzuat_id)
         
         if content.error_message:
@@ -244,7 +430,7 @@ async def get_full_legislation_content(mevzuat_id: str):
             
         logger.info(f"Full content fetched for legislation: {mevzuat_id}")
         
-        return content
+        return FastJSONResponse(response_cache.put(cache_key, content, cacheable=not content.stale))
         
     except HTTPException:
         raise
@@ -252,6 +438,78 @@ async def get_full_legislation_content(mevzuat_id: str):
         logger.exception(f"Error fetching full content for legislation {mevzuat_id}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve content: {str(e)}")
 
+@app.get("/api/legislation/{mevzuat_id}/content/stream", response_class=StreamingResponse)
+async def stream_legislation_content(
+    mevzuat_id: str,
+    format: Literal["markdown", "sse"] = Query("markdown", description="markdown: chunked text/markdown body; sse: text/event-stream of content chunks")
+):
+    """
+    Stream the content of a legislation document as it is produced
+    
+    Documents with an article tree are emitted article by article as each one is
+    fetched; cached or tree-less documents in fixed-size pieces. With format=sse
+    every piece is a "chunk" event (MevzuatContentChunk), an article that could not
+    be fetched an "error" event (the chunk with its error_message), and the stream
+    ends with an "end" event carrying the chunk and failure counts and any error.
+    In markdown, a failed article is replaced by an inline marker and a final line
+    gives the number of failed articles.
+    """
+    if not mevzuat_client:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    
+    logger.info(f"Streaming content for legislation: {mevzuat_id} ({format})")
+    
+    async def markdown_pieces(chunks, first):
+        separator = ""
+        failed = 0
+        chunk = first
+        while chunk is not None:
+            if chunk.unit == "article":
+                if chunk.error_message:
+                    failed += 1
+                    yield separator + f"_[Article {chunk.title or chunk.madde_id} could not be retrieved: {chunk.error_message}]_"
+                    separator = "\n\n"
+                elif chunk.markdown_content:
+                    yield separator + chunk.markdown_content
+                    separator = "\n\n"
+            elif chunk.unit == "page":
+                # Pages are joined like the non-streamed content; empty pages are skipped
+                if chunk.markdown_content:
+                    yield separator + chunk.markdown_content
+                    separator = "\n\n"
+            else:
+                yield chunk.markdown_content
+            chunk = await anext(chunks, None)
+        if failed:
+            yield f"\n\n_[{failed} article(s) could not be retrieved]_"
+    
+    async def events():
+        count = 0
+        failed = 0
+        error = None
+        try:
+            async for chunk in mevzuat_client.iter_document_content(mevzuat_id):
+                count += 1
+                if chunk.unit == "article" and chunk.error_message:
+                    failed += 1
+                    yield sse_event("error", chunk)
+                else:
+                    yield sse_event("chunk", chunk)
+        except Exception as e:
+            logger.exception(f"Content stream failed for legislation {mevzuat_id}")
+            error = str(e)
+        yield sse_event("end", {"mevzuat_id": mevzuat_id, "chunks": count, "failed": failed, "error": error})
+    
+    if format == "sse":
+        return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    
+    # Wait for the first piece so a document that cannot be fetched still gets a 404
+    chunks = mevzuat_client.iter_document_content(mevzuat_id)
+    first = await anext(chunks, None)
+    if first is not None and first.unit == "char" and first.error_message:
+        raise HTTPException(status_code=404, detail=first.error_message)
+    return StreamingResponse(markdown_pieces(chunks, first), media_type="text/markdown; charset=utf-8")
+
 @app.get("/api/legislation/{mevzuat_id}/article/{madde_id}", response_model=MevzuatArticleContent)
 async def get_article_content(mevzuat_id: str, madde_id: str):
     """
@@ -265,6 +523,11 @@ async def get_article_content(mevzuat_id: str, madde_id: str):
     try:
         logger.info(f"Fetching article content: legislation={mevzuat_id}, article={madde_id}")
         
+        cache_key = ("article", mevzuat_id, madde_id)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return FastJSONResponse(cached)
+        
         content = await mevzuat_client.get_article_content(madde_id, mevzuat_id)
         
         if content.error_message:
@@ -272,7 +535,7 @@ async def get_article_content(mevzuat_id: str, madde_id: str):
             
         logger.info(f"Article content fetched: legislation={mevzuat_id}, article={madde_id}")
         
-        return content
+        return FastJSONResponse(response_cache.put(cache_key, content, cacheable=not content.stale))
         
     except HTTPException:
         raise
@@ -280,6 +543,73 @@ async def get_article_content(mevzuat_id: str, madde_id: str):
         logger.exception(f"Error fetching article content: legislation={mevzuat_id}, article={madde_id}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve article content: {str(e)}")
 
+@app.get("/api/articles/resolve", response_model=MevzuatResolvedArticle)
+async def resolve_article(
+    mevzuat_no: str = Query(..., description="Legislation number, e.g. 5237"),
+    madde_no: int = Query(..., ge=1, description="Article number, e.g. 141"),
+    mevzuat_tur: Optional[MevzuatTurEnum] = Query(None, description="Legislation type if the number is ambiguous (default: prefer KANUN)")
+):
+    """
+    Get an article by legislation number and article number in one call
+    
+    Resolves e.g. 5237 (TCK) madde 141 server-side: search by number, article
+    tree lookup and article content. Lookups are memoized per worker.
+    """
+    if not mevzuat_client:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    
+    try:
+        logger.info(f"Resolving article: mevzuat_no={mevzuat_no}, madde_no={madde_no}, mevzuat_tur={mevzuat_tur}")
+        
+        cache_key = ("resolve", mevzuat_no.strip(), madde_no, mevzuat_tur)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return FastJSONResponse(cached)
+        
+        resolved = await mevzuat_client.resolve_article(mevzuat_no, madde_no, mevzuat_tur)
+        
+        if resolved.error_message:
+            # Upstream failures are not a missing article
+            raise HTTPException(status_code=404 if resolved.not_found else 502, detail=resolved.error_message)
+        
+        return FastJSONResponse(response_cache.put(cache_key, resolved, cacheable=not resolved.stale))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Error resolving article {madde_no} of legislation {mevzuat_no}")
+        raise HTTPException(status_code=500, detail=f"Failed to resolve article: {str(e)}")
+
+@app.get("/api/articles/similar", response_model=MevzuatSimilarArticles)
+async def similar_articles(
+    q: str = Query(..., min_length=1, description="Text to compare against: a question, passage or article"),
+    k: int = Query(10, ge=1, le=100, description="Number of articles to return"),
+    mevzuat_id: Optional[str] = Query(None, description="Only search the articles of this legislation")
+):
+    """
+    Get the retrieved articles most similar to a text
+    
+    Ranks the articles converted so far by this worker by cosine similarity of
+    hashed TF-IDF vectors (word stems and character trigrams). Not cached: the
+    index grows as articles are retrieved.
+    """
+    if not mevzuat_client:
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    if not mevzuat_client.vector_index_enabled:
+        raise HTTPException(status_code=503, detail="Vector index is disabled (set VECTOR_INDEX_ENABLED and install numpy)")
+    
+    try:
+        result = await mevzuat_client.similar_articles(q, k, mevzuat_id)
+        if result.error_message:
+            raise HTTPException(status_code=400, detail=result.error_message)
+        return FastJSONResponse(result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error in article similarity search")
+        raise HTTPException(status_code=500, detail=f"Failed to search similar articles: {str(e)}")
+
 @app.get("/api/types", response_model=Dict[str, List[str]])
 async def get_legislation_types():
     """